@@ -1,9 +1,11 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, g
 from flask_cors import CORS
 from config import Config
 import os
+import json
 import secrets
 import sys
+import time
 import traceback
 
 print("=" * 60)
@@ -14,6 +16,13 @@ app = Flask(__name__)
 app.secret_key = Config.SECRET_KEY
 CORS(app)  # Enable CORS for WordPress embedding
 
+# Server-side sessions: the cookie only carries a signed id (no 4KB limit)
+from utils.session_store import create_session_interface
+_session_interface = create_session_interface()
+if _session_interface:
+    app.session_interface = _session_interface
+SERVER_SIDE_SESSIONS = _session_interface is not None
+
 # Session version - forces all old sessions to reset on deployment
 # Change this value (or it auto-changes via hash) to invalidate all existing sessions
 SESSION_VERSION = "v3.1.12"
@@ -23,12 +32,13 @@ def _log_session_size(label=""):
     """Log estimated session cookie size for debugging.
     Flask's default session is a signed cookie with ~4KB browser limit.
     If the session exceeds this, the cookie is silently dropped and all state is lost.
+    (No-op with server-side sessions - the cookie is just an id.)
     """
-    import json as _json
+    if SERVER_SIDE_SESSIONS:
+        return
     try:
-        # Estimate: session data gets JSON-serialized then base64-encoded (+33%) then signed (+~100 bytes)
-        raw = _json.dumps(dict(session))
-        estimated_cookie = int(len(raw) * 1.4) + 100  # rough base64+signature overhead
+        # Serialize exactly as the cookie will be (handles bytes values such as the binary engine state)
+        estimated_cookie = len(app.session_interface.get_signing_serializer(app).dumps(dict(session)))
         pct = int((estimated_cookie / 4096) * 100)
         level = "✅" if pct < 70 else "⚠️" if pct < 90 else "🚨"
         print(f"   {level} SESSION SIZE {label}: ~{estimated_cookie} bytes ({pct}% of 4KB limit)")
@@ -45,6 +55,49 @@ DAMAGE_KEYWORDS = [
 ]
 
 
+def _save_engine(engine):
+    """
+    Store the GuardrailEngine in the session (ENGINE_STATE_FORMAT: binary or json)
+
+    Only writes when the engine changed since it was loaded, so validation
+    errors and repeated prompts don't re-serialize and re-sign the session.
+    In binary format the core state and conversation_turns are separate
+    session keys and only the changed one is re-encoded (server-side
+    backends with partial writes then only send that key).
+    """
+    sections = engine.dirty_sections()
+    if not sections:
+        return
+
+    if Config.ENGINE_STATE_FORMAT == 'binary':
+        compress = Config.ENGINE_STATE_COMPRESS
+        if 'core' in sections or 'engine_v3' not in session:
+            session['engine_v3'] = engine.to_bytes(compress=compress)
+        if SERVER_SIDE_SESSIONS and 'turns' in sections:
+            session['engine_v3_turns'] = engine.to_bytes(GuardrailEngine.TURNS_FIELDS, compress=compress)
+    else:
+        session['engine_v3'] = engine.to_dict(include_turns=SERVER_SIDE_SESSIONS)
+        session.pop('engine_v3_turns', None)
+    engine.mark_clean()
+
+
+def _load_engine():
+    """
+    Restore the GuardrailEngine from the session (either format)
+
+    Returns:
+        GuardrailEngine, or None if there is no (readable) engine state
+    """
+    engine_state = session.get('engine_v3')
+    if not engine_state:
+        return None
+    try:
+        return GuardrailEngine.from_session(engine_state, turns=session.get('engine_v3_turns'))
+    except Exception as e:
+        print(f"⚠️  Could not restore engine state ({e}) - starting fresh")
+        return None
+
+
 def _has_damage(collected_fields):
     """Check if user reported any damage in their condition/damage answers."""
     for key in ('condition', 'damage', 'damage_details', 'condition_details', 'damage_severity'):
@@ -67,6 +120,8 @@ def check_session_version():
 ai_service = None
 ai_service_v3 = None  # NEW: v3.0 architecture
 offer_service = None
+offer_job_service = None  # Background offer calculation (async mode)
+question_plans = None  # Background question plans (v3)
 email_service = None
 
 try:
@@ -87,6 +142,9 @@ try:
     ai_service_v3 = AIServiceV3()
     print("✅ AIService v3.0 initialized")
 
+    from services.question_plan_service import QuestionPlanService
+    question_plans = QuestionPlanService(ai_service_v3)
+
     print("Importing OfferService...")
     from services.offer_service import OfferService
     print("✅ OfferService imported")
@@ -95,6 +153,11 @@ try:
     offer_service = OfferService()
     print("✅ OfferService initialized")
 
+    print("Initializing OfferJobService...")
+    from services.offer_job_service import OfferJobService
+    offer_job_service = OfferJobService(offer_service)
+    print("✅ OfferJobService initialized")
+
     print("Importing EmailService...")
     from services.email_service import EmailService
     print("✅ EmailService imported")
@@ -106,6 +169,7 @@ try:
     print("Importing utils...")
     from utils.validators import Validators
     from utils.courier_checker import is_courier_eligible, get_courier_rejection_message
+    from utils.answer_matcher import match_answer
     print("✅ Utils imported")
 
     print("\n" + "=" * 60)
@@ -205,22 +269,14 @@ def submit_answer():
                 'rejection_reason': quick_check['reason']
             })
 
-    # Extract information from the conversation so far and update product_info
-    extracted_info = ai_service.extract_product_details(conversation_history)
-
-    if extracted_info:  # Only update if extraction returned data
-        # Merge extracted info with existing, but don't overwrite with None values
-        for key, value in extracted_info.items():
-            if value is not None:
-                if key == 'specifications' and key in product_info:
-                    # Merge specifications dict
-                    print(f"   🔄 Merging specifications: existing={product_info[key]}, new={value}")
-                    if product_info[key] is None:
-                        product_info[key] = {}
-                    product_info[key].update(value)
-                    print(f"   ✅ After merge: {product_info[key]}")
-                else:
-                    product_info[key] = value
+    next_question = None
+    if Config.V2_COMBINED_TURNS:
+        # One Claude call: extract this answer AND pick the next question (product_info updated in place)
+        extracted_info, next_question = ai_service.process_answer(conversation_history, product_info)
+    else:
+        # Extract what this answer adds (latest exchange only, or full history as fallback)
+        extracted_info = ai_service.extract_product_update(conversation_history, product_info)
+        ai_service.merge_extracted(product_info, extracted_info)
 
     print(f"\n{'='*60}")
     print(f"DEBUG - AFTER EXTRACTION:")
@@ -248,7 +304,10 @@ def submit_answer():
             })
 
     # Get next question from AI with updated product info
-    next_question = ai_service.get_next_question(conversation_history, product_info)
+    if next_question is None:
+        next_question = ai_service.get_next_question(
+            conversation_history, product_info, incremental=Config.V2_INCREMENTAL_TURNS
+        )
 
     # Debug logging
     print(f"\n{'='*60}")
@@ -347,6 +406,121 @@ def _normalize_v3_product_info(product_info, collected_fields):
     return product_info
 
 
+def _get_session_id():
+    """Stable per-conversation id (used to track background prefetch jobs)"""
+    if 'session_id' not in session:
+        session['session_id'] = secrets.token_urlsafe(16)
+    return session['session_id']
+
+
+def _prefetch_offer_research(engine):
+    """
+    Start offer research in the background while the user answers questions.
+
+    Prices only need the identified product; repair research starts once a
+    damage answer is in. Later answers that change the research inputs
+    (storage, condition, damage) simply replace the earlier job.
+    """
+    if offer_service is None:
+        return
+
+    try:
+        product_info = _normalize_v3_product_info(
+            dict(engine.product_info), dict(engine.collected_fields)
+        )
+        session_id = _get_session_id()
+        offer_service.prefetch.prefetch_prices(session_id, product_info)
+        if product_info.get('damage_details'):
+            offer_service.prefetch.prefetch_repairs(
+                session_id, product_info, product_info['damage_details']
+            )
+    except Exception as e:
+        print(f"   ⚠️  Offer prefetch failed to start: {e}")
+
+
+def _phase1_opening(identification, first_field, engine):
+    """
+    Acknowledgment and first question for Phase 1
+
+    Reuses what the combined identify_product call wrote, unless the engine
+    vetoed that field (approve_questions picked a different first field) or
+    it is missing - then the separate calls run concurrently.
+
+    Returns:
+        (acknowledgment, question_data)
+    """
+    acknowledgment = identification.get('acknowledgment')
+    question_data = identification.get('first_question')
+
+    if question_data and question_data.get('field') == first_field:
+        print(f"⚡ Using first question from combined Phase 1 call ({first_field})")
+        if not acknowledgment:
+            acknowledgment = ai_service_v3.generate_acknowledgment(identification['product_info'])
+        return acknowledgment, question_data
+
+    if question_data:
+        print(f"↩️  Engine picked '{first_field}' over '{question_data.get('field')}' - generating question")
+    return ai_service_v3.generate_opening(
+        identification['product_info'],
+        first_field,
+        engine.collected_fields,
+        acknowledgment=acknowledgment
+    )
+
+
+def _start_question_plan(engine, first_field):
+    """Generate the rest of the approved questions in the background (one call)"""
+    if question_plans is None:
+        return
+    try:
+        remaining = [f for f in engine.approved_questions if f != first_field]
+        question_plans.start(_get_session_id(), remaining, engine.product_info, engine.collected_fields)
+    except Exception as e:
+        print(f"   ⚠️  Question plan failed to start: {e}")
+
+
+def _question_for(field_name, engine):
+    """Question for a field - from the session's question plan if there is one, else generated now"""
+    question_data = None
+    if question_plans is not None:
+        question_data = question_plans.take(_get_session_id(), field_name, engine.product_info)
+    if question_data:
+        print(f"📝 Using planned question for {field_name}")
+        return question_data
+    if g.get('stream_question') and question_plans is not None:
+        # message_v3_stream generates it once the response has started
+        g.deferred_question = (field_name, dict(engine.product_info), dict(engine.collected_fields))
+        return {'question_text': '', 'quick_options': [], 'ui_type': 'text', 'deferred': True}
+    return ai_service_v3.generate_question(field_name, engine.product_info, engine.collected_fields)
+
+
+def _restore_streamed_question(engine):
+    """
+    Finish recording a question whose text was streamed last turn.
+
+    Its options and text were only known after that response (and the
+    session) had gone out, so they were kept server-side until now. Only
+    restored while it is still the question being answered - after a go-back
+    the user is answering a different field.
+    """
+    field_name = session.pop('streamed_field_v3', None)
+    if not field_name or question_plans is None or field_name != session.get('current_field_v3'):
+        return
+    question_data = question_plans.recall_streamed(_get_session_id(), field_name, engine.product_info)
+    if not question_data:
+        print(f"   ⚠️  Streamed question for {field_name} not found - answering without its options")
+        return
+    options = question_data.get('quick_options', [])
+    engine.ui_options = [{'type': 'quick_select', 'options': options}] if options else []
+    engine.record_ai_message(question_data['question_text'])
+
+
+def _cancel_offer_prefetch():
+    """Drop any background research for this session (answers are changing)"""
+    if offer_service is not None and session.get('session_id'):
+        offer_service.prefetch.cancel(session['session_id'])
+
+
 @app.route('/api/message/v3', methods=['POST'])
 def message_v3():
     """
@@ -372,11 +546,8 @@ def message_v3():
             }), 400
 
         # Get or create GuardrailEngine from session
-        engine_state = session.get('engine_v3', {})
-        if engine_state:
-            engine = GuardrailEngine.from_dict(engine_state)
-        else:
-            engine = GuardrailEngine()
+        engine = _load_engine() or GuardrailEngine()
+        _restore_streamed_question(engine)
 
         print(f"\n{'='*60}")
         print(f"V3 MESSAGE: {user_message}")
@@ -393,8 +564,8 @@ def message_v3():
         if not engine.product_identified:
             print("📋 Phase 1: Identifying product...")
 
-            # AI identifies the product and proposes questions
-            identification = ai_service_v3.identify_product(user_message)
+            # AI identifies the product and proposes questions (plus the opening, in combined mode)
+            identification = ai_service_v3.identify_product(user_message, with_opening=Config.V3_COMBINED_PHASE1)
 
             # Check if model confirmation is needed BEFORE setting product info
             needs_confirmation = identification.get('needs_model_confirmation', False)
@@ -406,7 +577,7 @@ def message_v3():
                 # Don't fully set product info yet — store partial state
                 # and ask model confirmation as a special question
                 product_name = f"{identification['product_info'].get('brand', '')} {identification['product_info'].get('name', '')}".strip()
-                session['engine_v3'] = engine.to_dict()
+                _save_engine(engine)
                 session['current_field_v3'] = '_model_confirmation'
                 # Only store the essentials — keep cookie small
                 session['pending_identification'] = {
@@ -428,6 +599,7 @@ def message_v3():
 
             # Set product info in engine
             engine.set_product_info(identification['product_info'])
+            _prefetch_offer_research(engine)  # Market price research can start now
 
             # Approve questions (engine filters out already-collected fields)
             approved_questions = engine.approve_questions(identification['proposed_questions'])
@@ -441,7 +613,7 @@ def message_v3():
             if not approved_questions:
                 # If no questions needed (enough info from initial message), calculate offer
                 print("✅ No questions needed - enough info collected!")
-                session['engine_v3'] = engine.to_dict()
+                _save_engine(engine)
                 # product_info_v3 removed — redundant with engine state, wastes cookie space
                 session['product_info'] = _normalize_v3_product_info(
                     identification['product_info'], engine.collected_fields
@@ -452,16 +624,9 @@ def message_v3():
                     'message': "Got it! Calculating your offer now..."
                 })
 
-            # Generate friendly acknowledgment
-            acknowledgment = ai_service_v3.generate_acknowledgment(identification['product_info'])
-
-            # Generate first question
+            # Friendly acknowledgment + first question (from the combined call when usable)
             first_field = approved_questions[0]
-            question_data = ai_service_v3.generate_question(
-                first_field,
-                identification['product_info'],
-                engine.collected_fields
-            )
+            acknowledgment, question_data = _phase1_opening(identification, first_field, engine)
 
             # Validate the question with engine
             validation = engine.validate_ai_question(
@@ -481,9 +646,10 @@ def message_v3():
             # Record AI message
             full_response = f"{acknowledgment}\n\n{question_data['question_text']}"
             engine.record_ai_message(full_response)
+            _start_question_plan(engine, first_field)
 
             # Save engine state to session
-            session['engine_v3'] = engine.to_dict()
+            _save_engine(engine)
             session['current_field_v3'] = first_field  # Track which field we're asking about
             _log_session_size("after Phase 1 save")
 
@@ -513,18 +679,20 @@ def message_v3():
                 print("   Resetting engine and treating as Phase 1...")
                 engine = GuardrailEngine()
                 session.pop('engine_v3', None)
+                session.pop('engine_v3_turns', None)
                 session.pop('current_field_v3', None)
 
                 # Re-run Phase 1 with the new engine
-                identification = ai_service_v3.identify_product(user_message)
+                identification = ai_service_v3.identify_product(user_message, with_opening=Config.V3_COMBINED_PHASE1)
                 engine.set_product_info(identification['product_info'])
+                _prefetch_offer_research(engine)
                 approved_questions = engine.approve_questions(identification['proposed_questions'])
 
                 print(f"\n🔑 PHASE 1 (RECOVERED) DECISION POINT:")
                 print(f"   approved_questions: {approved_questions}")
 
                 if not approved_questions:
-                    session['engine_v3'] = engine.to_dict()
+                    _save_engine(engine)
                     # product_info_v3 removed — redundant with engine state, wastes cookie space
                     session['product_info'] = _normalize_v3_product_info(
                         identification['product_info'], engine.collected_fields
@@ -535,11 +703,8 @@ def message_v3():
                         'message': "Got it! Calculating your offer now..."
                     })
 
-                acknowledgment = ai_service_v3.generate_acknowledgment(identification['product_info'])
                 first_field = approved_questions[0]
-                question_data = ai_service_v3.generate_question(
-                    first_field, identification['product_info'], engine.collected_fields
-                )
+                acknowledgment, question_data = _phase1_opening(identification, first_field, engine)
                 validation = engine.validate_ai_question(
                     first_field, question_data['question_text'],
                     question_data.get('quick_options', [])
@@ -550,7 +715,8 @@ def message_v3():
 
                 full_response = f"{acknowledgment}\n\n{question_data['question_text']}"
                 engine.record_ai_message(full_response)
-                session['engine_v3'] = engine.to_dict()
+                _start_question_plan(engine, first_field)
+                _save_engine(engine)
                 session['current_field_v3'] = first_field
 
                 return jsonify({
@@ -579,10 +745,11 @@ def message_v3():
 
                     # Now run the normal Phase 1 flow with corrected product info
                     engine.set_product_info(pending['product_info'])
+                    _prefetch_offer_research(engine)
                     approved_questions = engine.approve_questions(pending['proposed_questions'])
 
                     if not approved_questions:
-                        session['engine_v3'] = engine.to_dict()
+                        _save_engine(engine)
                         session['product_info'] = _normalize_v3_product_info(
                             pending['product_info'], engine.collected_fields
                         )
@@ -592,11 +759,8 @@ def message_v3():
                             'message': f"Got it, {confirmed_model}! Calculating your offer now..."
                         })
 
-                    acknowledgment = ai_service_v3.generate_acknowledgment(pending['product_info'])
                     first_field = approved_questions[0]
-                    question_data = ai_service_v3.generate_question(
-                        first_field, pending['product_info'], engine.collected_fields
-                    )
+                    acknowledgment, question_data = _phase1_opening(pending, first_field, engine)
                     validation = engine.validate_ai_question(
                         first_field, question_data['question_text'],
                         question_data.get('quick_options', [])
@@ -604,7 +768,8 @@ def message_v3():
                     if not validation['valid']:
                         return jsonify({'success': False, 'error': 'Internal error'}), 500
 
-                    session['engine_v3'] = engine.to_dict()
+                    _start_question_plan(engine, first_field)
+                    _save_engine(engine)
                     session['current_field_v3'] = first_field
                     _log_session_size("after model confirmation")
 
@@ -632,20 +797,26 @@ def message_v3():
                     'error': 'Session lost. Please start over.'
                 }), 400
 
-            # Extract answer from user message
-            extracted_answer = ai_service_v3.extract_answer(
-                user_message,
-                last_question_field,
-                engine.product_info
-            )
+            # Option taps / structured values are matched locally; free text goes to extract_answer
+            quick_options = engine.ui_options[0].get('options', []) if engine.ui_options else []
+            extracted_answer = match_answer(user_message, last_question_field, quick_options)
+            if extracted_answer is not None:
+                print(f"⚡ Fast-path answer for {last_question_field}: {extracted_answer}")
+            else:
+                extracted_answer = ai_service_v3.extract_answer(
+                    user_message,
+                    last_question_field,
+                    engine.product_info
+                )
 
             # Record the answer in engine
             engine.record_answer(last_question_field, extracted_answer)
+            _prefetch_offer_research(engine)  # Refresh research if this answer changed its inputs
 
             # Check if we should calculate offer now
             if engine.should_calculate_offer():
                 print("✅ Enough info collected - triggering offer calculation!")
-                session['engine_v3'] = engine.to_dict()
+                _save_engine(engine)
                 # product_info_v3 removed — redundant with engine state, wastes cookie space
                 session['product_info'] = _normalize_v3_product_info(
                     dict(engine.product_info), dict(engine.collected_fields)
@@ -670,7 +841,7 @@ def message_v3():
             if not next_field:
                 # Shouldn't happen (engine should have triggered calculation), but safety
                 print("⚠️  No next question but calculation not triggered - forcing calculation")
-                session['engine_v3'] = engine.to_dict()
+                _save_engine(engine)
                 # product_info_v3 removed — redundant with engine state, wastes cookie space
                 session['product_info'] = _normalize_v3_product_info(
                     dict(engine.product_info), dict(engine.collected_fields)
@@ -684,12 +855,8 @@ def message_v3():
                     'has_damage': _has_damage(engine.collected_fields)
                 })
 
-            # Generate next question
-            question_data = ai_service_v3.generate_question(
-                next_field,
-                engine.product_info,
-                engine.collected_fields
-            )
+            # Next question (planned at identification time; damage_severity generated now)
+            question_data = _question_for(next_field, engine)
 
             # Validate with engine
             validation = engine.validate_ai_question(
@@ -701,7 +868,7 @@ def message_v3():
             if not validation['valid']:
                 print(f"⚠️  Question rejected: {validation['reason']}")
                 # Force calculation since we can't ask more questions
-                session['engine_v3'] = engine.to_dict()
+                _save_engine(engine)
                 # product_info_v3 removed — redundant with engine state, wastes cookie space
                 session['product_info'] = _normalize_v3_product_info(
                     dict(engine.product_info), dict(engine.collected_fields)
@@ -715,11 +882,14 @@ def message_v3():
                     'has_damage': _has_damage(engine.collected_fields)
                 })
 
-            # Record AI message
-            engine.record_ai_message(question_data['question_text'])
+            # Record AI message (a streamed question is recorded next turn, once its text is complete)
+            if question_data.get('deferred'):
+                session['streamed_field_v3'] = next_field
+            else:
+                engine.record_ai_message(question_data['question_text'])
 
             # Save state
-            session['engine_v3'] = engine.to_dict()
+            _save_engine(engine)
             session['current_field_v3'] = next_field
             _log_session_size("after Phase 2 next-question save")
 
@@ -744,6 +914,57 @@ def message_v3():
         }), 500
 
 
+@app.route('/api/message/v3/stream', methods=['POST'])
+def message_v3_stream():
+    """
+    /api/message/v3 with the next question's text streamed as it is generated.
+
+    Turns that don't generate a question (Phase 1, planned/banked questions,
+    offer ready, errors) return the same JSON as /api/message/v3. Otherwise
+    the response is Server-Sent Events:
+        token - {'text': ...} next piece of the question text
+        done  - the usual /api/message/v3 payload, complete question included
+    """
+    g.stream_question = True
+    response = message_v3()
+    deferred = g.get('deferred_question')
+    if not deferred or isinstance(response, tuple):
+        return response
+
+    payload = response.get_json()
+    if not payload.get('success') or payload.get('should_calculate'):
+        return response  # Question was rejected - nothing to stream
+    session_id = _get_session_id()
+    field_name, product_info, collected_fields = deferred
+
+    def events():
+        question_data = None
+        try:
+            for kind, value in ai_service_v3.stream_question(field_name, product_info, collected_fields):
+                if kind == 'token':
+                    yield f"event: token\ndata: {json.dumps({'text': value})}\n\n"
+                else:
+                    question_data = value
+        except Exception as e:
+            print(f"⚠️  Question stream failed ({e}) - generating without streaming")
+
+        if question_data is None:
+            question_data = ai_service_v3.generate_question(field_name, product_info, collected_fields)
+
+        question_plans.remember_streamed(session_id, field_name, product_info, question_data)
+        payload.update({
+            'question': question_data['question_text'],
+            'ui_type': question_data.get('ui_type', 'text'),
+            'quick_options': question_data.get('quick_options', [])
+        })
+        yield f"event: done\ndata: {json.dumps(payload)}\n\n"
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Don't let proxies buffer the stream
+    })
+
+
 @app.route('/api/go-back/v3', methods=['POST'])
 def go_back_v3():
     """
@@ -751,11 +972,13 @@ def go_back_v3():
     Rolls back engine state by one question and re-generates that question.
     """
     try:
-        engine_state = session.get('engine_v3', {})
-        if not engine_state:
+        engine = _load_engine()
+        if not engine:
             return jsonify({'success': False, 'error': 'No session found'}), 400
 
-        engine = GuardrailEngine.from_dict(engine_state)
+        # A question streamed last turn was shown - record it now, before the undo changes current_field_v3
+        _restore_streamed_question(engine)
+
         last_field = session.get('current_field_v3', '')
 
         if engine.question_count <= 0 or not engine.asked_fields:
@@ -780,6 +1003,7 @@ def go_back_v3():
         # Undo: remove from collected_fields, decrement question_count, remove from asked_fields
         engine.collected_fields.pop(field_to_redo, None)
         engine.asked_fields.discard(field_to_redo)
+        engine.mark_dirty('collected_fields', 'asked_fields')
         engine.question_count = max(0, engine.question_count - 1)
 
         # If this was a damage_severity that was injected, also remove it from approved_questions
@@ -787,17 +1011,17 @@ def go_back_v3():
         if field_to_redo == 'damage_severity':
             if 'damage_severity' in engine.approved_questions:
                 engine.approved_questions.remove('damage_severity')
+                engine.mark_dirty('approved_questions')
+
+        # The undone answer may have fed prefetched research - start over
+        _cancel_offer_prefetch()
 
         print(f"\n⬅️  GO BACK: Undoing '{field_to_redo}'")
         print(f"   question_count: {engine.question_count}")
         print(f"   collected_fields: {list(engine.collected_fields.keys())}")
 
-        # Re-generate the question for this field
-        question_data = ai_service_v3.generate_question(
-            field_to_redo,
-            engine.product_info,
-            engine.collected_fields
-        )
+        # Re-show the question for this field
+        question_data = _question_for(field_to_redo, engine)
 
         # Re-validate (re-adds to asked_fields and increments question_count)
         validation = engine.validate_ai_question(
@@ -810,7 +1034,7 @@ def go_back_v3():
             return jsonify({'success': False, 'error': 'Could not regenerate question'}), 500
 
         engine.record_ai_message(question_data['question_text'])
-        session['engine_v3'] = engine.to_dict()
+        _save_engine(engine)
         session['current_field_v3'] = field_to_redo
         _log_session_size("after go-back")
 
@@ -831,17 +1055,85 @@ def go_back_v3():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/llm-stats', methods=['GET'])
+def llm_stats():
+    """Per-call-site Claude latency, token usage and error rates (this worker only)"""
+    from utils.llm_gateway import get_llm_gateway
+    stats = get_llm_gateway().get_stats()
+    if ai_service_v3:
+        stats['question_bank'] = ai_service_v3.question_bank.get_stats()
+        if ai_service_v3.catalog:
+            stats['product_catalog'] = ai_service_v3.catalog.get_stats()
+        stats['identification_reuse'] = ai_service_v3.identifications.get_stats()
+        stats['model_routing'] = ai_service_v3.router.get_stats()
+    return jsonify({'success': True, 'pid': os.getpid(), **stats})
+
+
 @app.route('/api/reset-session', methods=['POST'])
 def reset_session():
     """Force clear session for testing/debugging"""
+    _cancel_offer_prefetch()
+    if question_plans is not None and 'session_id' in session:
+        question_plans.discard(session['session_id'])
     session.clear()
     session['_version'] = SESSION_VERSION
     return jsonify({'success': True, 'message': 'Session cleared', 'version': SESSION_VERSION})
 
 
+def _store_offer_in_session(offer_data):
+    """Store offer data in session - MINIMAL with cookie sessions (full data overflows 4KB!)"""
+    if SERVER_SIDE_SESSIONS:
+        session['offer_data'] = dict(offer_data)
+        return
+
+    session['offer_data'] = {
+        'offer_amount': offer_data.get('offer_amount'),
+        'market_value': offer_data.get('market_value'),
+        'repair_costs': offer_data.get('repair_costs', 0),
+        'recommendation': offer_data.get('recommendation'),
+        'reason': offer_data.get('reason', ''),
+        'confidence': offer_data.get('confidence', 0),
+        'sell_now_offer': offer_data.get('sell_now_offer'),
+        'consignment_payout': offer_data.get('consignment_payout'),
+    }
+    _log_session_size("after offer stored")
+
+
+def _offer_job_response(job):
+    """Public view of an offer job (never exposes the owning session id)"""
+    response = {
+        'success': job['status'] != 'failed',
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'stage': job.get('stage'),
+        'completed_stages': job.get('completed_stages', []),
+        'stages': OfferJobService.STAGES
+    }
+    if job['status'] == 'done':
+        response['offer'] = job['offer']
+    elif job['status'] == 'failed':
+        response['error'] = job.get('error')
+    return response
+
+
+def _get_own_offer_job(job_id):
+    """Look up a job, only if it belongs to the current session"""
+    job = offer_job_service.get(job_id) if offer_job_service else None
+    if not job or job.get('session_id') != session.get('session_id'):
+        return None
+    return job
+
+
 @app.route('/api/calculate-offer', methods=['POST'])
 def calculate_offer():
-    """Calculate and return offer"""
+    """
+    Calculate and return offer
+
+    Send {"async": true} to get a job id back immediately instead of waiting;
+    then poll /api/offer-jobs/<job_id> (or, with OFFER_JOB_STREAMING on, stream
+    /api/offer-jobs/<job_id>/events). Without OFFER_JOBS_ENABLED the offer is
+    always calculated inline.
+    """
 
     # Get product info from session
     product_info = session.get('product_info', {})
@@ -863,22 +1155,25 @@ def calculate_offer():
     # Extract damage info if present
     damage_info = product_info.get('damage', {})
 
+    # Async mode: hand the pipeline to a background job and free this worker
+    payload = request.get_json(silent=True) or {}
+    if payload.get('async') and Config.OFFER_JOBS_ENABLED and offer_job_service is not None:
+        job = offer_job_service.submit(product_info, damage_info, session_id=_get_session_id())
+        response = {
+            **_offer_job_response(job),
+            'status_url': f"/api/offer-jobs/{job['job_id']}"
+        }
+        if Config.OFFER_JOB_STREAMING:
+            response['events_url'] = f"/api/offer-jobs/{job['job_id']}/events"
+        return jsonify(response), 202
+
     # Calculate offer
     try:
-        offer_data = offer_service.calculate_offer(product_info, damage_info)
-
-        # Store MINIMAL offer data in session (full data overflows 4KB cookie!)
-        session['offer_data'] = {
-            'offer_amount': offer_data.get('offer_amount'),
-            'market_value': offer_data.get('market_value'),
-            'repair_costs': offer_data.get('repair_costs', 0),
-            'recommendation': offer_data.get('recommendation'),
-            'reason': offer_data.get('reason', ''),
-            'confidence': offer_data.get('confidence', 0),
-            'sell_now_offer': offer_data.get('sell_now_offer'),
-            'consignment_payout': offer_data.get('consignment_payout'),
-        }
-        _log_session_size("after offer stored")
+        offer_data = offer_service.calculate_offer(
+            product_info, damage_info, session_id=session.get('session_id')
+        )
+
+        _store_offer_in_session(offer_data)
 
         # Add product_info to the response so frontend can display it
         offer_data['product_info'] = product_info
@@ -897,6 +1192,65 @@ def calculate_offer():
         }), 500
 
 
+@app.route('/api/offer-jobs/<job_id>', methods=['GET'])
+def get_offer_job(job_id):
+    """Poll a background offer job"""
+    job = _get_own_offer_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Offer job not found. Please try again.'}), 404
+
+    if job['status'] == 'done':
+        _store_offer_in_session(job['offer'])
+
+    return jsonify(_offer_job_response(job))
+
+
+@app.route('/api/offer-jobs/<job_id>/events', methods=['GET'])
+def stream_offer_job(job_id):
+    """
+    Server-Sent Events stream of a background offer job's progress.
+
+    Emits a 'progress' event whenever the stage changes and a final 'done' or
+    'failed' event. The client then fetches /api/offer-jobs/<job_id> once for
+    the offer (that request stores it in the session cookie). Streams close
+    after OFFER_JOB_STREAM_TIMEOUT with a 'timeout' event - clients fall back
+    to polling.
+
+    Each open stream occupies a worker thread, so this is only served with
+    OFFER_JOB_STREAMING on (gthread/gevent workers - see render.yaml).
+    """
+    if not Config.OFFER_JOB_STREAMING or not _get_own_offer_job(job_id):
+        return jsonify({'success': False, 'error': 'Offer job not found. Please try again.'}), 404
+
+    def events():
+        deadline = time.time() + Config.OFFER_JOB_STREAM_TIMEOUT
+        last_sent = None
+
+        while time.time() < deadline:
+            job = offer_job_service.get(job_id)
+            if not job:
+                yield f"event: failed\ndata: {json.dumps({'error': 'Offer job expired'})}\n\n"
+                return
+
+            progress = (job['status'], job.get('stage'))
+            if progress != last_sent:
+                last_sent = progress
+                data = {k: v for k, v in _offer_job_response(job).items() if k != 'offer'}
+                event = job['status'] if job['status'] in ('done', 'failed') else 'progress'
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+                if event != 'progress':
+                    return
+
+            time.sleep(0.5)
+
+        yield f"event: timeout\ndata: {json.dumps({'job_id': job_id})}\n\n"
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Don't let proxies buffer the stream
+    })
+
+
 @app.route('/api/submit-user-estimate', methods=['POST'])
 def submit_user_estimate():
     """Handle user's price estimate when no market data found"""
@@ -12,10 +12,82 @@ class Config:
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
 
+    # Sessions: cookie (Flask default, ~4KB limit) | memory | sqlite | redis
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')
+    SESSION_TTL = int(os.getenv('SESSION_TTL', 24 * 3600))  # seconds since last change
+    SESSION_DB_PATH = os.getenv('SESSION_DB_PATH', os.getenv('CACHE_DB_PATH', 'data/cache.db'))
+    SESSION_MEMORY_MAX_ENTRIES = int(os.getenv('SESSION_MEMORY_MAX_ENTRIES', 10000))
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+
+    # GuardrailEngine session state: binary (compact, versioned - utils/state_codec) | json (legacy dict)
+    ENGINE_STATE_FORMAT = os.getenv('ENGINE_STATE_FORMAT', 'binary')
+    ENGINE_STATE_COMPRESS = os.getenv('ENGINE_STATE_COMPRESS', 'True').lower() == 'true'
+
     # Anthropic AI
     ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
     ANTHROPIC_MODEL = 'claude-3-haiku-20240307'  # Using Haiku - Sonnet causes OOM on free Render tier
 
+    # LLM gateway (one shared Anthropic client per process - see utils/llm_gateway.py)
+    LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', 8))  # concurrent Claude calls per worker
+    LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 10))  # max seconds to wait for a free slot
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))  # SDK retries on 429/5xx/connection errors
+    LLM_DEFAULT_TIMEOUT = float(os.getenv('LLM_DEFAULT_TIMEOUT', 30))  # seconds
+    LLM_PROMPT_CACHING = os.getenv('LLM_PROMPT_CACHING', 'True').lower() == 'true'  # cache static system prompts
+    LLM_CALL_SITE_TIMEOUTS = {  # seconds, per call site
+        'courier.eligibility': 10,
+        'courier.business_model': 10,
+        'v3.identify_product': 30,
+        'v3.identify_with_opening': 35,
+        'v3.generate_question': 20,
+        'v3.acknowledgment': 8,
+        'v3.question_plan': 40,
+        'v2.next_question': 30,
+        'v2.combined_turn': 30,
+        'v2.parse_question': 10,
+        'v2.extract_details': 30,
+        'v2.extract_delta': 15,
+        'v2.search_queries': 15,
+        'v2.assess_confidence': 15,
+        'repair.estimate': 30,
+    }
+
+    # Conversation flow feature flags (v2 / v3)
+    # v2 flow: send only the latest exchange + product_info each turn (full history as fallback)
+    V2_INCREMENTAL_TURNS = os.getenv('V2_INCREMENTAL_TURNS', 'True').lower() == 'true'
+    # v2 flow: one Claude call per turn for extraction + next question
+    V2_COMBINED_TURNS = os.getenv('V2_COMBINED_TURNS', 'True').lower() == 'true'
+
+    # v3 flow: identification + acknowledgment + first question in one Claude call
+    V3_COMBINED_PHASE1 = os.getenv('V3_COMBINED_PHASE1', 'True').lower() == 'true'
+    # v3 flow: acknowledgment + first question run concurrently when generated separately
+    PHASE1_FANOUT_WORKERS = int(os.getenv('PHASE1_FANOUT_WORKERS', 4))  # per worker
+    PHASE1_FANOUT_DEADLINE = float(os.getenv('PHASE1_FANOUT_DEADLINE', 20))  # seconds, shared by both calls
+
+    # v3 question bank (services/question_bank.py) - bump the version to drop all banked questions
+    QUESTION_BANK_ENABLED = os.getenv('QUESTION_BANK_ENABLED', 'True').lower() == 'true'
+    QUESTION_BANK_TTL = int(os.getenv('QUESTION_BANK_TTL', 30 * 24 * 3600))
+    QUESTION_BANK_VERSION = os.getenv('QUESTION_BANK_VERSION', '1')
+
+    # v3 model routing: simple inputs go to Haiku first, escalating to Sonnet on parse failure / low confidence
+    MODEL_ROUTING_ENABLED = os.getenv('MODEL_ROUTING_ENABLED', 'True').lower() == 'true'
+    MODEL_ROUTING_SIMPLE_MAX_WORDS = int(os.getenv('MODEL_ROUTING_SIMPLE_MAX_WORDS', 8))  # longer messages -> Sonnet
+
+    # Local product catalog: well-known products are identified without an LLM call
+    PRODUCT_CATALOG_ENABLED = os.getenv('PRODUCT_CATALOG_ENABLED', 'True').lower() == 'true'
+    PRODUCT_CATALOG_PATH = os.getenv('PRODUCT_CATALOG_PATH', 'data/product_catalog.json')
+    PRODUCT_CATALOG_MIN_CONFIDENCE = float(os.getenv('PRODUCT_CATALOG_MIN_CONFIDENCE', 0.85))  # below -> LLM
+
+    # Near-duplicate reuse of identify_product results (MinHash/LSH over message trigrams)
+    IDENTIFICATION_REUSE_ENABLED = os.getenv('IDENTIFICATION_REUSE_ENABLED', 'True').lower() == 'true'
+    IDENTIFICATION_REUSE_THRESHOLD = float(os.getenv('IDENTIFICATION_REUSE_THRESHOLD', 0.8))  # trigram Jaccard
+    IDENTIFICATION_REUSE_TTL = int(os.getenv('IDENTIFICATION_REUSE_TTL', 14 * 24 * 3600))  # seconds
+
+    # v3 question plan: all remaining questions generated in one background call after Phase 1
+    QUESTION_PLAN_ENABLED = os.getenv('QUESTION_PLAN_ENABLED', 'True').lower() == 'true'
+    QUESTION_PLAN_MAX_WORKERS = int(os.getenv('QUESTION_PLAN_MAX_WORKERS', 4))  # per worker
+    QUESTION_PLAN_TTL = int(os.getenv('QUESTION_PLAN_TTL', 3600))  # seconds
+    QUESTION_PLAN_WAIT = float(os.getenv('QUESTION_PLAN_WAIT', 10))  # max wait for an in-flight plan
+
     # Perplexity AI
     PERPLEXITY_API_KEY = os.getenv('PERPLEXITY_API_KEY')
 
@@ -58,6 +130,63 @@ class Config:
     SCRAPING_TIMEOUT = 10  # seconds
     USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
+    # Outbound HTTP (shared keep-alive pool used by scrapers and Perplexity)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 10))  # hosts kept pooled
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))  # connections per host
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))  # seconds
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 15))  # default when a call site doesn't set one
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 2))  # connect errors and 429/5xx only
+    HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))  # 0.5s, 1s, 2s...
+
+    # Research Caching
+    # SQLite file shared by all workers on a host (use /tmp/... on read-only filesystems)
+    CACHE_DB_PATH = os.getenv('CACHE_DB_PATH', 'data/cache.db')
+    CACHE_PURGE_SAMPLE_RATE = float(os.getenv('CACHE_PURGE_SAMPLE_RATE', 0.01))  # share of writes that purge expired rows
+    PRICE_CACHE_ENABLED = os.getenv('PRICE_CACHE_ENABLED', 'True').lower() == 'true'
+    PRICE_CACHE_DEFAULT_TTL = int(os.getenv('PRICE_CACHE_DEFAULT_TTL', 12 * 3600))  # seconds
+    PRICE_CACHE_CATEGORY_TTLS = {  # Fast-moving markets expire sooner
+        'phone': 6 * 3600,
+        'smartphone': 6 * 3600,
+        'tablet': 12 * 3600,
+        'laptop': 12 * 3600,
+        'console': 24 * 3600,
+        'camera': 24 * 3600,
+        'watch': 24 * 3600,
+        'appliance': 72 * 3600,
+        'vehicle': 72 * 3600,
+        'furniture': 72 * 3600,
+    }
+    REPAIR_CACHE_ENABLED = os.getenv('REPAIR_CACHE_ENABLED', 'True').lower() == 'true'
+    REPAIR_CACHE_TTL = int(os.getenv('REPAIR_CACHE_TTL', 7 * 24 * 3600))  # Repair prices move slowly
+
+    # Repair research concurrency
+    REPAIR_RESEARCH_MAX_WORKERS = int(os.getenv('REPAIR_RESEARCH_MAX_WORKERS', 3))
+    REPAIR_RESEARCH_DEADLINE = float(os.getenv('REPAIR_RESEARCH_DEADLINE', 35))  # seconds for ALL damages
+
+    # Single-flight coalescing of identical in-flight Perplexity queries
+    SINGLE_FLIGHT_SHARED = os.getenv('SINGLE_FLIGHT_SHARED', 'True').lower() == 'true'  # across workers (via CACHE_DB_PATH)
+    SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', 45))  # max seconds a follower waits
+    SINGLE_FLIGHT_LOCK_TTL = int(os.getenv('SINGLE_FLIGHT_LOCK_TTL', 45))  # stale lock expiry if a worker dies
+    SINGLE_FLIGHT_RESULT_TTL = int(os.getenv('SINGLE_FLIGHT_RESULT_TTL', 60))  # how long followers can pick up a result
+
+    # Courier eligibility (local rules first; AI verdicts for unknown items are cached)
+    COURIER_VERDICT_CACHE_ENABLED = os.getenv('COURIER_VERDICT_CACHE_ENABLED', 'True').lower() == 'true'
+    COURIER_VERDICT_CACHE_TTL = int(os.getenv('COURIER_VERDICT_CACHE_TTL', 30 * 24 * 3600))  # Item shapes don't change
+
+    # Speculative offer prefetch (research starts while the user answers questions)
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'True').lower() == 'true'
+    PREFETCH_MAX_CONCURRENT = int(os.getenv('PREFETCH_MAX_CONCURRENT', 4))  # per worker
+    PREFETCH_JOB_TTL = int(os.getenv('PREFETCH_JOB_TTL', 30 * 60))  # forget abandoned sessions' jobs
+
+    # Background offer jobs (/api/calculate-offer async mode, polled by the client)
+    # Needs a long-lived process - off by default on Vercel, which freezes threads once a response is sent
+    OFFER_JOBS_ENABLED = os.getenv('OFFER_JOBS_ENABLED', 'False' if os.getenv('VERCEL') else 'True').lower() == 'true'
+    OFFER_JOB_MAX_WORKERS = int(os.getenv('OFFER_JOB_MAX_WORKERS', 4))  # per worker
+    OFFER_JOB_TTL = int(os.getenv('OFFER_JOB_TTL', 30 * 60))  # seconds a finished job stays pollable
+    # SSE progress stream holds a worker for the whole job - only enable with a gthread/gevent worker class
+    OFFER_JOB_STREAMING = os.getenv('OFFER_JOB_STREAMING', 'False').lower() == 'true'
+    OFFER_JOB_STREAM_TIMEOUT = int(os.getenv('OFFER_JOB_STREAM_TIMEOUT', 90))  # max SSE connection length
+
     # Currency
     EXCHANGE_RATE_API_KEY = os.getenv('EXCHANGE_RATE_API_KEY')
     FALLBACK_USD_ZAR_RATE = 18.5  # Fallback if API fails
@@ -1,4 +1,4 @@
-import requests
+from utils.http_client import http_get
 from bs4 import BeautifulSoup
 from config import Config
 import re
@@ -37,7 +37,7 @@ class CompetitorScraper:
                 search_url = f"https://www.bobshop.co.za/Browse/Search.aspx?q={query}"
                 print(f"  Searching BobShop: {search_url}")
 
-                response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+                response = http_get(search_url, headers=self.headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -101,7 +101,7 @@ class CompetitorScraper:
         for query in search_queries[:2]:
             try:
                 search_url = f"{base_url}/?s={query}"
-                response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+                response = http_get(search_url, headers=self.headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -136,7 +136,7 @@ class CompetitorScraper:
         for query in search_queries[:2]:
             try:
                 search_url = f"{base_url}/search?q={query}"
-                response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+                response = http_get(search_url, headers=self.headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -171,7 +171,7 @@ class CompetitorScraper:
         for query in search_queries[:2]:
             try:
                 search_url = f"{base_url}/?s={query}&post_type=product"
-                response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
+                response = http_get(search_url, headers=self.headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
@@ -1,4 +1,4 @@
-import requests
+from utils.http_client import http_get
 from bs4 import BeautifulSoup
 from config import Config
 import re
@@ -29,7 +29,7 @@ class EbayScraper:
                 # eBay search URL - filter for used items
                 search_url = f"{self.base_url}/sch/i.html?_nkw={query.replace(' ', '+')}&LH_ItemCondition=3000"
 
-                response = requests.get(
+                response = http_get(
                     search_url,
                     headers=self.headers,
                     timeout=self.timeout
@@ -102,7 +102,7 @@ class EbayScraper:
                 # eBay sold listings filter
                 search_url = f"{self.base_url}/sch/i.html?_nkw={query.replace(' ', '+')}&LH_Sold=1&LH_Complete=1&LH_ItemCondition=3000"
 
-                response = requests.get(
+                response = http_get(
                     search_url,
                     headers=self.headers,
                     timeout=self.timeout
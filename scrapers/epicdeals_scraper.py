@@ -1,4 +1,4 @@
-import requests
+from utils.http_client import http_get
 from bs4 import BeautifulSoup
 from config import Config
 import re
@@ -30,7 +30,7 @@ class EpicDealsScraper:
 
                 print(f"  Searching EpicDeals: {search_url}")
 
-                response = requests.get(
+                response = http_get(
                     search_url,
                     headers=self.headers,
                     timeout=Config.SCRAPING_TIMEOUT
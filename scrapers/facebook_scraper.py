@@ -5,6 +5,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from config import Config
+from utils.http_client import http_get
 import re
 import time
 
@@ -130,15 +131,13 @@ class FacebookMarketplaceScraper:
         Simplified search without Selenium (less reliable but faster)
         Tries to fetch FB Marketplace via requests (likely to fail due to JS rendering)
         """
-        import requests
-
         results = []
         headers = {'User-Agent': Config.USER_AGENT}
 
         for query in search_queries[:1]:
             try:
                 search_url = f"{self.base_url}?query={query.replace(' ', '%20')}"
-                response = requests.get(search_url, headers=headers, timeout=self.timeout)
+                response = http_get(search_url, headers=headers, timeout=self.timeout)
 
                 if response.status_code == 200:
                     # Try basic price extraction from HTML
@@ -1,4 +1,4 @@
-import requests
+from utils.http_client import http_get
 from bs4 import BeautifulSoup
 from config import Config
 import re
@@ -31,7 +31,7 @@ class GumtreeScraper:
 
                 print(f"  Searching Gumtree: {search_url}")
 
-                response = requests.get(
+                response = http_get(
                     search_url,
                     headers=self.headers,
                     timeout=Config.SCRAPING_TIMEOUT
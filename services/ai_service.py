@@ -1,5 +1,59 @@
-import anthropic
+import json
+import re
 from config import Config
+from utils.llm_gateway import cached_system, get_llm_gateway
+
+
+# Fields extract_product_details returns - a delta may only use these
+EXTRACTION_FIELDS = {
+    'category', 'brand', 'model', 'specifications', 'condition', 'damage',
+    'damage_details', 'device_unlocked', 'contract_free'
+}
+
+# Identity fields: a delta that changes an already-known value falls back to full history
+IDENTITY_FIELDS = ('category', 'brand', 'model')
+
+EXTRACTION_SCHEMA = """Allowed fields (same formats as the current details):
+{
+    "category": "phone|laptop|camera|tablet|console|appliance|watch|other",
+    "brand": "Brand name",
+    "model": "Model name/number",
+    "specifications": {"capacity": "e.g., 128GB", "color": "e.g., Space Gray", "year": "e.g., 2020", "size": "e.g., 15 inch"},
+    "condition": "pristine|excellent|good|fair|poor|broken",
+    "damage": {"screen": "none|scratched|cracked|broken", "body": "none|minor_scratches|dents|cracks",
+               "battery": "good|degraded|dead", "functional": "fully_working|some_issues|not_working", "notes": "..."},
+    "damage_details": "Summary of damage/issues mentioned",
+    "device_unlocked": "yes|no",
+    "contract_free": "yes|no"
+}
+
+DAMAGE RULES:
+- "None - Everything works perfectly", "no damage", "everything works", "pristine" → damage_details: "No issues mentioned"
+- Specific issues → damage_details: "Brief summary of issues"
+- Only include the specifications/damage keys that changed"""
+
+DELTA_EXTRACTION_PROMPT = """You keep the structured details of an item a seller wants to sell up to date.
+
+You get the CURRENT DETAILS (JSON) and the LATEST EXCHANGE (our question and the seller's answer).
+Return ONLY a JSON object with the fields the latest answer adds or changes - nothing else.
+If the answer adds nothing, return {}
+
+""" + EXTRACTION_SCHEMA + """
+
+Start your response with { and end with }. NO other text."""
+
+# Appended to the get_next_question instructions in combined mode (extract=True)
+COMBINED_EXTRACTION_PROMPT = """
+
+═══════════════════════════════════════════════════════════════
+ALSO EXTRACT THE SELLER'S LATEST ANSWER:
+═══════════════════════════════════════════════════════════════
+Add an "extracted" key to the JSON template: an object with ONLY the fields the
+seller's latest message adds or changes compared to CURRENT PRODUCT INFO ({} if nothing).
+Choose the next question (and "completed") as if "extracted" were already merged
+into CURRENT PRODUCT INFO.
+
+""" + EXTRACTION_SCHEMA
 
 
 class AIService:
@@ -9,7 +63,7 @@ class AIService:
     """
 
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.llm = get_llm_gateway()  # Shared Claude client
         self.model = Config.ANTHROPIC_MODEL
         self._required_fields_cache = {}  # Cache AI-determined requirements per product
 
@@ -214,7 +268,7 @@ class AIService:
                 'type': 'text'
             }
 
-    def get_next_question(self, conversation_history, product_info):
+    def get_next_question(self, conversation_history, product_info, incremental=False, extract=False):
         """
         Determines the next question to ask based on conversation history
         and currently gathered product information.
@@ -222,12 +276,17 @@ class AIService:
         Args:
             conversation_history: List of previous messages
             product_info: Dict of currently known product details
+            incremental: Send only the latest answer as messages (see V2_INCREMENTAL_TURNS)
+            extract: Combined mode - also extract the latest answer in the same call. A usable
+                delta is merged into product_info (before completion is validated) and
+                returned under 'extracted'; otherwise 'extracted' is None
 
         Returns:
             Dict with 'question', 'options' (if multiple choice), 'field_name', and 'completed' flag
         """
 
-        system_prompt = """You are an intelligent assistant for EpicDeals.co.za, a second-hand goods buyer in South Africa.
+        # Static instructions - sent as a cached prefix, so nothing per-call may go in here
+        static_prompt = """You are an intelligent assistant for EpicDeals.co.za, a second-hand goods buyer in South Africa.
 
 Your job is to ASK QUESTIONS to gather ONLY information that affects resale value and pricing.
 
@@ -776,12 +835,6 @@ DECLINE IMMEDIATELY if:
 - Device is locked to an account → decline_reason: "device_locked"
 - Device is under contract/payment plan → decline_reason: "under_contract"
 
-CURRENT PRODUCT INFO:
-""" + str(product_info) + """
-
-CONVERSATION HISTORY (check for duplicate questions):
-""" + str([msg['content'] for msg in conversation_history if msg['role'] == 'assistant']) + """
-
 ═══════════════════════════════════════════════════════════════
 YOUR RESPONSE MUST USE THIS EXACT JSON TEMPLATE - NO OTHER FORMAT:
 ═══════════════════════════════════════════════════════════════
@@ -795,6 +848,16 @@ YOUR RESPONSE MUST USE THIS EXACT JSON TEMPLATE - NO OTHER FORMAT:
 ═══════════════════════════════════════════════════════════════
 DO NOT write anything except the JSON above. Start your response with { and end with }"""
 
+        # Per-call context - the uncached suffix after the instructions
+        context_prompt = """
+
+CURRENT PRODUCT INFO:
+""" + str(product_info) + """
+
+CONVERSATION HISTORY (check for duplicate questions):
+""" + str([msg['content'] for msg in conversation_history if msg['role'] == 'assistant']) + """
+"""
+
         # CRITICAL: Prevent duplicate questions by tracking BOTH:
         # 1. Fields that have been successfully answered
         # 2. Questions that have been asked (even if user said "I don't know")
@@ -921,19 +984,19 @@ DO NOT write anything except the JSON above. Start your response with { and end
                 warning_parts.append(f"   - {topic}")
 
         if warning_parts:
-            system_prompt += f"\n\n{'='*70}\n"
-            system_prompt += f"🚨 CRITICAL - DO NOT ASK DUPLICATE QUESTIONS:\n"
-            system_prompt += f"{'='*70}\n"
-            system_prompt += "\n".join(warning_parts)
-            system_prompt += f"\n{'='*70}\n"
+            context_prompt += f"\n\n{'='*70}\n"
+            context_prompt += f"🚨 CRITICAL - DO NOT ASK DUPLICATE QUESTIONS:\n"
+            context_prompt += f"{'='*70}\n"
+            context_prompt += "\n".join(warning_parts)
+            context_prompt += f"\n{'='*70}\n"
             if fields_already_covered:
-                system_prompt += f"SKIP these answered fields: {', '.join(fields_already_covered)}\n"
+                context_prompt += f"SKIP these answered fields: {', '.join(fields_already_covered)}\n"
             if questions_already_asked:
-                system_prompt += f"DO NOT re-ask about topics: {', '.join(questions_already_asked)}\n"
-                system_prompt += f"If user said 'I don't know' to optional specs, SKIP that topic entirely!\n"
-            system_prompt += f"Ask the NEXT required question that hasn't been asked yet!\n"
-            system_prompt += f"\n🚫 NEVER ask general 'What condition' questions - go straight to damage assessment!\n"
-            system_prompt += f"{'='*70}\n\n"
+                context_prompt += f"DO NOT re-ask about topics: {', '.join(questions_already_asked)}\n"
+                context_prompt += f"If user said 'I don't know' to optional specs, SKIP that topic entirely!\n"
+            context_prompt += f"Ask the NEXT required question that hasn't been asked yet!\n"
+            context_prompt += f"\n🚫 NEVER ask general 'What condition' questions - go straight to damage assessment!\n"
+            context_prompt += f"{'='*70}\n\n"
 
         # Build conversation messages
         messages = []
@@ -952,11 +1015,23 @@ DO NOT write anything except the JSON above. Start your response with { and end
                 "completed": False
             }
 
+        if extract:
+            static_prompt += COMBINED_EXTRACTION_PROMPT
+            context_prompt += "\nRespond using the exact JSON template from the instructions above, plus the \"extracted\" key - start with { and end with }"
+        else:
+            context_prompt += "\nRespond using the exact JSON template from the instructions above - start with { and end with }"
+
+        # Incremental: earlier questions are already listed in the context and
+        # earlier answers are folded into product_info - send just the latest answer
+        if incremental and len(messages) > 1 and messages[-1]['role'] == 'user':
+            messages = messages[-1:]
+
         # Call Claude API
-        response = self.client.messages.create(
+        response = self.llm.create_message(
+            'v2.combined_turn' if extract else 'v2.next_question',
             model=self.model,
             max_tokens=1024,
-            system=system_prompt,
+            system=cached_system(static_prompt, context_prompt),
             messages=messages
         )
 
@@ -995,9 +1070,19 @@ DO NOT write anything except the JSON above. Start your response with { and end
             if 'completed' not in result:
                 result['completed'] = False
 
+            # Combined mode: merge the extraction first so completion is validated against it
+            extracted = result.pop('extracted', None)
+            if extract:
+                if extracted is not None and self._delta_is_consistent(extracted, product_info):
+                    self.merge_extracted(product_info, extracted)
+                else:
+                    extracted = None
+
             # CRITICAL: Validate completion - enforce required fields
             result = self._validate_completion(product_info, result)
 
+            if extract:
+                result['extracted'] = extracted
             return result
         except json.JSONDecodeError as e:
             # Fallback if AI doesn't return proper JSON
@@ -1086,7 +1171,8 @@ RULES:
 """
 
         try:
-            response = self.client.messages.create(
+            response = self.llm.create_message(
+                'v2.parse_question',
                 model='claude-3-haiku-20240307',  # Fast model for this simple task
                 max_tokens=500,
                 temperature=0,
@@ -1190,10 +1276,11 @@ Start with { and end with }. NO other text.
         for i, msg in enumerate(conversation_history):
             print(f"   [{i}] {msg['role']}: {msg['content'][:100]}")
 
-        response = self.client.messages.create(
+        response = self.llm.create_message(
+            'v2.extract_details',
             model=self.model,
             max_tokens=2048,
-            system=system_prompt,
+            system=system_prompt,  # Below Haiku's 2048-token cache minimum, so not marked for caching
             messages=messages
         )
 
@@ -1210,6 +1297,152 @@ Start with { and end with }. NO other text.
             print(f"   Full response: {raw_response}")
             return None
 
+    def process_answer(self, conversation_history, product_info):
+        """
+        Combined v2 turn: extraction and next question in one Claude call.
+
+        Uses get_next_question(extract=True). If the combined response has no
+        usable extraction (plain-text reply, inconsistent delta), extracts
+        separately and re-validates the question against the merged details.
+
+        Args:
+            conversation_history: Messages so far, ending with the seller's answer
+            product_info: Details collected so far - updated in place
+
+        Returns:
+            (extracted_info, next_question)
+        """
+        next_question = self.get_next_question(
+            conversation_history, product_info,
+            incremental=Config.V2_INCREMENTAL_TURNS, extract=True
+        )
+        extracted_info = next_question.pop('extracted', None)
+
+        if extracted_info is None:
+            print("   ↩️  Combined turn had no usable extraction - extracting separately")
+            extracted_info = self.extract_product_update(conversation_history, product_info)
+            self.merge_extracted(product_info, extracted_info)
+            next_question = self._validate_completion(product_info, next_question)
+
+        return extracted_info, next_question
+
+    def merge_extracted(self, product_info, extracted_info):
+        """
+        Merge extracted details into product_info in place.
+        None values never overwrite; specifications/damage are merged key by key
+        (a delta only carries the keys that changed).
+        """
+        if not extracted_info:  # Only update if extraction returned data
+            return
+
+        for key, value in extracted_info.items():
+            if value is not None:
+                if key in ('specifications', 'damage') and key in product_info and isinstance(value, dict):
+                    print(f"   🔄 Merging {key}: existing={product_info[key]}, new={value}")
+                    if not isinstance(product_info[key], dict):
+                        product_info[key] = {}
+                    product_info[key].update({k: v for k, v in value.items() if v is not None})
+                    print(f"   ✅ After merge: {product_info[key]}")
+                else:
+                    product_info[key] = value
+
+    def extract_product_update(self, conversation_history, product_info):
+        """
+        Extract what's new this turn, incrementally when possible.
+
+        With V2_INCREMENTAL_TURNS, only the latest question/answer and the
+        current product_info are sent (constant cost per turn instead of the
+        whole history). The first turn, and any delta that fails validation,
+        go through extract_product_details with the full history.
+
+        Returns:
+            Dict of fields to merge into product_info (None values = unknown), or None
+        """
+        if (Config.V2_INCREMENTAL_TURNS and product_info and len(conversation_history) >= 2
+                and conversation_history[-2]['role'] == 'assistant'
+                and conversation_history[-1]['role'] == 'user'):
+            delta = self.extract_product_delta(
+                conversation_history[-2]['content'],
+                conversation_history[-1]['content'],
+                product_info
+            )
+            if delta is not None:
+                return delta
+            print("   ↩️  Delta extraction inconsistent - falling back to full history")
+
+        return self.extract_product_details(conversation_history)
+
+    def extract_product_delta(self, last_question, answer, product_info):
+        """
+        Extracts only the fields the latest answer adds or changes.
+
+        Args:
+            last_question: The question we asked
+            answer: The seller's answer to it
+            product_info: Structured details collected so far
+
+        Returns:
+            Dict delta (possibly empty), or None if the delta is unusable
+        """
+        prompt = f"""CURRENT DETAILS:
+{json.dumps(product_info, default=str)}
+
+LATEST EXCHANGE:
+Question: {last_question}
+Answer: {answer}"""
+
+        try:
+            response = self.llm.create_message(
+                'v2.extract_delta',
+                model=self.model,
+                max_tokens=512,
+                system=DELTA_EXTRACTION_PROMPT,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            raw_response = response.content[0].text.strip()
+            json_match = re.search(r'\{[\s\S]*\}', raw_response)
+            delta = json.loads(json_match.group(0) if json_match else raw_response)
+        except Exception as e:
+            print(f"   ❌ Delta extraction failed: {e}")
+            return None
+
+        if not self._delta_is_consistent(delta, product_info):
+            return None
+
+        print(f"   ✅ Delta extraction: {delta}")
+        return delta
+
+    def _delta_is_consistent(self, delta, product_info):
+        """
+        Sanity-check a delta before merging it.
+
+        Rejects anything that isn't a dict of known fields with the right
+        shapes, and deltas that silently re-identify the item (changing an
+        already-known category/brand/model) - the full history is needed to
+        judge whether that's a real correction.
+        """
+        if not isinstance(delta, dict):
+            print(f"   ⚠️  Delta is not a JSON object: {delta!r}"[:200])
+            return False
+
+        unknown = set(delta) - EXTRACTION_FIELDS
+        if unknown:
+            print(f"   ⚠️  Delta has unknown fields: {sorted(unknown)}")
+            return False
+
+        for key in ('specifications', 'damage'):
+            if delta.get(key) is not None and not isinstance(delta[key], dict):
+                print(f"   ⚠️  Delta '{key}' is not an object: {delta[key]!r}"[:200])
+                return False
+
+        for key in IDENTITY_FIELDS:
+            old, new = product_info.get(key), delta.get(key)
+            if old and new and str(old).strip().lower() != str(new).strip().lower():
+                print(f"   ⚠️  Delta changes {key}: '{old}' → '{new}'")
+                return False
+
+        return True
+
     def generate_search_queries(self, product_info):
         """
         Generates effective search queries for finding prices online.
@@ -1232,7 +1465,8 @@ Make queries specific enough to find the exact item, but not so specific they re
 Include variations (with/without capacity, with/without color, etc.)
 """
 
-        response = self.client.messages.create(
+        response = self.llm.create_message(
+            'v2.search_queries',
             model=self.model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}]
@@ -1281,7 +1515,8 @@ Return a JSON object:
 }}
 """
 
-        response = self.client.messages.create(
+        response = self.llm.create_message(
+            'v2.assess_confidence',
             model=self.model,
             max_tokens=1024,
             messages=[{"role": "user", "content": prompt}]
@@ -11,11 +11,136 @@ All the flow control, duplicate prevention, and rules enforcement
 happens in GuardrailEngine. The AI just needs to be smart about products.
 """
 
-import anthropic
+import concurrent.futures
 import json
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from config import Config
+from utils.llm_gateway import get_llm_gateway
+from utils.model_router import LowConfidence, ModelRouter, is_simple_message
+from services.identification_index import IdentificationIndex
+from services.product_catalog import get_product_catalog
+from services.question_bank import QuestionBank
+
+
+# Static generate_question instructions - sent as the system prompt, so nothing
+# product- or field-specific belongs here (that goes in the user message).
+# Not marked for prompt caching: at ~900 tokens it is below the minimum
+# cacheable prefix (1024 tokens on Sonnet, 2048 on Haiku), so cache_control
+# would never produce a cache read.
+QUESTION_INSTRUCTIONS = """You write questions for sellers on EpicDeals, a South African second-hand marketplace.
+
+PERSONALITY:
+- Friendly South African tone
+- Use emojis sparingly (👍, 🚗, ✅)
+- Keep it conversational
+- Be encouraging ("No stress - we factor that in fairly")
+
+For CONDITION/DAMAGE questions, generate a checklist of common issues for THIS specific product type.
+
+IMPORTANT LANGUAGE RULES for condition options:
+- Use SOFT, descriptive language — never harsh words like "damaged", "broken", "destroyed"
+- Describe the SYMPTOM, not the verdict. Say "Screen has scratches" not "Screen damaged"
+- Separate cosmetic wear from functional problems. Cosmetic = scratches, scuffs, wear marks. Functional = doesn't work, broken, cracked.
+- Always include a "None - excellent condition ✅" option LAST
+
+IMPORTANT: For iPhones, always include "Battery health under 85%" as an option in the condition checklist.
+We need to know about battery health because under 85% means a battery replacement is needed before resale.
+
+Examples:
+- iPhone condition: ["Screen scratched", "Back glass cracked", "Camera lens scratched", "Battery health under 85%", "Water damage", "Body scratches or scuffs", "None - excellent condition ✅"]
+- Other phone condition: ["Screen scratched", "Back glass cracked", "Camera lens scratched", "Battery issues", "Water damage", "Body scratches or scuffs", "None - excellent condition ✅"]
+- Watch condition: ["Screen scratched", "Bezel/case has scratches or scuffs", "Strap worn or damaged", "Battery won't hold charge", "Buttons not working properly", "Water damage", "None - excellent condition ✅"]
+- Laptop condition: ["Screen scratched", "Keyboard keys missing or sticky", "Battery health under 85%", "Body scratches or dents", "Trackpad issues", "None - excellent condition ✅"]
+- Car condition: ["Body dents", "Engine warning light", "Tyres worn", "None ✔"]
+- Shoes condition: ["Sole worn", "Scuffs/stains", "Box missing", "None ✔"]
+
+For DAMAGE_SEVERITY questions (follow-up after user reported damage):
+- The user already told us WHAT damage exists (see "Already collected" in the request for their condition answer)
+- Now ask HOW BAD it is for EACH reported issue
+- Be specific to the damage they reported. Examples:
+  - If "Screen cracked/scratched": ask "How would you describe the screen damage?" with options like ["Hairline scratches only", "Deep scratches (can feel with fingernail)", "Cracked but display works", "Cracked and display has issues"]
+  - If "Back glass cracked": ["Small chip/crack", "Spider-web cracks", "Shattered"]
+  - If "Dents": ["Small barely visible dents", "Noticeable dents", "Large dents affecting function"]
+  - If "Sole worn": ["Light wear, plenty of life left", "Moderate wear, some tread left", "Heavy wear, needs resoling"]
+- Use ui_type "quick_select" (NOT checklist - they pick the ONE that best describes it)
+- If multiple damage items were reported, ask about the MOST significant one and include "Also describe: [other items]" as a text prompt
+- Keep it friendly: "Just so we can factor this in accurately..."
+
+For BATTERY_HEALTH questions (iPhones only):
+- Ask what their iPhone battery health percentage is (Settings > Battery > Battery Health)
+- Provide options: ["95-100%", "85-94%", "75-84%", "Under 75%", "Not sure"]
+- Use ui_type "quick_select"
+- Mention they can check in Settings > Battery > Battery Health
+
+For other questions, provide 3-6 tap-able options.
+
+Respond with ONLY this JSON:
+{
+  "question_text": "Your friendly question here",
+  "quick_options": ["Option 1", "Option 2", "Option 3"],
+  "ui_type": "quick_select"  // or "checklist" for condition questions
+}
+"""
+
+
+# Appended to the identify_product prompt in combined Phase 1 mode (with_opening=True)
+OPENING_INSTRUCTIONS = """
+ALSO WRITE THE OPENING OF THE CONVERSATION (saves separate calls):
+- Order "proposed_questions" with the condition/damage question FIRST
+- "acknowledgment": ONE short, friendly South African sentence acknowledging the item.
+  The user is SELLING, not buying. Never imply high demand or a high price
+  ("sells fast", "always in demand", "holds its value") - say something specific
+  about the product or just greet warmly.
+- "first_question": the question for the FIRST field in proposed_questions, written
+  following your question-writing instructions
+
+Add these keys to the JSON:
+  "acknowledgment": "Cool, a Sony WH-1000XM4! Let me grab some details 👍",
+  "first_question": {
+    "field": "condition",
+    "question_text": "Your friendly question here",
+    "quick_options": ["Option 1", "Option 2", "None - excellent condition ✅"],
+    "ui_type": "checklist"
+  }
+"""
+
+
+# Follow-ups whose question depends on the reported damage - never routed to the fast model
+SEVERITY_FIELDS = {'damage_severity'}
+
+
+def _partial_json_string(raw: str, key: str) -> str:
+    """
+    Decoded value of a JSON string field from a response that is still streaming
+
+    Returns what has arrived so far ('' until the field starts); a trailing
+    escape sequence that is cut off is held back until it completes.
+    """
+    match = re.search(rf'"{key}"\s*:\s*"', raw)
+    if not match:
+        return ''
+
+    body = raw[match.end():]
+    end = len(body)
+    i = 0
+    while i < len(body):
+        if body[i] == '"':
+            end = i
+            break
+        if body[i] == '\\':
+            step = 6 if body[i + 1:i + 2] == 'u' else 2
+            if i + step > len(body):
+                end = i
+                break
+            i += step
+        else:
+            i += 1
+
+    try:
+        return json.loads(f'"{body[:end]}"')
+    except ValueError:
+        return ''
 
 
 class AIServiceV3:
@@ -30,14 +155,35 @@ class AIServiceV3:
     """
 
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.llm = get_llm_gateway()  # Shared Claude client
         self.model_sonnet = "claude-sonnet-4-20250514"  # For conversations
         self.model_haiku = "claude-3-5-haiku-20241022"  # For fast parsing
-
-    def identify_product(self, user_message: str) -> Dict[str, Any]:
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=Config.PHASE1_FANOUT_WORKERS,
+            thread_name_prefix='phase1'
+        )
+        # Banked questions are keyed on the model that wrote them and invalidated when the instructions change
+        self.question_bank = QuestionBank(fingerprint=QUESTION_INSTRUCTIONS,
+                                          models=(self.model_sonnet, self.model_haiku))
+        self.catalog = get_product_catalog() if Config.PRODUCT_CATALOG_ENABLED else None
+        self.identifications = IdentificationIndex()
+        # Simple inputs go to Haiku first; parse failures / low confidence escalate to Sonnet
+        self.router = ModelRouter(fast_model=self.model_haiku, strong_model=self.model_sonnet)
+
+    def identify_product(self, user_message: str, with_opening: bool = False) -> Dict[str, Any]:
         """
         Phase 1: Identify what the user wants to sell.
 
+        with_opening=True is the combined Phase 1 call: the same Sonnet call
+        also writes the acknowledgment and the first question (for the first
+        proposed field), replacing two follow-up calls. Those keys are only
+        present when they came back well-formed.
+
+        Well-known products are resolved from the local catalog first (no
+        LLM call, source='catalog'); those results never carry the opening.
+        Next, near-duplicates of messages already identified by the LLM reuse
+        the stored result (source='similar').
+
         Returns: {
             'product_info': {
                 'name': str,
@@ -46,9 +192,20 @@ class AIServiceV3:
                 'category': str,
                 'specs': dict  # Any specs mentioned (storage, year, size, etc.)
             },
-            'proposed_questions': [field_name, field_name, ...]  # What to ask
+            'proposed_questions': [field_name, field_name, ...],  # What to ask
+            'acknowledgment': str,  # with_opening only
+            'first_question': {'field', 'question_text', 'quick_options', 'ui_type'}  # with_opening only
         }
         """
+        if self.catalog:
+            resolved = self.catalog.resolve(user_message)
+            if resolved:
+                return resolved
+
+        reused = self.identifications.lookup(user_message)
+        if reused:
+            return reused
+
         prompt = f"""You are a South African product pricing expert for EpicDeals.
 
 The user wants to sell: "{user_message}"
@@ -102,11 +259,19 @@ Respond with ONLY this JSON:
 Be smart about years: iPhone 16 = 2024, iPhone 15 = 2023, PS5 = 2020, etc.
 """
 
-        try:
-            response = self.client.messages.create(
-                model=self.model_sonnet,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}]
+        call_site = 'v3.identify_with_opening' if with_opening else 'v3.identify_product'
+        request = {'max_tokens': 1024}
+        if with_opening:
+            prompt += OPENING_INSTRUCTIONS
+            request['max_tokens'] = 1536
+            request['system'] = QUESTION_INSTRUCTIONS  # Same system prompt as generate_question
+
+        def identify(model):
+            response = self.llm.create_message(
+                call_site,
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                **request
             )
 
             # Extract JSON from response
@@ -116,6 +281,13 @@ Be smart about years: iPhone 16 = 2024, iPhone 15 = 2023, PS5 = 2020, etc.
                 response_text = json_match.group(0)
 
             result = json.loads(response_text)
+            if not isinstance(result.get('product_info'), dict) or not isinstance(result.get('proposed_questions'), list):
+                raise ValueError('identification is missing product_info/proposed_questions')
+            return result
+
+        try:
+            result = self.router.run(call_site, is_simple_message(user_message), identify,
+                                     check=self._check_identification)
 
             print(f"\n🤖 AI IDENTIFICATION:")
             print(f"   Product: {result['product_info'].get('brand', '')} {result['product_info'].get('model', '')}")
@@ -123,6 +295,10 @@ Be smart about years: iPhone 16 = 2024, iPhone 15 = 2023, PS5 = 2020, etc.
             print(f"   Specs extracted: {result['product_info'].get('specs', {})}")
             print(f"   Proposed questions: {result['proposed_questions']}")
 
+            if with_opening:
+                self._check_opening(result)
+
+            self.identifications.record(user_message, result)
             return result
 
         except Exception as e:
@@ -139,6 +315,37 @@ Be smart about years: iPhone 16 = 2024, iPhone 15 = 2023, PS5 = 2020, etc.
                 'proposed_questions': ['condition', 'age']
             }
 
+    @staticmethod
+    def _check_identification(result: Dict[str, Any]) -> None:
+        """Escalate fast-model identifications that are unsure or incomplete"""
+        product_info = result['product_info']
+        if result.get('needs_model_confirmation'):
+            raise LowConfidence('asked for model confirmation')
+        if not product_info.get('model') or str(product_info.get('brand', '')).lower() in ('', 'unknown'):
+            raise LowConfidence('no brand/model')
+        if not result['proposed_questions']:
+            raise LowConfidence('no proposed questions')
+
+    def _check_opening(self, result: Dict[str, Any]) -> None:
+        """Drop malformed acknowledgment/first_question so callers fall back to separate calls"""
+        acknowledgment = result.get('acknowledgment')
+        if not isinstance(acknowledgment, str) or not acknowledgment.strip():
+            result.pop('acknowledgment', None)
+        else:
+            result['acknowledgment'] = acknowledgment.strip().strip('"\'')
+
+        question = result.get('first_question')
+        if (not isinstance(question, dict) or not question.get('field')
+                or not isinstance(question.get('question_text'), str) or not question['question_text'].strip()):
+            result.pop('first_question', None)
+        else:
+            if not isinstance(question.get('quick_options'), list):
+                question['quick_options'] = []
+            question.setdefault('ui_type', 'quick_select' if question['quick_options'] else 'text')
+
+        print(f"   Opening included: acknowledgment={'acknowledgment' in result}, "
+              f"first_question={result.get('first_question', {}).get('field')}")
+
     def generate_question(self, field_name: str, product_info: Dict[str, Any],
                          collected_fields: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -150,75 +357,177 @@ Be smart about years: iPhone 16 = 2024, iPhone 15 = 2023, PS5 = 2020, etc.
             'ui_type': 'quick_select' | 'checklist' | 'text'
         }
         """
+        banked = self.question_bank.get(field_name, product_info, collected_fields)
+        if banked:
+            print(f"\n🏦 BANKED QUESTION: {field_name} ({banked['question_text'][:60]}...)")
+            return banked
+
+        prompt = self._question_prompt(field_name, product_info, collected_fields)
+        answered_by = []  # The router may escalate - bank under the model whose answer was kept
+
+        def generate(model):
+            answered_by.append(model)
+            response = self.llm.create_message(
+                'v3.generate_question',
+                model=model,
+                max_tokens=512,
+                system=QUESTION_INSTRUCTIONS,
+                messages=[{"role": "user", "content": prompt}]
+            )
+
+            response_text = response.content[0].text.strip()
+            json_match = re.search(r'\{[\s\S]*\}', response_text)
+            if json_match:
+                response_text = json_match.group(0)
+
+            result = json.loads(response_text)
+            if not isinstance(result.get('question_text'), str) or not result['question_text'].strip():
+                raise ValueError('question_text missing')
+            return result
+
+        try:
+            # damage_severity depends on the reported damage - always Sonnet
+            result = self.router.run('v3.generate_question', field_name not in SEVERITY_FIELDS, generate,
+                                     check=self._check_question)
+
+            print(f"\n💬 AI QUESTION:")
+            print(f"   Field: {field_name}")
+            print(f"   Text: {result['question_text'][:80]}...")
+            print(f"   Options: {len(result.get('quick_options', []))} provided")
+
+            self.question_bank.put(field_name, product_info, collected_fields, result, model=answered_by[-1])
+            return result
+
+        except Exception as e:
+            print(f"❌ Error generating question: {e}")
+            return self.fallback_question(field_name, product_info)
+
+    def stream_question(self, field_name: str, product_info: Dict[str, Any],
+                        collected_fields: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """
+        generate_question, streamed for the browser.
+
+        The model is routed like generate_question but never escalated - text
+        already sent can't be taken back. Banked questions come out as one token.
+
+        Yields:
+            ('token', str) pieces of question_text as they arrive, then
+            ('question', {'question_text', 'quick_options', 'ui_type'}) once
+
+        Raises:
+            ValueError if the streamed response isn't a usable question (callers
+            fall back to generate_question); API errors are re-raised
+        """
+        banked = self.question_bank.get(field_name, product_info, collected_fields)
+        if banked:
+            yield 'token', banked['question_text']
+            yield 'question', banked
+            return
+
+        model = self.router.choose('v3.generate_question', field_name not in SEVERITY_FIELDS)
+        raw = ''
+        sent = 0
+        for delta in self.llm.stream_message(
+            'v3.generate_question',
+            model=model,
+            max_tokens=512,
+            system=QUESTION_INSTRUCTIONS,
+            messages=[{"role": "user", "content": self._question_prompt(field_name, product_info, collected_fields)}]
+        ):
+            raw += delta
+            text = _partial_json_string(raw, 'question_text')
+            if len(text) > sent:
+                yield 'token', text[sent:]
+                sent = len(text)
+
+        json_match = re.search(r'\{[\s\S]*\}', raw)
+        result = json.loads(json_match.group(0) if json_match else raw)
+        if not isinstance(result.get('question_text'), str) or not result['question_text'].strip():
+            raise ValueError('question_text missing')
+        if not isinstance(result.get('quick_options'), list):
+            result['quick_options'] = []
+        result.setdefault('ui_type', 'quick_select' if result['quick_options'] else 'text')
+
+        print(f"\n💬 AI QUESTION (streamed): {field_name} - {result['question_text'][:80]}...")
+        self.question_bank.put(field_name, product_info, collected_fields, result, model=model)
+        yield 'question', result
+
+    @staticmethod
+    def _question_prompt(field_name: str, product_info: Dict[str, Any], collected_fields: Dict[str, Any]) -> str:
+        """Per-call generate_question prompt (the instructions are the cached system prompt)"""
         product_name = f"{product_info.get('brand', '')} {product_info.get('model', '')}".strip()
         category = product_info.get('category', 'item')
 
-        prompt = f"""You are asking the seller a question about their {product_name} ({category}).
+        return f"""You are asking the seller a question about their {product_name} ({category}).
 
 Field to ask about: {field_name}
 
 Product details: {json.dumps(product_info, indent=2)}
 Already collected: {json.dumps(collected_fields, indent=2)}
 
-Generate a friendly, natural question with quick-select options.
+Generate a friendly, natural question with quick-select options, following your instructions."""
 
-PERSONALITY:
-- Friendly South African tone
-- Use emojis sparingly (👍, 🚗, ✅)
-- Keep it conversational
-- Be encouraging ("No stress - we factor that in fairly")
+    @staticmethod
+    def _check_question(result: Dict[str, Any]) -> None:
+        """Escalate fast-model questions without usable options"""
+        options = result.get('quick_options')
+        if result.get('ui_type', 'quick_select') != 'text' and (not isinstance(options, list) or len(options) < 2):
+            raise LowConfidence('fewer than 2 quick options')
 
-For CONDITION/DAMAGE questions, generate a checklist of common issues for THIS specific product type.
+    def generate_question_plan(self, fields: List[str], product_info: Dict[str, Any],
+                               collected_fields: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate the questions for several fields in one call.
 
-IMPORTANT LANGUAGE RULES for condition options:
-- Use SOFT, descriptive language — never harsh words like "damaged", "broken", "destroyed"
-- Describe the SYMPTOM, not the verdict. Say "Screen has scratches" not "Screen damaged"
-- Separate cosmetic wear from functional problems. Cosmetic = scratches, scuffs, wear marks. Functional = doesn't work, broken, cracked.
-- Always include a "None - excellent condition ✅" option LAST
+        Fields already in the question bank are served from it; the rest
+        come from a single Sonnet call (same cached instructions as
+        generate_question) and are banked individually.
 
-IMPORTANT: For iPhones, always include "Battery health under 85%" as an option in the condition checklist.
-We need to know about battery health because under 85% means a battery replacement is needed before resale.
+        Returns:
+            {field_name: {'question_text', 'quick_options', 'ui_type'}} - fields
+            that failed are simply missing (callers generate them on demand)
+        """
+        plan = {}
+        missing = []
+        for field_name in fields:
+            banked = self.question_bank.get(field_name, product_info, collected_fields)
+            if banked:
+                plan[field_name] = banked
+            else:
+                missing.append(field_name)
+
+        if not missing:
+            return plan
 
-Examples:
-- iPhone condition: ["Screen scratched", "Back glass cracked", "Camera lens scratched", "Battery health under 85%", "Water damage", "Body scratches or scuffs", "None - excellent condition ✅"]
-- Other phone condition: ["Screen scratched", "Back glass cracked", "Camera lens scratched", "Battery issues", "Water damage", "Body scratches or scuffs", "None - excellent condition ✅"]
-- Watch condition: ["Screen scratched", "Bezel/case has scratches or scuffs", "Strap worn or damaged", "Battery won't hold charge", "Buttons not working properly", "Water damage", "None - excellent condition ✅"]
-- Laptop condition: ["Screen scratched", "Keyboard keys missing or sticky", "Battery health under 85%", "Body scratches or dents", "Trackpad issues", "None - excellent condition ✅"]
-- Car condition: ["Body dents", "Engine warning light", "Tyres worn", "None ✔"]
-- Shoes condition: ["Sole worn", "Scuffs/stains", "Box missing", "None ✔"]
+        product_name = f"{product_info.get('brand', '')} {product_info.get('model', '')}".strip()
+        category = product_info.get('category', 'item')
 
-For DAMAGE_SEVERITY questions (follow-up after user reported damage):
-- The user already told us WHAT damage exists (see "Already collected" above for their condition answer)
-- Now ask HOW BAD it is for EACH reported issue
-- Be specific to the damage they reported. Examples:
-  - If "Screen cracked/scratched": ask "How would you describe the screen damage?" with options like ["Hairline scratches only", "Deep scratches (can feel with fingernail)", "Cracked but display works", "Cracked and display has issues"]
-  - If "Back glass cracked": ["Small chip/crack", "Spider-web cracks", "Shattered"]
-  - If "Dents": ["Small barely visible dents", "Noticeable dents", "Large dents affecting function"]
-  - If "Sole worn": ["Light wear, plenty of life left", "Moderate wear, some tread left", "Heavy wear, needs resoling"]
-- Use ui_type "quick_select" (NOT checklist - they pick the ONE that best describes it)
-- If multiple damage items were reported, ask about the MOST significant one and include "Also describe: [other items]" as a text prompt
-- Keep it friendly: "Just so we can factor this in accurately..."
+        prompt = f"""You are asking the seller questions about their {product_name} ({category}).
 
-For BATTERY_HEALTH questions (iPhones only):
-- Ask what their iPhone battery health percentage is (Settings > Battery > Battery Health)
-- Provide options: ["95-100%", "85-94%", "75-84%", "Under 75%", "Not sure"]
-- Use ui_type "quick_select"
-- Mention they can check in Settings > Battery > Battery Health
+Fields to ask about, in order: {', '.join(missing)}
 
-For other questions, provide 3-6 tap-able options.
+Product details: {json.dumps(product_info, indent=2)}
+Already collected: {json.dumps(collected_fields, indent=2)}
 
-Respond with ONLY this JSON:
-{{
-  "question_text": "Your friendly question here",
-  "quick_options": ["Option 1", "Option 2", "Option 3"],
-  "ui_type": "quick_select"  // or "checklist" for condition questions
-}}
-"""
+Write ONE friendly question with quick-select options for EACH field, following your instructions.
+Each question is asked on its own turn, so don't refer to the other questions.
 
-        try:
-            response = self.client.messages.create(
-                model=self.model_sonnet,
-                max_tokens=512,
+Instead of the single-question JSON, respond with ONLY this JSON:
+{{
+  "questions": {{
+    "<field name>": {{"question_text": "...", "quick_options": ["..."], "ui_type": "quick_select"}}
+  }}
+}}"""
+
+        answered_by = []  # The router may escalate - bank under the model whose answer was kept
+
+        def generate(model):
+            answered_by.append(model)
+            response = self.llm.create_message(
+                'v3.question_plan',
+                model=model,
+                max_tokens=300 + 400 * len(missing),
+                system=QUESTION_INSTRUCTIONS,
                 messages=[{"role": "user", "content": prompt}]
             )
 
@@ -226,24 +535,83 @@ Respond with ONLY this JSON:
             json_match = re.search(r'\{[\s\S]*\}', response_text)
             if json_match:
                 response_text = json_match.group(0)
+            return json.loads(response_text).get('questions', {})
 
-            result = json.loads(response_text)
+        def check(questions):
+            absent = [f for f in missing if not isinstance(questions.get(f), dict)]
+            if absent:
+                raise LowConfidence(f"missing {absent}")
 
-            print(f"\n💬 AI QUESTION:")
-            print(f"   Field: {field_name}")
-            print(f"   Text: {result['question_text'][:80]}...")
-            print(f"   Options: {len(result.get('quick_options', []))} provided")
+        try:
+            simple = not any(f in SEVERITY_FIELDS for f in missing)
+            questions = self.router.run('v3.question_plan', simple, generate, check=check)
+        except Exception as e:
+            print(f"❌ Error generating question plan: {e}")
+            return plan
+
+        for field_name in missing:
+            question = questions.get(field_name)
+            if not isinstance(question, dict) or not isinstance(question.get('question_text'), str):
+                print(f"   ⚠️  Question plan missing '{field_name}' - will generate on demand")
+                continue
+            if not isinstance(question.get('quick_options'), list):
+                question['quick_options'] = []
+            question.setdefault('ui_type', 'quick_select' if question['quick_options'] else 'text')
+            plan[field_name] = question
+            self.question_bank.put(field_name, product_info, collected_fields, question, model=answered_by[-1])
+
+        print(f"\n📝 QUESTION PLAN: {list(plan.keys())} ({len(missing)} requested in one call)")
+        return plan
+
+    def fallback_question(self, field_name: str, product_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Basic text question used when generate_question fails or is too slow"""
+        product_name = f"{product_info.get('brand', '')} {product_info.get('model', '')}".strip()
+        return {
+            'question_text': f"Tell me about the {field_name} of your {product_name}",
+            'quick_options': [],
+            'ui_type': 'text'
+        }
 
-            return result
+    def generate_opening(self, product_info: Dict[str, Any], field_name: str,
+                         collected_fields: Dict[str, Any],
+                         acknowledgment: Optional[str] = None) -> tuple:
+        """
+        Phase 1: acknowledgment and first question, generated concurrently.
 
-        except Exception as e:
-            print(f"❌ Error generating question: {e}")
-            # Fallback: basic question
-            return {
-                'question_text': f"Tell me about the {field_name} of your {product_name}",
-                'quick_options': [],
-                'ui_type': 'text'
-            }
+        The two calls don't depend on each other, so time-to-first-question is
+        the slower of the two instead of their sum. Both share one deadline
+        (PHASE1_FANOUT_DEADLINE); whatever isn't back by then gets its static
+        fallback and is left to finish in the background.
+
+        Args:
+            acknowledgment: Already have one (e.g. from the combined call) - only generate the question
+
+        Returns:
+            (acknowledgment, question_data)
+        """
+        collected_fields = dict(collected_fields)  # Snapshot for the worker thread
+        futures = {
+            'question': self.executor.submit(self.generate_question, field_name, product_info, collected_fields)
+        }
+        if not acknowledgment:
+            futures['acknowledgment'] = self.executor.submit(self.generate_acknowledgment, product_info)
+
+        done, _ = concurrent.futures.wait(futures.values(), timeout=Config.PHASE1_FANOUT_DEADLINE)
+
+        results = {}
+        for name, future in futures.items():
+            if future not in done:
+                print(f"⏱️  Phase 1 {name} missed the {Config.PHASE1_FANOUT_DEADLINE}s deadline - using fallback")
+                future.cancel()
+                continue
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"❌ Phase 1 {name} failed: {e}")
+
+        acknowledgment = acknowledgment or results.get('acknowledgment') or self.fallback_acknowledgment(product_info)
+        question_data = results.get('question') or self.fallback_question(field_name, product_info)
+        return acknowledgment, question_data
 
     def extract_answer(self, user_answer: str, field_name: str,
                       context: Optional[Dict[str, Any]] = None) -> Any:
@@ -323,7 +691,8 @@ BAD — do NOT say these:
 Just the acknowledgment, no extra text:"""
 
         try:
-            response = self.client.messages.create(
+            response = self.llm.create_message(
+                'v3.acknowledgment',
                 model=self.model_haiku,  # Fast for this
                 max_tokens=100,
                 messages=[{"role": "user", "content": prompt}]
@@ -335,4 +704,9 @@ Just the acknowledgment, no extra text:"""
             return ack
 
         except:
-            return f"Great, a {product_name}!"
+            return self.fallback_acknowledgment(product_info)
+
+    def fallback_acknowledgment(self, product_info: Dict[str, Any]) -> str:
+        """Static acknowledgment used when generate_acknowledgment fails or is too slow"""
+        product_name = f"{product_info.get('brand', '')} {product_info.get('model', '')}".strip()
+        return f"Great, a {product_name}!"
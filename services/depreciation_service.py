@@ -268,72 +268,15 @@ class DepreciationService:
             Year as integer, or None if can't determine
         """
         import re
-
-        model_lower = model.lower() if model else ''
-        brand_lower = brand.lower() if brand else ''
+        from services.product_catalog import get_product_catalog
 
         # Look for explicit years in model name (e.g., "MacBook Pro 2020")
-        year_match = re.search(r'(20\d{2})', model)
+        year_match = re.search(r'(20\d{2})', model or '')
         if year_match:
             return int(year_match.group(1))
 
-        # iPhone model year mapping
-        iphone_years = {
-            'iphone 15': 2023,
-            'iphone 14': 2022,
-            'iphone 13': 2021,
-            'iphone 12': 2020,
-            'iphone 11': 2019,
-            'iphone xs': 2018,
-            'iphone xr': 2018,
-            'iphone x': 2017,
-            'iphone 8': 2017,
-            'iphone 7': 2016,
-            'iphone 6s': 2015,
-            'iphone 6': 2014,
-        }
-
-        for iphone_model, year in iphone_years.items():
-            if iphone_model in model_lower:
-                return year
-
-        # Samsung Galaxy model year mapping
-        galaxy_years = {
-            's24': 2024,
-            's23': 2023,
-            's22': 2022,
-            's21': 2021,
-            's20': 2020,
-            's10': 2019,
-            's9': 2018,
-            's8': 2017,
-        }
-
-        for galaxy_model, year in galaxy_years.items():
-            if galaxy_model in model_lower:
-                return year
-
-        # MacBook Pro/Air M-series
-        if 'm3' in model_lower:
-            return 2023
-        if 'm2' in model_lower:
-            return 2022
-        if 'm1' in model_lower:
-            return 2020
-
-        # PlayStation
-        if 'ps5' in model_lower or 'playstation 5' in model_lower:
-            return 2020
-        if 'ps4' in model_lower or 'playstation 4' in model_lower:
-            return 2013
-
-        # Xbox
-        if 'series x' in model_lower or 'series s' in model_lower:
-            return 2020
-        if 'xbox one' in model_lower:
-            return 2013
-
-        return None
+        # Known models (iPhone, Galaxy S, MacBook M-series, consoles...) - see data/product_catalog.json
+        return get_product_catalog().release_year(brand, model)
 
     def calculate_age_in_years(self, year_purchased_or_released: int) -> float:
         """
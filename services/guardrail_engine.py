@@ -13,6 +13,7 @@ This is the discipline layer. Intelligence lives in Claude, discipline lives her
 from typing import Dict, List, Set, Optional, Any
 from enum import Enum
 import json
+from utils.state_codec import encode_fields, is_encoded, LazyFields, StateCodecError
 
 
 class ConversationState(Enum):
@@ -100,7 +101,34 @@ class GuardrailEngine:
 
     DEFAULT_QUESTION_LIMIT = 4  # Fallback for unknown categories
 
+    # Binary state field ids (utils/state_codec) - part of the wire format:
+    # add new ids for new fields, never renumber or reuse one
+    STATE_FIELD_IDS = {
+        'product_identified': 1,
+        'product_info': 2,
+        'question_limit': 3,
+        'imei_device': 4,
+        'approved_questions': 5,
+        'collected_fields': 6,
+        'asked_fields': 7,
+        'question_count': 8,
+        'state': 9,
+        'ui_options': 10,
+        'conversation_turns': 11,
+    }
+
+    # Session sections written independently by the app (see dirty_sections)
+    CORE_FIELDS = (
+        'product_identified', 'product_info', 'question_limit', 'imei_device', 'approved_questions',
+        'collected_fields', 'asked_fields', 'question_count', 'state', 'ui_options',
+    )
+    TURNS_FIELDS = ('conversation_turns',)
+
     def __init__(self):
+        # State fields changed since load/last save (assignments are tracked by
+        # __setattr__; in-place mutations must call mark_dirty)
+        self.dirty_fields: Set[str] = set()
+
         # Product identification
         self.product_identified: bool = False
         self.product_info: Dict[str, Any] = {}
@@ -126,6 +154,7 @@ class GuardrailEngine:
             'role': 'user',
             'content': message
         })
+        self.mark_dirty('conversation_turns')
 
     def record_ai_message(self, message: str) -> None:
         """Record a message from the AI"""
@@ -133,6 +162,7 @@ class GuardrailEngine:
             'role': 'assistant',
             'content': message
         })
+        self.mark_dirty('conversation_turns')
 
     def _normalise_category(self, raw_category: str) -> str:
         """
@@ -217,6 +247,7 @@ class GuardrailEngine:
                 if value_str not in ('unknown', 'not specified', 'if mentioned', 'n/a'):
                     self.collected_fields[key] = value
                     # DO NOT add to asked_fields — these were auto-extracted, not user-asked
+        self.mark_dirty('collected_fields')
 
         self.product_info = product_info
         self.product_identified = True
@@ -353,6 +384,7 @@ class GuardrailEngine:
 
         # Valid! Record it
         self.asked_fields.add(question_field)
+        self.mark_dirty('asked_fields')
         self.question_count += 1
 
         # Store UI options for frontend
@@ -410,6 +442,7 @@ class GuardrailEngine:
 
         self.collected_fields[field_name] = value
         self.asked_fields.add(field_name)  # Mark as both asked AND answered
+        self.mark_dirty('collected_fields', 'asked_fields')
 
         # v3.1.9: If user reported actual damage, inject a severity follow-up
         if field_name in ('condition', 'damage', 'damage_details'):
@@ -453,6 +486,7 @@ class GuardrailEngine:
                 if field in self.MANDATORY_QUESTION_FIELDS:
                     insert_idx = i + 1
             self.approved_questions.insert(insert_idx, 'damage_severity')
+            self.mark_dirty('approved_questions')
             print(f"   🔍 Injected damage_severity follow-up (reported: {value_str[:60]})")
 
     def should_calculate_offer(self) -> bool:
@@ -509,17 +543,20 @@ class GuardrailEngine:
 
         return "\n".join(state)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_turns: bool = False) -> Dict[str, Any]:
         """Serialize to dict for Flask session storage (v3.1 Fix 5)
 
-        IMPORTANT: conversation_turns are deliberately EXCLUDED to keep the
+        IMPORTANT: conversation_turns are EXCLUDED by default to keep the
         session cookie under the ~4KB browser limit. Flask's default session
         uses signed cookies, and including growing conversation history caused
         the cookie to silently exceed the limit, losing all session state.
         The conversation_turns are NOT needed for core engine logic —
         get_state_for_prompt() works from collected_fields/asked_fields alone.
+
+        Args:
+            include_turns: Keep conversation_turns (safe with server-side sessions)
         """
-        return {
+        data = {
             'product_identified': self.product_identified,
             'product_info': self.product_info,
             'question_limit': self.question_limit,
@@ -530,8 +567,11 @@ class GuardrailEngine:
             'question_count': self.question_count,
             'state': self.state.value,
             'ui_options': self.ui_options,
-            # conversation_turns EXCLUDED — see docstring above
+            # conversation_turns EXCLUDED unless asked for — see docstring above
         }
+        if include_turns:
+            data['conversation_turns'] = self.conversation_turns
+        return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GuardrailEngine':
@@ -547,9 +587,125 @@ class GuardrailEngine:
         engine.question_count = data.get('question_count', 0)
         engine.state = ConversationState(data.get('state', 'identifying'))
         engine.ui_options = data.get('ui_options', [])
-        engine.conversation_turns = []  # Not stored in session (cookie size limit)
+        engine.conversation_turns = data.get('conversation_turns', [])  # Only stored with server-side sessions
+        engine.mark_clean()
+        return engine
+
+    def to_bytes(self, fields: Optional[List[str]] = None, compress: bool = True) -> bytes:
+        """
+        Serialize to the compact binary state format (several times smaller than to_dict JSON)
+
+        Args:
+            fields: State fields to include (default CORE_FIELDS - turns are saved separately)
+            compress: zlib the payload when that makes it smaller
+
+        Returns:
+            Versioned binary blob for the session
+        """
+        encoded = {}
+        for name in fields or self.CORE_FIELDS:
+            value = getattr(self, name)
+            if name == 'state':
+                value = value.value
+            encoded[self.STATE_FIELD_IDS[name]] = value
+        return encode_fields(encoded, compress=compress)
+
+    @classmethod
+    def from_bytes(cls, *blobs: bytes) -> 'GuardrailEngine':
+        """
+        Restore lazily from one or more to_bytes() blobs (e.g. core + turns)
+
+        Only each blob's field directory is parsed here; each field is decoded
+        the first time it's accessed (see __getattr__), so a request that only
+        checks product_identified never materializes ui_options or turns.
+        A field whose value turns out to be corrupt then falls back to its
+        constructor default (and is re-written on the next save).
+
+        Raises:
+            StateCodecError if a blob's header or field directory is corrupt or from a newer format
+        """
+        engine = cls.__new__(cls)
+        object.__setattr__(engine, '_lazy_state', [LazyFields(blob) for blob in blobs])
+        object.__setattr__(engine, 'dirty_fields', set())
         return engine
 
+    @classmethod
+    def from_session(cls, data: Any, turns: Optional[bytes] = None) -> 'GuardrailEngine':
+        """
+        Restore from either session format (binary blobs or legacy dict)
+
+        Args:
+            data: Core state - to_bytes() blob or to_dict() dict
+            turns: Optional to_bytes(TURNS_FIELDS) blob (binary format only)
+        """
+        if is_encoded(data):
+            return cls.from_bytes(data, *([turns] if is_encoded(turns) else []))
+
+        # Legacy dict - mark everything dirty so the next save migrates it
+        engine = cls.from_dict(data)
+        engine.mark_dirty(*cls.STATE_FIELD_IDS)
+        return engine
+
+    def __getattr__(self, name: str) -> Any:
+        """Materialize a lazily restored field on first access (only called for missing attributes)"""
+        lazy_state = self.__dict__.get('_lazy_state')
+        if lazy_state is None or name not in self.STATE_FIELD_IDS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        field_id = self.STATE_FIELD_IDS[name]
+        source = next((fields for fields in lazy_state if fields.has(field_id)), None)
+        value = None
+        if source is not None:
+            try:
+                value = source.get(field_id)
+                if name == 'asked_fields':
+                    value = set(value)
+                elif name == 'state':
+                    value = ConversationState(value)
+            except (StateCodecError, TypeError, ValueError) as e:
+                # Corrupt value - this happens mid-request, long after _load_engine's fallback
+                print(f"⚠️  Could not restore engine field '{name}' ({e}) - using default")
+                source = None
+                self.dirty_fields.add(name)  # Re-write the damaged section on the next save
+        if source is None:
+            # Field added after this blob was written (or unreadable) - use the constructor default
+            value = GuardrailEngine().__dict__[name]
+
+        object.__setattr__(self, name, value)  # Loading isn't a change - don't mark dirty
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Track assignments to state fields for dirty_sections()"""
+        if name in self.STATE_FIELD_IDS and 'dirty_fields' in self.__dict__:
+            self.dirty_fields.add(name)
+        object.__setattr__(self, name, value)
+
+    def mark_dirty(self, *fields: str) -> None:
+        """Record in-place changes to state fields (e.g. collected_fields.pop()) that __setattr__ can't see"""
+        self.dirty_fields.update(fields)
+
+    def mark_clean(self) -> None:
+        """Call after the state has been persisted"""
+        self.dirty_fields.clear()
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.dirty_fields)
+
+    def dirty_sections(self) -> Set[str]:
+        """
+        Which session sections need re-writing
+
+        Returns:
+            Subset of {'core', 'turns'} - empty if nothing changed since load/last save
+        """
+        sections = set()
+        if self.dirty_fields.intersection(self.CORE_FIELDS):
+            sections.add('core')
+        if self.dirty_fields.intersection(self.TURNS_FIELDS):
+            sections.add('turns')
+        return sections
+
     def get_progress_info(self) -> Dict[str, Any]:
         """Get progress information for frontend display"""
         total_questions = min(len(self.approved_questions), self.question_limit)
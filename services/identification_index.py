@@ -0,0 +1,229 @@
+"""
+Identification Index
+Reuses identify_product results for near-duplicate opening messages
+
+"iPhone 14 pro max 256gb space black" and "iphone14 pro max 256 black" are
+the same product; the second one shouldn't cost a Sonnet call. Every LLM
+identification is stored under its normalized message, and lookups find
+close matches with MinHash/LSH over character trigrams:
+
+    - Messages are normalized with the catalog tokenizer (case, spacing,
+      letter/digit boundaries), dropping filler words, colours and storage
+      units
+    - A 32-value MinHash signature is split into 8 bands of 4; messages
+      sharing any band bucket are candidates
+    - Candidates are verified with exact trigram Jaccard against
+      IDENTIFICATION_REUSE_THRESHOLD, and must contain the same words:
+      numbers and short words exactly, longer words up to one typo.
+      "iPhone 13 Pro" vs "iPhone 13 Pro Max", "EOS R" vs "EOS RP" or 128 vs
+      256GB are near-identical strings but different products
+
+Colours are the only thing two matched messages can disagree on, so colour
+specs are dropped before a result is stored and re-read from the new message
+on reuse. The combined Phase 1 opening (acknowledgment, first question) was
+written for the original message and is never stored - reused hits get
+their own.
+
+Everything lives in the shared SQLite cache (namespace 'identifications'),
+so the index survives restarts and is shared by all workers. Bucket updates
+are read-modify-write; a concurrent insert can drop a bucket entry, which
+only costs a future miss.
+"""
+
+import hashlib
+import random
+import threading
+import zlib
+from collections import Counter
+from config import Config
+from services.product_catalog import COLORS, FILLER_WORDS, _within_one_edit, extract_specs, tokenize
+from utils.ttl_cache import PersistentTTLCache
+
+
+NUM_HASHES = 32
+BANDS = 8
+ROWS_PER_BAND = NUM_HASHES // BANDS
+MAX_BUCKET_ENTRIES = 20  # Most recent messages kept per LSH bucket
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240917)  # Fixed seed - signatures must match across workers and restarts
+_HASH_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_HASHES)]
+
+# Dropped when normalizing ("256gb" and "256" are the same message)
+UNIT_WORDS = {'gb', 'tb'}
+
+# Words shorter than this must match exactly - "r"/"rp", "pro"/"max" are different models
+MIN_TYPO_LENGTH = 5
+
+# Spec keys that come from a colour word (never shared by a near-duplicate message)
+COLOR_SPECS = {'color', 'colour', 'colorway', 'colourway'}
+
+# identify_product keys that describe the product rather than the wording of the message
+STORED_KEYS = ('product_info', 'proposed_questions', 'needs_model_confirmation', 'model_options')
+
+
+def normalize_message(message):
+    """Canonical form of an opening message"""
+    return ' '.join(t for t in tokenize(message or '')
+                    if t not in FILLER_WORDS and t not in UNIT_WORDS and t not in COLORS)
+
+
+def shingles(text):
+    """Character trigrams of the normalized text"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def same_words(a, b):
+    """
+    True if two normalized messages name the same words
+
+    Every word needs a counterpart in the other message: numbers and short
+    words exactly, longer alphabetic words within one typo.
+    """
+    words_a, words_b = Counter(a.split()), Counter(b.split())  # "pro" counts twice in "macbook pro m1 pro"
+    for left, right in ((words_a - words_b, words_b - words_a), (words_b - words_a, words_a - words_b)):
+        for word in left.elements():
+            if not word.isalpha() or len(word) < MIN_TYPO_LENGTH:
+                return False
+            if not any(len(other) >= MIN_TYPO_LENGTH and _within_one_edit(word, other) for other in right):
+                return False
+    return True
+
+
+def minhash(shingle_set):
+    """MinHash signature (crc32 base hash - Python's hash() is randomized per process)"""
+    bases = [zlib.crc32(s.encode('utf-8')) for s in shingle_set]
+    return [min((a * x + b) % _PRIME for x in bases) for a, b in _HASH_PARAMS]
+
+
+class IdentificationIndex:
+    """
+    Persistent near-duplicate index of identify_product results
+
+    Usage:
+        index = IdentificationIndex()
+        result = index.lookup(user_message)  # None on miss
+        index.record(user_message, result)
+    """
+
+    def __init__(self):
+        self.enabled = Config.IDENTIFICATION_REUSE_ENABLED
+        self.threshold = Config.IDENTIFICATION_REUSE_THRESHOLD
+        self.ttl_seconds = Config.IDENTIFICATION_REUSE_TTL
+        self.store = PersistentTTLCache('identifications') if self.enabled else None
+        self.stats = {'hits': 0, 'exact_hits': 0, 'misses': 0, 'stores': 0}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _entry_key(text):
+        return 'entry:' + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _bucket_keys(signature):
+        keys = []
+        for band in range(BANDS):
+            rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+            digest = hashlib.sha1(','.join(map(str, rows)).encode('utf-8')).hexdigest()[:16]
+            keys.append(f"band:{band}:{digest}")
+        return keys
+
+    def lookup(self, user_message):
+        """
+        Find a stored identification for this or a near-identical message
+
+        Returns:
+            Stored identify_product result (with 'source' and 'match_similarity'), or None
+        """
+        if not self.enabled:
+            return None
+
+        text = normalize_message(user_message)
+        if not text:
+            return None
+
+        entry = self.store.get(self._entry_key(text))
+        similarity = 1.0 if entry else 0.0
+
+        if not entry:
+            query = shingles(text)
+            seen = set()
+            for bucket_key in self._bucket_keys(minhash(query)):
+                for entry_key in self.store.get(bucket_key) or []:
+                    if entry_key in seen:
+                        continue
+                    seen.add(entry_key)
+                    candidate = self.store.get(entry_key)
+                    if not candidate or not same_words(text, candidate['text']):
+                        continue
+                    score = jaccard(query, shingles(candidate['text']))
+                    if score >= self.threshold and score > similarity:
+                        entry, similarity = candidate, score
+
+        with self.lock:
+            if not entry:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            if similarity == 1.0:
+                self.stats['exact_hits'] += 1
+
+        print(f"\n♻️  REUSED IDENTIFICATION: '{user_message}' ~ '{entry['text']}' (similarity {similarity:.2f})")
+        result = entry['result']
+        color = extract_specs(user_message)[0].get('color')
+        if color:  # Colour is the one thing the matched message didn't share
+            product_info = result['product_info']
+            product_info['specs'] = {**(product_info.get('specs') or {}), 'color': color}
+        result['source'] = 'similar'
+        result['match_similarity'] = round(similarity, 2)
+        return result
+
+    def record(self, user_message, result):
+        """Store an LLM identification for future near-duplicate messages"""
+        if not self.enabled:
+            return
+
+        text = normalize_message(user_message)
+        if not text:
+            return
+
+        entry_key = self._entry_key(text)
+        entry = {'text': text, 'result': self._reusable(result)}
+        self.store.set(entry_key, entry, self.ttl_seconds)
+
+        for bucket_key in self._bucket_keys(minhash(shingles(text))):
+            bucket = [key for key in self.store.get(bucket_key) or [] if key != entry_key]
+            bucket.append(entry_key)
+            self.store.set(bucket_key, bucket[-MAX_BUCKET_ENTRIES:], self.ttl_seconds)
+
+        with self.lock:
+            self.stats['stores'] += 1
+
+    @staticmethod
+    def _reusable(result):
+        """Copy of result without the opening or colour specs (a near-duplicate may be a different colour)"""
+        result = {key: result[key] for key in STORED_KEYS if key in result}
+        product_info = result.get('product_info') or {}
+        specs = product_info.get('specs')
+        if not isinstance(specs, dict):
+            return result
+        specs = {
+            key: value for key, value in specs.items()
+            if key.lower() not in COLOR_SPECS and not any(t in COLORS for t in tokenize(str(value)))
+        }
+        return {**result, 'product_info': {**product_info, 'specs': specs}}
+
+    def get_stats(self):
+        """Hit/miss counters for this worker"""
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0,
+                'threshold': self.threshold,
+                'enabled': self.enabled
+            }
@@ -4,8 +4,11 @@ Uses Perplexity API to research real-time repair costs in South Africa
 """
 
 import os
-import requests
+import re
+from utils.http_client import http_post
 from config import Config
+from utils.ttl_cache import PersistentTTLCache
+from utils.single_flight import SingleFlight
 
 
 class IntelligentRepairCostService:
@@ -17,6 +20,9 @@ class IntelligentRepairCostService:
     def __init__(self):
         self.perplexity_api_key = os.getenv('PERPLEXITY_API_KEY')
         self.perplexity_url = "https://api.perplexity.ai/chat/completions"
+        self.repair_cache = PersistentTTLCache('repair_costs') if Config.REPAIR_CACHE_ENABLED else None
+        self.repair_cache_ttl = Config.REPAIR_CACHE_TTL
+        self.single_flight = SingleFlight('perplexity_repair')
 
     def research_all_damages(self, product_info, damage_details):
         """
@@ -55,15 +61,24 @@ class IntelligentRepairCostService:
         breakdown = {}
         total_cost = 0
 
-        for damage in damage_details:
-            # Skip "None - Everything works perfectly"
-            if 'none' in damage.lower() and ('works' in damage.lower() or 'perfect' in damage.lower()):
-                continue
+        # Skip "None - Everything works perfectly"
+        damages_to_research = [
+            damage for damage in damage_details
+            if not ('none' in damage.lower() and ('works' in damage.lower() or 'perfect' in damage.lower()))
+        ]
 
-            print(f"Researching: {damage}")
+        # Research all damages concurrently, then merge in the user's order
+        # so the breakdown text is stable between runs
+        research_results = self._research_damages_concurrently(product_info, damages_to_research)
+
+        for index, damage in enumerate(damages_to_research):
+            cost_info = research_results.get(index)
 
-            # Research this specific damage
-            cost_info = self._research_single_damage(product_info, damage)
+            if cost_info is None:
+                print(f"  ⏱️  No result for '{damage}' before deadline - using fallback estimate")
+                cost_info = self._fallback_estimate(
+                    damage, product_info.get('brand', ''), product_info.get('category', '')
+                )
 
             if cost_info['estimated_cost'] > 0:
                 breakdown[damage] = cost_info
@@ -83,6 +98,49 @@ class IntelligentRepairCostService:
             'confidence': self._calculate_confidence(breakdown)
         }
 
+    def _research_damages_concurrently(self, product_info, damages):
+        """
+        Fan out _research_single_damage over a bounded thread pool
+
+        Args:
+            product_info: Product details
+            damages: List of damage descriptions to research
+
+        Returns:
+            Dict of {index in damages: cost_info} for lookups that finished
+            before the overall deadline (missing indexes timed out or failed)
+        """
+        import concurrent.futures
+
+        if not damages:
+            return {}
+
+        results = {}
+        max_workers = max(1, min(Config.REPAIR_RESEARCH_MAX_WORKERS, len(damages)))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+        future_to_index = {}
+        for index, damage in enumerate(damages):
+            print(f"Researching: {damage}")
+            future = executor.submit(self._research_single_damage, product_info, damage)
+            future_to_index[future] = index
+
+        try:
+            for future in concurrent.futures.as_completed(future_to_index, timeout=Config.REPAIR_RESEARCH_DEADLINE):
+                index = future_to_index[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Error researching '{damages[index]}': {e}")
+        except concurrent.futures.TimeoutError:
+            print(f"Repair research deadline ({Config.REPAIR_RESEARCH_DEADLINE:.0f}s) hit - "
+                  f"{len(damages) - len(results)} damage(s) will use fallback estimates")
+        finally:
+            # Don't block the offer on stragglers - let them finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
     def _no_damage(self, damage_details):
         """Check if no actual damage reported"""
         if not damage_details:
@@ -119,6 +177,14 @@ class IntelligentRepairCostService:
         model = product_info.get('model', '')
         category = product_info.get('category', '')
 
+        # Same repair on the same model family costs the same for every seller
+        cache_key = self._repair_cache_key(brand, model, damage_type)
+        cached = self.repair_cache.get(cache_key) if self.repair_cache else None
+        if cached:
+            print(f"  ⚡ Repair cost cache HIT: {cache_key}")
+            cached['details'] = cached['details'].replace('{damage}', damage_type.lower())
+            return cached
+
         # Build search query for South African repair costs
         query = self._build_repair_query(brand, model, category, damage_type)
 
@@ -129,6 +195,12 @@ class IntelligentRepairCostService:
             # Extract repair cost from Perplexity response
             cost_info = self._extract_repair_cost(result, damage_type, brand, category)
 
+            # Only cache real research - fallbacks should be retried next time
+            if self.repair_cache and cost_info.get('research_used'):
+                cached_info = dict(cost_info)
+                cached_info['details'] = cost_info['details'].replace(damage_type.lower(), '{damage}')
+                self.repair_cache.set(cache_key, cached_info, self.repair_cache_ttl)
+
             return cost_info
 
         except Exception as e:
@@ -136,6 +208,26 @@ class IntelligentRepairCostService:
             # Fallback to reasonable estimate
             return self._fallback_estimate(damage_type, brand, category)
 
+    def _repair_cache_key(self, brand, model, damage_type):
+        """
+        Build cache key from (brand, model family, simplified damage)
+
+        "Apple" + "iPhone 12 128GB" + "Screen cracked or scratched"
+        → "apple|iphone 12|screen replacement"
+        """
+        brand_key = str(brand or '').lower().strip()
+
+        model_family = str(model or '').lower()
+        model_family = re.sub(r'\(.*?\)', ' ', model_family)  # "(2020)", "(Unlocked)"
+        model_family = re.sub(r'\b\d+\s*(gb|tb)\b', ' ', model_family)  # Storage doesn't change repair cost
+        if brand_key and model_family.strip().startswith(brand_key + ' '):
+            model_family = model_family.strip()[len(brand_key):]
+        model_family = ' '.join(model_family.split())
+
+        damage_key = self._simplify_damage_type(damage_type).lower().strip()
+
+        return f"{brand_key}|{model_family}|{damage_key}"
+
     def _build_repair_query(self, brand, model, category, damage_type):
         """
         Build an effective search query for repair costs
@@ -204,12 +296,22 @@ class IntelligentRepairCostService:
         """
         Query Perplexity API for repair cost information
 
+        Identical concurrent queries (e.g. two sellers with the same cracked
+        model) share one upstream call.
+
         Args:
             query: Search query string
 
         Returns:
             API response with repair cost information
         """
+        return self.single_flight.do(
+            SingleFlight.normalize_key(query),
+            lambda: self._post_repair_query(query)
+        )
+
+    def _post_repair_query(self, query):
+        """Send one repair cost query to Perplexity (raises on API errors)"""
 
         headers = {
             "Authorization": f"Bearer {self.perplexity_api_key}",
@@ -245,7 +347,7 @@ Details: [brief explanation]"
             "max_tokens": 500
         }
 
-        response = requests.post(
+        response = http_post(
             self.perplexity_url,
             json=payload,
             headers=headers,
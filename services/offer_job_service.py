@@ -0,0 +1,134 @@
+"""
+Offer Job Service
+Runs offer calculation in the background so the request returns immediately
+
+POST /api/calculate-offer (async mode) creates a job and returns its id. The
+frontend then polls /api/offer-jobs/<id> (or subscribes to its SSE stream when
+OFFER_JOB_STREAMING is on) and sees each stage as it happens: price research, repair research, BER check,
+final offer. Job state lives in the shared SQLite cache, so any worker can
+answer the poll - not just the one running the job.
+"""
+
+import concurrent.futures
+import secrets
+import threading
+import time
+import traceback
+from config import Config
+from utils.ttl_cache import PersistentTTLCache
+
+
+class OfferJobService:
+    """
+    Background offer calculation with stage-by-stage progress
+
+    Job lifecycle: queued -> running -> done | failed
+    """
+
+    STAGES = ['price_research', 'repair_research', 'ber_check', 'final_offer']
+
+    def __init__(self, offer_service):
+        self.offer_service = offer_service
+        self.job_ttl = Config.OFFER_JOB_TTL
+        self.store = PersistentTTLCache('offer_jobs')
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=Config.OFFER_JOB_MAX_WORKERS,
+            thread_name_prefix='offer-job'
+        )
+        self.local_jobs = {}  # Jobs started by this worker (works even if the store is disabled)
+        self.lock = threading.Lock()
+
+    def submit(self, product_info, damage_info=None, session_id=None):
+        """
+        Queue an offer calculation
+
+        Returns:
+            The new job's state dict (includes job_id)
+        """
+        job_id = secrets.token_urlsafe(12)
+        now = time.time()
+        job = {
+            'job_id': job_id,
+            'session_id': session_id,
+            'status': 'queued',
+            'stage': None,
+            'completed_stages': [],
+            'offer': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        self._save(job)
+
+        self.executor.submit(self._run, job_id, dict(product_info), damage_info, session_id)
+        print(f"📨 Offer job {job_id} queued")
+        return job
+
+    def get(self, job_id):
+        """
+        Get the current state of a job
+
+        Returns:
+            Job state dict, or None if unknown/expired
+        """
+        with self.lock:
+            job = self.local_jobs.get(job_id)
+            if job:
+                return dict(job)
+        return self.store.get(job_id)
+
+    def _run(self, job_id, product_info, damage_info, session_id):
+        """Worker thread: calculate the offer, recording each stage as it starts"""
+        self._update(job_id, status='running')
+        start = time.time()
+
+        try:
+            offer_data = self.offer_service.calculate_offer(
+                product_info,
+                damage_info,
+                session_id=session_id,
+                progress_callback=lambda stage: self._advance(job_id, stage=stage)
+            )
+            offer_data['product_info'] = product_info
+
+            self._advance(job_id, status='done', offer=offer_data)
+            print(f"✅ Offer job {job_id} done in {time.time() - start:.1f}s")
+
+        except Exception as e:
+            print(f"❌ Offer job {job_id} failed: {e}")
+            traceback.print_exc()
+            self._update(
+                job_id,
+                status='failed',
+                error='An error occurred while calculating your offer. Please try again.'
+            )
+
+    def _advance(self, job_id, **changes):
+        """Mark the current stage complete, then apply changes"""
+        job = self.get(job_id) or {}
+        completed = list(job.get('completed_stages', []))
+        if job.get('stage') and job['stage'] not in completed:
+            completed.append(job['stage'])
+        self._update(job_id, completed_stages=completed, **changes)
+
+    def _update(self, job_id, **changes):
+        """Apply changes to a job and persist it"""
+        job = self.get(job_id)
+        if not job:
+            return
+        job.update(changes)
+        job['updated_at'] = time.time()
+        self._save(job)
+
+    def _save(self, job):
+        """Write job state locally and to the shared store"""
+        with self.lock:
+            self.local_jobs[job['job_id']] = dict(job)
+            self._purge_local_jobs()
+        self.store.set(job['job_id'], job, self.job_ttl)
+
+    def _purge_local_jobs(self):
+        """Forget expired local jobs (caller holds the lock)"""
+        cutoff = time.time() - self.job_ttl
+        for job_id in [j for j, job in self.local_jobs.items() if job['updated_at'] < cutoff]:
+            self.local_jobs.pop(job_id)
@@ -4,6 +4,7 @@ from services.repair_cost_service import RepairCostService
 from services.condition_assessment_service import ConditionAssessmentService
 from services.intelligent_repair_cost_service import IntelligentRepairCostService
 from services.research_queue_service import ResearchQueueService
+from services.prefetch_service import OfferPrefetchService
 from utils.courier_checker import is_courier_eligible, get_courier_rejection_message, get_business_model_options
 
 
@@ -25,14 +26,17 @@ class OfferService:
         self.sell_now_percentage = Config.SELL_NOW_PERCENTAGE
         self.consignment_percentage = Config.CONSIGNMENT_PERCENTAGE
         self.repair_confidence_threshold = 0.65  # Minimum confidence for repair costs
+        self.prefetch = OfferPrefetchService(self)  # Speculative research during the conversation
 
-    def calculate_offer(self, product_info, damage_info=None):
+    def calculate_offer(self, product_info, damage_info=None, session_id=None, progress_callback=None):
         """
         Calculate offer for a product
 
         Args:
             product_info: Dict with product details
             damage_info: Dict with damage details (optional)
+            session_id: Conversation id - reuses research prefetched for it (optional)
+            progress_callback: Called with each stage name as it starts (optional)
 
         Returns:
             Dict with:
@@ -52,52 +56,8 @@ class OfferService:
         # Skip it here to save an API call and avoid timeout on Vercel.
         print("Skipping courier check (already done in conversation phase)...")
 
-        # Step 1: Research market prices
-        print("Researching market prices...")
-        try:
-            price_research = self.price_research_service.research_prices(product_info)
-        except Exception as e:
-            print(f"❌ Price research failed: {e}")
-            import traceback
-            traceback.print_exc()
-            price_research = {
-                'prices_found': [],
-                'market_value': None,
-                'confidence': 0,
-                'sources_checked': [],
-                'price_breakdown': {},
-                'needs_user_estimate': True
-            }
-
-        # If no prices found, ask user for estimate
-        if price_research.get('needs_user_estimate'):
-            return {
-                'offer_amount': None,
-                'market_value': None,
-                'repair_costs': 0,
-                'calculation_breakdown': {},
-                'confidence': 0,
-                'recommendation': 'user_estimate',
-                'reason': 'No market prices found - requesting user estimate',
-                'price_research': price_research
-            }
-
-        market_value = price_research.get('market_value')
-
-        # If no market value but not flagged for user estimate, return email review
-        if not market_value:
-            return {
-                'offer_amount': None,
-                'market_value': None,
-                'repair_costs': 0,
-                'calculation_breakdown': {},
-                'confidence': 0,
-                'recommendation': 'email_review',
-                'reason': 'No market prices found',
-                'price_research': price_research
-            }
-
-        # Step 2: Classify damage severity FIRST (before researching repair costs)
+        # Step 1: Classify damage severity and split cosmetic vs repairable
+        # (local rules only - no API calls, so do it before kicking off research)
         condition = product_info.get('condition', 'good')
         damage_details = product_info.get('damage_details', [])
         category = product_info.get('category', 'other')
@@ -110,49 +70,66 @@ class OfferService:
         print(f"Damage classification: {damage_classification}")
 
         # Separate cosmetic-only issues from repairable damage
-        # Cosmetic issues (scratches, scuffs, minor dents) don't need repair —
-        # we sell as-is with a small condition discount. Only research repair
-        # costs for things that actually need fixing.
-        repairable_damages = []
-        cosmetic_damages = []
-
-        for damage in damage_details:
-            damage_lower = damage.lower() if isinstance(damage, str) else ''
-            # Skip "none" / "perfect" markers
-            if any(p in damage_lower for p in ['none', 'no issues', 'perfect', 'everything works']):
-                continue
-            # Cosmetic-only: scratches, scuffs, minor dents, wear
-            if any(c in damage_lower for c in [
-                'scratch', 'scuff', 'minor dent', 'light wear', 'cosmetic',
-                'small dent', 'body scratches', 'minor wear', 'hairline'
-            ]) and not any(s in damage_lower for s in [
-                'crack', 'broken', 'not working', 'dead', 'water',
-                'shatter', 'chip', 'fungus', 'leak'
-            ]):
-                cosmetic_damages.append(damage)
-            else:
-                repairable_damages.append(damage)
+        repairable_damages, cosmetic_damages = self.split_damages(damage_details)
 
         print(f"   Cosmetic only (no repair needed): {cosmetic_damages}")
         print(f"   Repairable (research costs): {repairable_damages}")
 
-        # Step 3: Research repair costs ONLY for repairable damage
-        print("Researching intelligent repair costs...")
+        # Step 2: Research market prices AND repair costs in parallel
+        # The two are independent until the BER check, so run them side by
+        # side - on damaged items this roughly halves wall-clock time.
+        import concurrent.futures
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
         try:
-            repair_research = self.intelligent_repair_service.research_all_damages(
+            print("Researching market prices and repair costs in parallel...")
+            self._report_progress(progress_callback, 'price_research')
+            price_future = executor.submit(self._prefetched_or_research_prices, session_id, product_info)
+            repair_future = executor.submit(
+                self._prefetched_or_research_repairs,
+                session_id,
                 product_info,
                 repairable_damages  # Only non-cosmetic damage!
             )
-        except Exception as e:
-            print(f"❌ Repair research failed: {e}")
-            import traceback
-            traceback.print_exc()
-            repair_research = {
-                'breakdown': {},
-                'total_repair_cost': 0,
-                'explanation': '',
-                'confidence': 0.5
-            }
+
+            price_research = price_future.result()
+
+            # If no prices found, ask user for estimate
+            if price_research.get('needs_user_estimate'):
+                return {
+                    'offer_amount': None,
+                    'market_value': None,
+                    'repair_costs': 0,
+                    'calculation_breakdown': {},
+                    'confidence': 0,
+                    'recommendation': 'user_estimate',
+                    'reason': 'No market prices found - requesting user estimate',
+                    'price_research': price_research
+                }
+
+            market_value = price_research.get('market_value')
+
+            # If no market value but not flagged for user estimate, return email review
+            if not market_value:
+                return {
+                    'offer_amount': None,
+                    'market_value': None,
+                    'repair_costs': 0,
+                    'calculation_breakdown': {},
+                    'confidence': 0,
+                    'recommendation': 'email_review',
+                    'reason': 'No market prices found',
+                    'price_research': price_research
+                }
+
+            # Join: repair research has been running alongside price research
+            self._report_progress(progress_callback, 'repair_research')
+            repair_research = repair_future.result()
+        finally:
+            # Early returns above don't wait for repair research to finish
+            executor.shutdown(wait=False)
+            if session_id:
+                self.prefetch.cancel(session_id)  # Anything left over is stale now
 
         repair_costs = repair_research.get('total_repair_cost', 0)
         repair_explanation = repair_research.get('explanation', '')
@@ -206,6 +183,7 @@ class OfferService:
 
         # Step 4: Check if Beyond Economic Repair
         print("Checking if beyond economic repair...")
+        self._report_progress(progress_callback, 'ber_check')
         ber_check = self.condition_service.is_beyond_economic_repair(
             product_info,
             repair_costs,
@@ -277,6 +255,7 @@ class OfferService:
         # Use the new method that doesn't double-penalize
         # total_deductions = repair costs (for actual breakage) + cosmetic discount
         print("Calculating value with repairs (new method)...")
+        self._report_progress(progress_callback, 'final_offer')
         adjusted_value = self.condition_service.calculate_value_with_repairs(
             market_value,
             total_deductions,
@@ -428,6 +407,100 @@ class OfferService:
             'model_options': model_options  # Which models are available
         }
 
+    def split_damages(self, damage_details):
+        """
+        Separate cosmetic-only issues from repairable damage
+
+        Cosmetic issues (scratches, scuffs, minor dents) don't need repair —
+        we sell as-is with a small condition discount. Only research repair
+        costs for things that actually need fixing.
+
+        Returns:
+            Tuple of (repairable_damages, cosmetic_damages)
+        """
+        repairable_damages = []
+        cosmetic_damages = []
+
+        if isinstance(damage_details, str):
+            damage_details = [damage_details]
+
+        for damage in damage_details or []:
+            damage_lower = damage.lower() if isinstance(damage, str) else ''
+            # Skip "none" / "perfect" markers
+            if any(p in damage_lower for p in ['none', 'no issues', 'perfect', 'everything works']):
+                continue
+            # Cosmetic-only: scratches, scuffs, minor dents, wear
+            if any(c in damage_lower for c in [
+                'scratch', 'scuff', 'minor dent', 'light wear', 'cosmetic',
+                'small dent', 'body scratches', 'minor wear', 'hairline'
+            ]) and not any(s in damage_lower for s in [
+                'crack', 'broken', 'not working', 'dead', 'water',
+                'shatter', 'chip', 'fungus', 'leak'
+            ]):
+                cosmetic_damages.append(damage)
+            else:
+                repairable_damages.append(damage)
+
+        return repairable_damages, cosmetic_damages
+
+    def _report_progress(self, progress_callback, stage):
+        """Tell the caller (e.g. a background offer job) which stage is starting"""
+        if not progress_callback:
+            return
+        try:
+            progress_callback(stage)
+        except Exception as e:
+            print(f"⚠️  Progress callback failed at {stage}: {e}")
+
+    def _prefetched_or_research_prices(self, session_id, product_info):
+        """Use the prefetched price research for this session if it matches, else research now"""
+        price_research = self.prefetch.take_prices(session_id, product_info)
+        if price_research is not None:
+            return price_research
+        return self._research_market_prices(product_info)
+
+    def _prefetched_or_research_repairs(self, session_id, product_info, repairable_damages):
+        """Use the prefetched repair research for this session if it matches, else research now"""
+        repair_research = self.prefetch.take_repairs(session_id, product_info, repairable_damages)
+        if repair_research is not None:
+            return repair_research
+        return self._research_repair_costs(product_info, repairable_damages)
+
+    def _research_market_prices(self, product_info):
+        """Run price research, falling back to a 'needs user estimate' result on error"""
+        try:
+            return self.price_research_service.research_prices(product_info)
+        except Exception as e:
+            print(f"❌ Price research failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return {
+                'prices_found': [],
+                'market_value': None,
+                'confidence': 0,
+                'sources_checked': [],
+                'price_breakdown': {},
+                'needs_user_estimate': True
+            }
+
+    def _research_repair_costs(self, product_info, repairable_damages):
+        """Run intelligent repair research, falling back to a low-confidence empty result on error"""
+        try:
+            return self.intelligent_repair_service.research_all_damages(
+                product_info,
+                repairable_damages
+            )
+        except Exception as e:
+            print(f"❌ Repair research failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return {
+                'breakdown': {},
+                'total_repair_cost': 0,
+                'explanation': '',
+                'confidence': 0.5
+            }
+
     def _calculate_overall_confidence(self, price_confidence, repair_confidence, listing_count):
         """
         Calculate overall confidence score
@@ -1,8 +1,14 @@
 import os
-import requests
+from utils.http_client import http_post
 import re
 from typing import List, Dict, Optional
 from services.depreciation_service import DepreciationService
+from utils.single_flight import SingleFlight
+
+
+SECONDHAND_SYSTEM_PROMPT = "You are a South African SECOND-HAND market price expert. Search for current USED/SECOND-HAND prices ONLY and return ONLY a JSON object with this exact format: {\"prices\": [price1, price2, ...], \"sources\": [\"source1\", \"source2\", ...]}. Prices must be in ZAR (South African Rand). CRITICAL: Only include SECOND-HAND/USED prices from classifieds and resale sites like gumtree.co.za, facebook marketplace, carbonite.co.za, bobshop.co.za. Do NOT include new retail prices from takealot.com, incredible.co.za, makro.co.za or any other new-product retailer. We need what people are actually selling used items for, not what they cost new."
+
+NEW_SYSTEM_PROMPT = "You are a South African retail price expert. Search for current NEW retail prices and return ONLY a JSON object: {\"prices\": [price1, price2, ...], \"sources\": [\"source1\", \"source2\", ...]}. Prices must be in ZAR."
 
 
 class PerplexityPriceService:
@@ -15,6 +21,7 @@ class PerplexityPriceService:
         self.api_key = os.getenv('PERPLEXITY_API_KEY')
         self.base_url = "https://api.perplexity.ai/chat/completions"
         self.depreciation_service = DepreciationService()
+        self.single_flight = SingleFlight('perplexity_price')
 
     def search_prices(self, product_info: Dict) -> Dict:
         """
@@ -41,35 +48,10 @@ class PerplexityPriceService:
         print(f"  Using Perplexity AI to search: {query}")
 
         try:
-            # Call Perplexity API
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar-pro",  # Deep retrieval with follow-ups
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a South African SECOND-HAND market price expert. Search for current USED/SECOND-HAND prices ONLY and return ONLY a JSON object with this exact format: {\"prices\": [price1, price2, ...], \"sources\": [\"source1\", \"source2\", ...]}. Prices must be in ZAR (South African Rand). CRITICAL: Only include SECOND-HAND/USED prices from classifieds and resale sites like gumtree.co.za, facebook marketplace, carbonite.co.za, bobshop.co.za. Do NOT include new retail prices from takealot.com, incredible.co.za, makro.co.za or any other new-product retailer. We need what people are actually selling used items for, not what they cost new."
-                        },
-                        {
-                            "role": "user",
-                            "content": query
-                        }
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1000
-                },
-                timeout=15
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
+            # Call Perplexity API (shared with identical in-flight searches)
+            content = self._ask_perplexity('used', SECONDHAND_SYSTEM_PROMPT, query)
 
+            if content is not None:
                 # Parse the response
                 prices, sources = self._parse_perplexity_response(content)
 
@@ -105,6 +87,49 @@ class PerplexityPriceService:
             'is_new_price_estimate': False
         }
 
+    def _ask_perplexity(self, kind, system_prompt, query):
+        """
+        Ask sonar-pro a price question; identical concurrent queries share one call
+
+        Args:
+            kind: 'used' or 'new' - part of the coalescing key
+            system_prompt: Instructions for the search
+            query: The price question
+
+        Returns:
+            The answer text, or None if the API didn't return 200
+        """
+        def post():
+            response = http_post(
+                self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": "sonar-pro",  # Deep retrieval with follow-ups
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": system_prompt
+                        },
+                        {
+                            "role": "user",
+                            "content": query
+                        }
+                    ],
+                    "temperature": 0.2,
+                    "max_tokens": 1000
+                },
+                timeout=15
+            )
+            if response.status_code != 200:
+                print(f"  Perplexity API error: {response.status_code}")
+                return None
+            return response.json()['choices'][0]['message']['content']
+
+        return self.single_flight.do(SingleFlight.normalize_key(kind, query), post)
+
     def _search_new_prices_fallback(self, product_info: Dict) -> Dict:
         """
         Fallback: Search for new product prices and estimate second-hand value
@@ -133,33 +158,9 @@ class PerplexityPriceService:
         print(f"  Searching NEW prices as fallback: {query}")
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "sonar-pro",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a South African retail price expert. Search for current NEW retail prices and return ONLY a JSON object: {\"prices\": [price1, price2, ...], \"sources\": [\"source1\", \"source2\", ...]}. Prices must be in ZAR."
-                        },
-                        {
-                            "role": "user",
-                            "content": query
-                        }
-                    ],
-                    "temperature": 0.2,
-                    "max_tokens": 1000
-                },
-                timeout=15
-            )
+            content = self._ask_perplexity('new', NEW_SYSTEM_PROMPT, query)
 
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
+            if content is not None:
                 new_prices, sources = self._parse_perplexity_response(content)
 
                 if new_prices:
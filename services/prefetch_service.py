@@ -0,0 +1,166 @@
+"""
+Offer Prefetch Service
+Starts offer research speculatively while the user is still answering questions
+
+Once the product is identified we already know enough to research market
+prices, and once a damage answer is recorded we can research repair costs.
+The user then spends 30-60 seconds on the remaining guardrail questions -
+by the time /api/calculate-offer runs, the research is usually done.
+"""
+
+import concurrent.futures
+import threading
+import time
+from config import Config
+
+
+class OfferPrefetchService:
+    """
+    Per-worker background research jobs, tracked per session
+
+    - One price job and one repair job per session (a new key replaces the old job)
+    - Global cap on concurrently running prefetches per worker
+    - cancel() drops a session's jobs (go back / reset); pending jobs never start,
+      running ones finish in the background and their result is discarded
+    """
+
+    def __init__(self, offer_service, max_concurrent=None):
+        self.offer_service = offer_service
+        self.max_concurrent = max_concurrent or Config.PREFETCH_MAX_CONCURRENT
+        self.job_ttl = Config.PREFETCH_JOB_TTL
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent,
+            thread_name_prefix='offer-prefetch'
+        )
+        self.jobs = {}  # session_id -> {stage: {'key', 'future', 'started_at'}}
+        self.lock = threading.Lock()
+
+    def prefetch_prices(self, session_id, product_info):
+        """Start market price research for this session's product"""
+        price_key = self.offer_service.price_research_service._product_fingerprint(product_info)
+        return self._start(
+            session_id,
+            'price',
+            price_key,
+            self.offer_service._research_market_prices,
+            dict(product_info)
+        )
+
+    def prefetch_repairs(self, session_id, product_info, damage_details):
+        """Start repair cost research for the repairable damages reported so far"""
+        repairable_damages, _ = self.offer_service.split_damages(damage_details)
+        if not repairable_damages:
+            return False
+
+        repair_key = self._repair_key(product_info, repairable_damages)
+        return self._start(
+            session_id,
+            'repair',
+            repair_key,
+            self.offer_service._research_repair_costs,
+            dict(product_info),
+            list(repairable_damages)
+        )
+
+    def take_prices(self, session_id, product_info):
+        """
+        Claim the prefetched price research if it matches this product
+
+        Returns:
+            Price research dict, or None if nothing usable was prefetched
+        """
+        price_key = self.offer_service.price_research_service._product_fingerprint(product_info)
+        return self._take(session_id, 'price', price_key)
+
+    def take_repairs(self, session_id, product_info, repairable_damages):
+        """Claim the prefetched repair research if it covers exactly these damages"""
+        if not repairable_damages:
+            return None
+        return self._take(session_id, 'repair', self._repair_key(product_info, repairable_damages))
+
+    def cancel(self, session_id):
+        """Drop all prefetch jobs for a session"""
+        with self.lock:
+            session_jobs = self.jobs.pop(session_id, None)
+
+        if not session_jobs:
+            return
+
+        for job in session_jobs.values():
+            job['future'].cancel()  # Only stops jobs that haven't started yet
+        print(f"   🛑 Prefetch cancelled for session {session_id[:8]}... ({', '.join(session_jobs)})")
+
+    def _repair_key(self, product_info, repairable_damages):
+        """Repair research depends on the product and the exact damage list"""
+        brand = str(product_info.get('brand', '')).lower()
+        model = str(product_info.get('model', '')).lower()
+        return f"{brand}|{model}|{'|'.join(str(d).lower() for d in repairable_damages)}"
+
+    def _start(self, session_id, stage, key, fn, *args):
+        """Submit a prefetch job unless an identical one exists or we're at the cap"""
+        if not Config.PREFETCH_ENABLED or not session_id:
+            return False
+
+        with self.lock:
+            self._purge_stale_jobs()
+
+            session_jobs = self.jobs.setdefault(session_id, {})
+            existing = session_jobs.get(stage)
+            if existing and existing['key'] == key and not existing['future'].cancelled():
+                return False  # Already prefetching exactly this
+
+            running = sum(
+                1 for jobs in self.jobs.values() for job in jobs.values()
+                if not job['future'].done()
+            )
+            if running >= self.max_concurrent:
+                print(f"   ⏸️  Prefetch skipped ({stage}) - {running}/{self.max_concurrent} already running")
+                return False
+
+            if existing:
+                existing['future'].cancel()  # Superseded (e.g. storage answered since)
+
+            session_jobs[stage] = {
+                'key': key,
+                'future': self.executor.submit(fn, *args),
+                'started_at': time.time()
+            }
+
+        print(f"   🚀 Prefetching {stage} research for session {session_id[:8]}...: {key}")
+        return True
+
+    def _take(self, session_id, stage, key):
+        """Pop a matching job and wait for its result"""
+        if not session_id:
+            return None
+
+        with self.lock:
+            session_jobs = self.jobs.get(session_id, {})
+            job = session_jobs.get(stage)
+            if not job or job['key'] != key:
+                return None
+            session_jobs.pop(stage)
+
+        try:
+            # Research is already in flight - waiting is never slower than starting over
+            result = job['future'].result()
+            print(f"   ⚡ Using prefetched {stage} research "
+                  f"(started {time.time() - job['started_at']:.1f}s ago)")
+            return result
+        except concurrent.futures.CancelledError:
+            return None
+        except Exception as e:
+            print(f"   ⚠️  Prefetched {stage} research failed: {e}")
+            return None
+
+    def _purge_stale_jobs(self):
+        """Forget finished jobs from abandoned sessions (caller holds the lock)"""
+        cutoff = time.time() - self.job_ttl
+        for session_id in list(self.jobs):
+            session_jobs = self.jobs[session_id]
+            for stage in list(session_jobs):
+                job = session_jobs[stage]
+                if job['future'].done() and job['started_at'] < cutoff:
+                    session_jobs.pop(stage)
+            if not session_jobs:
+                self.jobs.pop(session_id)
@@ -6,6 +6,9 @@ from scrapers.gumtree_scraper import GumtreeScraper
 from utils.currency_converter import CurrencyConverter
 from services.ai_service import AIService
 from services.perplexity_price_service import PerplexityPriceService
+from utils.ttl_cache import PersistentTTLCache
+from config import Config
+import re
 import statistics
 
 
@@ -23,8 +26,103 @@ class PriceResearchService:
         self.currency_converter = CurrencyConverter()
         self.ai_service = AIService()
         self.perplexity_service = PerplexityPriceService()
+        self.price_cache = PersistentTTLCache('price_research') if Config.PRICE_CACHE_ENABLED else None
 
     def research_prices(self, product_info):
+        """
+        Research prices, serving repeat lookups from the persistent cache
+
+        Results are cached per product fingerprint (category, brand, model,
+        storage, year, condition bucket) with a category-specific TTL. Failed research
+        (no market value) is never cached so the next seller retries.
+
+        Args:
+            product_info: Dict with product details
+
+        Returns:
+            Same dict as _research_prices_uncached(), plus 'from_cache' on hits
+        """
+        if not self.price_cache:
+            return self._research_prices_uncached(product_info)
+
+        cache_key = self._product_fingerprint(product_info)
+        cached = self.price_cache.get(cache_key)
+        if cached:
+            print(f"\n⚡ Price research cache HIT: {cache_key}")
+            cached['from_cache'] = True
+            return cached
+
+        print(f"\n🔎 Price research cache MISS: {cache_key}")
+        result = self._research_prices_uncached(product_info)
+
+        if result.get('market_value') and not result.get('needs_user_estimate'):
+            self.price_cache.set(cache_key, result, self._cache_ttl_for(product_info))
+
+        return result
+
+    def _product_fingerprint(self, product_info):
+        """
+        Build a normalized cache key for a product
+
+        "Apple" / "iPhone 13" / "128 GB" / "Good" and
+        "apple" / "iphone13" / "128gb" / "good condition" map to the same key.
+        The year is part of the key because age drives the depreciation
+        estimate (a 2015 and a 2021 Polo are different prices).
+        """
+        def normalize(value):
+            return re.sub(r'[^a-z0-9]', '', str(value or '').lower())
+
+        category = normalize(product_info.get('category'))
+
+        brand = normalize(product_info.get('brand'))
+        model = normalize(product_info.get('model'))
+
+        # Brand is often repeated in the model ("Apple" + "Apple iPhone 13")
+        if brand and model.startswith(brand) and model != brand:
+            model = model[len(brand):]
+
+        specs = product_info.get('specifications') or {}
+        storage = (
+            product_info.get('storage')
+            or product_info.get('capacity')
+            or (specs.get('capacity') if isinstance(specs, dict) else None)
+        )
+
+        year = product_info.get('year') or (specs.get('year') if isinstance(specs, dict) else None)
+
+        condition_bucket = self._condition_bucket(product_info.get('condition'))
+
+        return f"{category}|{brand}|{model}|{normalize(storage)}|{normalize(year)}|{condition_bucket}"
+
+    def _condition_bucket(self, condition):
+        """
+        Collapse free-text condition into the tiers that actually change
+        the research result (see DepreciationService._get_condition_multiplier)
+        """
+        condition_lower = str(condition or '').lower()
+
+        if 'pristine' in condition_lower or 'mint' in condition_lower:
+            return 'pristine'
+        elif 'excellent' in condition_lower or 'like new' in condition_lower:
+            return 'excellent'
+        elif 'fair' in condition_lower:
+            return 'fair'
+        elif 'poor' in condition_lower:
+            return 'poor'
+        else:
+            return 'good'
+
+    def _cache_ttl_for(self, product_info):
+        """Pick the cache TTL for this product's category"""
+        category = str(product_info.get('category', '')).lower()
+
+        for category_key, ttl in Config.PRICE_CACHE_CATEGORY_TTLS.items():
+            if category_key in category:
+                return ttl
+
+        return Config.PRICE_CACHE_DEFAULT_TTL
+
+    def _research_prices_uncached(self, product_info):
         """
         Main method to research prices across all sources using layered approach
 
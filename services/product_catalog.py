@@ -0,0 +1,297 @@
+"""
+Product Catalog
+Local, data-file-driven product identification (data/product_catalog.json)
+
+Most opening messages name a well-known product ("iphone 13 pro 256",
+"PS5 disc", "macbook air m2"). The catalog resolves those locally in well
+under a millisecond and returns the same structure as
+AIServiceV3.identify_product; anything below the confidence threshold is
+left to the LLM.
+
+Resolver:
+    - Text is lowercased and split into tokens on punctuation and
+      letter/digit boundaries, so "iPhone13Pro", "iphone 13 pro" and
+      "wh-1000xm4" / "wh 1000 xm4" tokenize the same
+    - Storage ("256gb", bare "256") and colours are pulled out as specs first
+    - An inverted index maps tokens to catalog aliases; every token of an
+      alias must be present (alphabetic tokens of 4+ letters tolerate one typo)
+    - Leftover tokens the alias doesn't explain lower the confidence, so
+      "iphone 13 pro" beats "iphone 13" and "iphone 13 cracked screen"
+      goes to the LLM
+
+The catalog also provides release years for DepreciationService.
+"""
+
+import json
+import re
+import threading
+from config import Config
+
+
+STORAGE_PATTERN = re.compile(r'\b(\d+)\s*(gb|tb)\b')
+BARE_STORAGE_PATTERN = re.compile(r'\b(64|128|256|512)\b')
+YEAR_PATTERN = re.compile(r'^(19|20)\d{2}$')
+
+COLORS = {
+    'black', 'white', 'silver', 'gold', 'blue', 'red', 'green', 'purple', 'pink', 'yellow',
+    'graphite', 'midnight', 'starlight', 'grey', 'gray', 'titanium',
+}
+
+# Words that say nothing about the product ("I want to sell my ...")
+FILLER_WORDS = {
+    'i', 'im', 'a', 'an', 'the', 'my', 'to', 'want', 'wanna', 'sell', 'selling', 'have', 'got',
+    'its', 'it', 'is', 'for', 'please', 'hi', 'hello', 'hey', 'this', 'space', 'edition',
+}
+
+# Per unexplained token / per corrected typo
+LEFTOVER_PENALTY = 0.2
+TYPO_PENALTY = 0.1
+
+
+def tokenize(text):
+    """Lowercase tokens split on punctuation and letter/digit boundaries ('+' becomes 'plus')"""
+    text = text.lower().replace('+', ' plus ')
+    return re.findall(r'[a-z]+|\d+', text)
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by at most one insert, delete, substitution or adjacent swap"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    if len(a) > len(b):
+        a, b = b, a
+    for i in range(len(b)):
+        if a == b[:i] + b[i + 1:]:
+            return True
+    return False
+
+
+def extract_specs(text):
+    """Pull storage and colour out of the message; returns (specs, remaining text)"""
+    specs = {}
+    text = text.lower()
+
+    match = STORAGE_PATTERN.search(text)
+    if match:
+        specs['storage'] = f"{match.group(1)}{match.group(2).upper()}"
+        text = text[:match.start()] + ' ' + text[match.end():]
+    else:
+        match = BARE_STORAGE_PATTERN.search(text)
+        if match:
+            specs['storage'] = f"{match.group(1)}GB"
+            text = text[:match.start()] + ' ' + text[match.end():]
+
+    colors = [token for token in tokenize(text) if token in COLORS]
+    if colors:
+        specs['color'] = ' '.join(colors).title()
+    return specs, text
+
+
+class ProductCatalog:
+    """
+    Inverted-index resolver over the product catalog
+
+    Usage:
+        catalog = get_product_catalog()
+        identification = catalog.resolve("iphone 13 pro 256")  # None -> ask the LLM
+        year = catalog.release_year("Apple", "iPhone 13 Pro")
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.PRODUCT_CATALOG_PATH
+        self.min_confidence = Config.PRODUCT_CATALOG_MIN_CONFIDENCE
+        self.category_questions = {}
+        self.year_keywords = {}
+        self.aliases = []  # (tokens, product)
+        self.index = {}  # token -> set of alias ids
+        self.stats = {'hits': 0, 'misses': 0}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️  Product catalog unavailable ({self.path}): {e}")
+            return
+
+        self.category_questions = data.get('category_questions', {})
+        self.year_keywords = data.get('year_keywords', {})
+
+        for entry in data.get('products', []):
+            # Base model plus each variant ("iPhone 13" -> "iPhone 13 Pro", "iPhone 13 Pro Max")
+            for variant in [''] + entry.get('variants', []):
+                model = f"{entry['model']}{variant if variant == '+' else ' ' + variant if variant else ''}"
+                product = {
+                    'brand': entry['brand'],
+                    'model': model,
+                    'category': entry['category'],
+                    'year': entry.get('year'),
+                    'brand_tokens': set(tokenize(entry['brand']))
+                }
+                for alias in entry.get('aliases', []):
+                    tokens = tuple(tokenize(f"{alias} {variant}"))
+                    alias_id = len(self.aliases)
+                    self.aliases.append((tokens, product))
+                    for token in tokens:
+                        self.index.setdefault(token, set()).add(alias_id)
+
+        print(f"✅ Product catalog loaded: {len(self.aliases)} aliases, {len(self.index)} tokens")
+
+    def _correct(self, token):
+        """Catalog tokens within one typo of an unknown token (4+ letters only - numbers must match)"""
+        if token in self.index or not token.isalpha() or len(token) < 4:
+            return []
+        return [known for known in self.index if known.isalpha() and _within_one_edit(token, known)]
+
+    def _match(self, tokens):
+        """
+        Score every alias that shares a token with the message
+
+        Returns:
+            [(confidence, alias_length, product, unexplained_tokens), ...]
+        """
+        expanded = {}  # message token -> catalog tokens it can stand for (with typo flag)
+        candidates = set()
+        for token in tokens:
+            if token in self.index:
+                expanded[token] = {token: False}
+                candidates |= self.index[token]
+            else:
+                corrections = self._correct(token)
+                expanded[token] = {known: True for known in corrections}
+                for known in corrections:
+                    candidates |= self.index[known]
+
+        matches = []
+        for alias_id in candidates:
+            alias_tokens, product = self.aliases[alias_id]
+            remaining = list(tokens)
+            typos = 0
+            for alias_token in alias_tokens:
+                for i, token in enumerate(remaining):
+                    if alias_token in expanded.get(token, {}):
+                        typos += expanded[token][alias_token]
+                        del remaining[i]
+                        break
+                else:
+                    break  # Alias token missing from the message
+            else:
+                unexplained = [t for t in remaining if t not in product['brand_tokens']
+                               and t != product['category'] and not YEAR_PATTERN.match(t)]
+                confidence = 1.0 - TYPO_PENALTY * typos - LEFTOVER_PENALTY * len(unexplained)
+                matches.append((confidence, len(alias_tokens), product, unexplained))
+
+        matches.sort(key=lambda m: (m[0], m[1]), reverse=True)
+        return matches
+
+    def resolve(self, user_message):
+        """
+        Identify a product from the user's opening message
+
+        Returns:
+            Same structure as AIServiceV3.identify_product (plus 'source' and
+            'match_confidence'), or None when no single product is confident enough
+        """
+        if not self.aliases:
+            return None
+
+        specs, text = extract_specs(user_message)
+        tokens = [t for t in tokenize(text) if t not in FILLER_WORDS and t not in COLORS]
+        matches = self._match(tokens) if tokens else []
+
+        best = matches[0] if matches else None
+        if best and len(matches) > 1:
+            runner_up = matches[1]
+            if runner_up[:2] == best[:2] and runner_up[2]['model'] != best[2]['model']:
+                best = None  # Two different products fit equally well - let the LLM decide
+
+        if not best or best[0] < self.min_confidence:
+            with self.lock:
+                self.stats['misses'] += 1
+            return None
+
+        with self.lock:
+            self.stats['hits'] += 1
+
+        confidence, _, product, _ = best
+        if product.get('year'):
+            specs['year'] = str(product['year'])
+
+        proposed = self.category_questions.get(product['category'], ['condition', 'accessories'])
+        proposed = [field for field in proposed if field not in specs]
+
+        print(f"\n📚 CATALOG IDENTIFICATION: {product['brand']} {product['model']} "
+              f"(confidence {confidence:.2f}, specs {specs})")
+
+        return {
+            'product_info': {
+                'name': f"{product['brand']} {product['model']}",
+                'brand': product['brand'],
+                'model': product['model'],
+                'category': product['category'],
+                'specs': specs
+            },
+            'proposed_questions': proposed,
+            'needs_model_confirmation': False,
+            'model_options': [],
+            'source': 'catalog',
+            'match_confidence': round(confidence, 2)
+        }
+
+    def release_year(self, brand, model):
+        """
+        Release year for a brand/model string (e.g. from an AI identification)
+
+        Extra tokens are fine here ("Galaxy S23 Ultra 5G"), as long as one
+        catalog alias is fully present.
+
+        Returns:
+            Year as integer, or None if the catalog doesn't know the product
+        """
+        tokens = [t for t in tokenize(f"{brand or ''} {model or ''}") if t not in FILLER_WORDS]
+        matches = [m for m in self._match(tokens) if m[2].get('year')]
+        if matches:
+            # Most specific alias wins, typos count against
+            return max(matches, key=lambda m: (m[1], m[0]))[2]['year']
+
+        # Chip generations etc. ("iMac M1" -> 2020)
+        text = ' '.join(tokens)
+        for keyword, year in self.year_keywords.items():
+            if re.search(rf'(?<!\w){" ".join(tokenize(keyword))}(?!\w)', text):
+                return year
+        return None
+
+    def get_stats(self):
+        """Hit/miss counters for this worker"""
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0,
+                'aliases': len(self.aliases)
+            }
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_product_catalog():
+    """Get the process-wide catalog (loaded lazily from PRODUCT_CATALOG_PATH)"""
+    global _catalog
+
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProductCatalog()
+    return _catalog
@@ -0,0 +1,247 @@
+"""
+Question Bank
+Reusable generate_question output for the v3 flow
+
+The condition checklist for an iPhone or the storage question for a Galaxy
+S23 comes out of Sonnet nearly identical in every conversation. The bank keys
+generated questions on (category, brand, field, relevant collected answers),
+stores them with the product name templated out, and serves them instantly.
+Fields whose options depend on the exact product (storage tiers, trims, model
+years...) are also keyed on the model, so an iPhone 13's storage options are
+never served for an iPhone 15 Pro.
+
+Entries are filled from live generations and can be warmed offline for the
+top categories:
+
+    python -m services.question_bank
+
+Keys include a version built from QUESTION_BANK_VERSION and a fingerprint of
+the question prompt, plus the model that actually wrote the question (Haiku
+or Sonnet, see utils/model_router.py). Editing the prompt or swapping either
+model invalidates the affected entries (they simply stop being read and
+expire).
+"""
+
+import hashlib
+import re
+import threading
+from config import Config
+from utils.ttl_cache import PersistentTTLCache
+
+
+PRODUCT_PLACEHOLDER = '{product}'
+
+CATEGORY_ALIASES = {
+    'smartphone': 'phone', 'mobile': 'phone', 'mobile phone': 'phone', 'cellphone': 'phone', 'cell phone': 'phone',
+    'notebook': 'laptop', 'macbook': 'laptop',
+    'smartwatch': 'watch', 'smart watch': 'watch',
+    'car': 'vehicle', 'bakkie': 'vehicle',
+    'headphone': 'headphones', 'earbuds': 'headphones', 'earphones': 'headphones',
+    'games console': 'console', 'gaming console': 'console',
+    'sneakers': 'shoes', 'trainers': 'shoes',
+    # Singular forms - normalize_category singularizes plurals that have no alias of their own
+    'earbud': 'headphones', 'earphone': 'headphones', 'shoe': 'shoes', 'sneaker': 'shoes', 'trainer': 'shoes',
+}
+
+# Fields whose question is the same for every model of a brand in a category -
+# every other field is keyed on the model too (storage, variant, model_year, ...)
+BRAND_LEVEL_FIELDS = {
+    'condition', 'condition_details', 'damage', 'damage_details', 'damage_severity',
+    'accessories', 'original_box', 'receipt', 'warranty',
+    'unlock_status', 'device_unlocked', 'contract_free',
+}
+
+# Collected answers that change the question for a field (everything else is ignored in the key)
+CONTEXT_FIELDS = {
+    'damage_severity': ('condition', 'damage', 'damage_details'),
+}
+
+# Offline warm-up: representative products for the top categories and the fields they get asked
+WARM_PRODUCTS = [
+    ({'brand': 'Apple', 'model': 'iPhone 13', 'category': 'phone'}, ['condition', 'storage', 'battery_health', 'unlock_status']),
+    ({'brand': 'Samsung', 'model': 'Galaxy S23', 'category': 'phone'}, ['condition', 'storage', 'unlock_status']),
+    ({'brand': 'Apple', 'model': 'iPad Air', 'category': 'tablet'}, ['condition', 'storage']),
+    ({'brand': 'Apple', 'model': 'MacBook Air M1', 'category': 'laptop'}, ['condition', 'storage', 'battery_health']),
+    ({'brand': 'Apple', 'model': 'Watch Series 8', 'category': 'watch'}, ['condition', 'accessories']),
+    ({'brand': 'Sony', 'model': 'PlayStation 5', 'category': 'console'}, ['condition', 'accessories']),
+    ({'brand': 'Sony', 'model': 'WH-1000XM4', 'category': 'headphones'}, ['condition', 'accessories']),
+    ({'brand': 'Canon', 'model': 'EOS 250D', 'category': 'camera'}, ['condition', 'accessories']),
+]
+
+
+def _normalize(value):
+    """Lowercase, collapse whitespace; lists become sorted comma-joined values"""
+    if isinstance(value, (list, tuple, set)):
+        return ','.join(sorted(_normalize(v) for v in value))
+    return ' '.join(str(value).lower().split())
+
+
+def _singular(word):
+    """'smartphones' -> 'smartphone', 'watches' -> 'watch', 'accessories' -> 'accessory'"""
+    if len(word) <= 3 or word.endswith(('ss', 'us', 'is')):
+        return word
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('ches', 'shes', 'xes', 'sses')):
+        return word[:-2]
+    if word.endswith('s'):
+        return word[:-1]
+    return word
+
+
+class QuestionBank:
+    """
+    Persistent bank of generated questions
+
+    Usage:
+        bank = QuestionBank(fingerprint=QUESTION_INSTRUCTIONS, models=(strong_model, fast_model))
+        question = bank.get(field_name, product_info, collected_fields)  # None on miss
+        bank.put(field_name, product_info, collected_fields, question, model=answering_model)
+    """
+
+    def __init__(self, fingerprint='', models=('',)):
+        self.enabled = Config.QUESTION_BANK_ENABLED
+        self.models = tuple(models)  # Looked up in this order - the first is preferred
+        self.ttl_seconds = Config.QUESTION_BANK_TTL
+        digest = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:8]
+        self.version = f"{Config.QUESTION_BANK_VERSION}:{digest}"
+        self.store = PersistentTTLCache('question_bank') if self.enabled else None
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize_category(category):
+        """Map the AI's free-form category onto a stable bank category"""
+        category = _normalize(category or 'item')
+        if category in CATEGORY_ALIASES:
+            return CATEGORY_ALIASES[category]
+        words = category.split(' ')
+        category = ' '.join(words[:-1] + [_singular(words[-1])])  # "mobile phones" -> "mobile phone"
+        return CATEGORY_ALIASES.get(category, category)
+
+    @staticmethod
+    def normalize_model(product_info):
+        """Model without the brand prefix ("Apple iPhone 13" and "iPhone 13" share a key)"""
+        model = _normalize(product_info.get('model') or '')
+        brand = _normalize(product_info.get('brand') or '')
+        if brand and model.startswith(brand + ' '):
+            model = model[len(brand) + 1:]
+        return model
+
+    def key_for(self, field_name, product_info, collected_fields, model=''):
+        """Bank key: version | LLM | category | brand | product model (model-specific fields only) | field | context"""
+        context = []
+        for name in CONTEXT_FIELDS.get(field_name, ()):
+            if collected_fields.get(name):
+                context.append(f"{name}={_normalize(collected_fields[name])}")
+        return '|'.join([
+            self.version,
+            model,
+            self.normalize_category(product_info.get('category')),
+            _normalize(product_info.get('brand') or ''),
+            '' if field_name in BRAND_LEVEL_FIELDS else self.normalize_model(product_info),
+            field_name,
+            ';'.join(context)
+        ])
+
+    def get(self, field_name, product_info, collected_fields):
+        """
+        Look up a banked question
+
+        Returns:
+            {'question_text', 'quick_options', 'ui_type'} for this product, or None
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._lookup(field_name, product_info, collected_fields)
+        with self.lock:
+            self.stats['hits' if entry else 'misses'] += 1
+        if not entry:
+            return None
+
+        product_name = self._product_name(product_info)
+        return {
+            'question_text': entry['question_text'].replace(PRODUCT_PLACEHOLDER, product_name),
+            'quick_options': [option.replace(PRODUCT_PLACEHOLDER, product_name) for option in entry['quick_options']],
+            'ui_type': entry['ui_type']
+        }
+
+    def put(self, field_name, product_info, collected_fields, question, model=''):
+        """Bank a freshly generated question under the model that wrote it (with the product name templated out)"""
+        if not self.enabled or model not in self.models or not isinstance(question.get('question_text'), str):
+            return
+
+        entry = {
+            'question_text': self._templatize(question['question_text'], product_info),
+            'quick_options': [self._templatize(str(o), product_info) for o in question.get('quick_options') or []],
+            'ui_type': question.get('ui_type', 'text')
+        }
+        self.store.set(self.key_for(field_name, product_info, collected_fields, model), entry, self.ttl_seconds)
+        with self.lock:
+            self.stats['stores'] += 1
+
+    def get_stats(self):
+        """Hit/miss counters for this worker"""
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0,
+                'version': self.version,
+                'models': list(self.models),
+                'enabled': self.enabled
+            }
+
+    def warm(self, ai_service, products=None):
+        """
+        Generate and bank questions for the top categories (offline, before traffic)
+
+        Args:
+            ai_service: AIServiceV3 whose generate_question fills the bank on a miss
+            products: [(product_info, [field, ...]), ...] - defaults to WARM_PRODUCTS
+
+        Returns:
+            Number of questions newly generated
+        """
+        if not self.enabled:
+            return 0
+
+        generated = 0
+        for product_info, fields in products or WARM_PRODUCTS:
+            for field_name in fields:
+                if self._lookup(field_name, product_info, {}):
+                    continue
+                ai_service.generate_question(field_name, product_info, {})
+                generated += 1
+                print(f"   🏦 Banked {field_name} for {self._product_name(product_info)}")
+        return generated
+
+    def _lookup(self, field_name, product_info, collected_fields):
+        """Stored entry from the first model that has one, or None"""
+        for model in self.models:
+            entry = self.store.get(self.key_for(field_name, product_info, collected_fields, model))
+            if entry:
+                return entry
+        return None
+
+    @staticmethod
+    def _product_name(product_info):
+        return f"{product_info.get('brand', '')} {product_info.get('model', '')}".strip()
+
+    def _templatize(self, text, product_info):
+        """Replace mentions of this specific product with the placeholder"""
+        names = [self._product_name(product_info), product_info.get('name'), product_info.get('model')]
+        names = {n.strip() for n in names if n and len(n.strip()) >= 3}  # "5" must not eat "95-100%"
+        for name in sorted(names, key=len, reverse=True):
+            text = re.sub(rf'(?<!\w){re.escape(name)}(?!\w)', PRODUCT_PLACEHOLDER, text, flags=re.IGNORECASE)
+        return text
+
+
+if __name__ == '__main__':
+    from services.ai_service_v3 import AIServiceV3
+
+    service = AIServiceV3()
+    print(f"🏦 Warming question bank {service.question_bank.version}...")
+    count = service.question_bank.warm(service)
+    print(f"✅ Generated {count} questions")
@@ -0,0 +1,146 @@
+"""
+Question Plan Service
+Generates every remaining v3 question in one call, right after identification
+
+Once GuardrailEngine.approve_questions has fixed the 2-4 fields to ask, the
+questions themselves don't depend on the answers. We generate the whole
+plan in the background while the user answers the first question, keep it
+server-side (shared SQLite cache, keyed by session), and later turns only
+run extract_answer + the guardrail logic.
+
+damage_severity is injected dynamically and depends on the damage answer,
+so it is never planned - it is generated on demand.
+
+The same store holds questions streamed to the browser by
+/api/message/v3/stream: their options only exist once the response (and
+with it the session) has already gone out, so the next turn recalls them
+from here.
+"""
+
+import concurrent.futures
+import threading
+from config import Config
+from utils.ttl_cache import PersistentTTLCache
+
+
+# Fields whose question depends on earlier answers - always generated on demand
+DYNAMIC_FIELDS = {'damage_severity'}
+
+
+class QuestionPlanService:
+    """
+    Per-session question plans
+
+    - start() replaces any earlier plan for the session (new product = new plan)
+    - take() waits briefly for an in-flight plan, then falls back to the stored one
+    - Plans are tied to the product they were made for; a different product never matches
+    """
+
+    def __init__(self, ai_service):
+        self.ai_service = ai_service
+        self.enabled = Config.QUESTION_PLAN_ENABLED
+        self.ttl_seconds = Config.QUESTION_PLAN_TTL
+        self.store = PersistentTTLCache('question_plans')
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=Config.QUESTION_PLAN_MAX_WORKERS,
+            thread_name_prefix='question-plan'
+        )
+        self.pending = {}  # session_id -> (plan_key, future) while generating in this worker
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _plan_key(product_info):
+        """Identifies the product a plan was made for"""
+        return '|'.join(
+            ' '.join(str(product_info.get(k) or '').lower().split()) for k in ('brand', 'model', 'category')
+        )
+
+    def start(self, session_id, fields, product_info, collected_fields):
+        """
+        Generate questions for these fields in the background
+
+        Returns:
+            True if a plan was started
+        """
+        fields = [f for f in fields if f not in DYNAMIC_FIELDS]
+        if not self.enabled or not fields:
+            return False
+
+        plan_key = self._plan_key(product_info)
+        future = self.executor.submit(
+            self._build, session_id, plan_key, fields, dict(product_info), dict(collected_fields)
+        )
+        with self.lock:
+            self.pending[session_id] = (plan_key, future)
+        future.add_done_callback(lambda f: self._forget(session_id, f))
+        print(f"   📝 Question plan started for {fields}")
+        return True
+
+    def take(self, session_id, field_name, product_info):
+        """
+        Planned question for this field
+
+        Returns:
+            {'question_text', 'quick_options', 'ui_type'}, or None to generate on demand
+        """
+        if not self.enabled or field_name in DYNAMIC_FIELDS:
+            return None
+
+        plan_key = self._plan_key(product_info)
+        with self.lock:
+            pending = self.pending.get(session_id)
+
+        questions = None
+        if pending and pending[0] == plan_key:
+            try:
+                questions = pending[1].result(timeout=Config.QUESTION_PLAN_WAIT)
+            except concurrent.futures.TimeoutError:
+                print(f"   ⏱️  Question plan still running after {Config.QUESTION_PLAN_WAIT}s - generating on demand")
+            except Exception as e:
+                print(f"   ⚠️  Question plan failed: {e}")
+        else:
+            entry = self.store.get(session_id)
+            if entry and entry.get('plan_key') == plan_key:
+                questions = entry.get('questions')
+
+        question = (questions or {}).get(field_name)
+        return dict(question) if question else None
+
+    def remember_streamed(self, session_id, field_name, product_info, question):
+        """Keep a streamed question until the user's answer to it comes in"""
+        entry = {'plan_key': self._plan_key(product_info), 'field': field_name, 'question': question}
+        self.store.set(f"{session_id}:streamed", entry, self.ttl_seconds)
+
+    def recall_streamed(self, session_id, field_name, product_info):
+        """
+        The question last streamed for this field
+
+        Returns:
+            {'question_text', 'quick_options', 'ui_type'}, or None
+        """
+        entry = self.store.get(f"{session_id}:streamed")
+        if not entry or entry.get('field') != field_name or entry.get('plan_key') != self._plan_key(product_info):
+            return None
+        return entry['question']
+
+    def discard(self, session_id):
+        """Drop a session's plan (reset / new conversation)"""
+        with self.lock:
+            pending = self.pending.pop(session_id, None)
+        if pending:
+            pending[1].cancel()
+        self.store.delete(session_id)
+        self.store.delete(f"{session_id}:streamed")
+
+    def _build(self, session_id, plan_key, fields, product_info, collected_fields):
+        questions = self.ai_service.generate_question_plan(fields, product_info, collected_fields)
+        if questions:
+            self.store.set(session_id, {'plan_key': plan_key, 'questions': questions}, self.ttl_seconds)
+        return questions
+
+    def _forget(self, session_id, future):
+        """Done callback: the stored plan takes over from the in-memory future"""
+        with self.lock:
+            pending = self.pending.get(session_id)
+            if pending and pending[1] is future:
+                self.pending.pop(session_id, None)
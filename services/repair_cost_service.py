@@ -1,6 +1,6 @@
 from services.ai_service import AIService
-import anthropic
 from config import Config
+from utils.llm_gateway import get_llm_gateway
 
 
 class RepairCostService:
@@ -10,7 +10,7 @@ class RepairCostService:
 
     def __init__(self):
         self.ai_service = AIService()
-        self.client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
+        self.llm = get_llm_gateway()  # Shared Claude client
 
     def estimate_repair_costs(self, product_info, damage_info):
         """
@@ -105,7 +105,8 @@ Be realistic and conservative with estimates. If unsure, estimate higher.
 """
 
         try:
-            response = self.client.messages.create(
+            response = self.llm.create_message(
+                'repair.estimate',
                 model=Config.ANTHROPIC_MODEL,
                 max_tokens=2048,
                 messages=[{"role": "user", "content": prompt}]
@@ -9,6 +9,7 @@ class EpicDealsApp {
         this.productInfo = {};
         this.hasDamage = false;         // Track if user reported damage (for calc animation)
         this.answerHistory = [];         // Track field answers for Back navigation
+        this.streamQuestions = !!(window.ReadableStream && window.TextDecoder);  // Stream question text as it's generated
         this.init();
     }
 
@@ -102,6 +103,7 @@ class EpicDealsApp {
         msgDiv.appendChild(bubble);
         container.appendChild(msgDiv);
         this.scrollToBottom();
+        return bubble;
     }
 
     scrollToBottom() {
@@ -164,14 +166,16 @@ class EpicDealsApp {
 
     async sendMessageV3(message) {
         try {
-            const response = await fetch('/api/message/v3', {
+            const response = await fetch(this.streamQuestions ? '/api/message/v3/stream' : '/api/message/v3', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ message })
             });
-            const data = await response.json();
-            if (!data.success) {
-                this.showError(data.error || 'Something went wrong');
+            // The stream endpoint only streams when a question is being generated - plain JSON otherwise
+            const streamed = (response.headers.get('Content-Type') || '').includes('text/event-stream');
+            const data = streamed ? await this.readQuestionStream(response) : await response.json();
+            if (!data || !data.success) {
+                this.showError((data && data.error) || 'Something went wrong');
                 return null;
             }
             return data;
@@ -182,6 +186,46 @@ class EpicDealsApp {
         }
     }
 
+    async readQuestionStream(response) {
+        // 'token' events fill a bot bubble as the question is written; 'done' carries the full payload
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let bubble = null;
+        let data = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const raw = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                const event = (raw.match(/^event: (.*)$/m) || [])[1];
+                const payload = JSON.parse((raw.match(/^data: (.*)$/m) || [])[1] || 'null');
+
+                if (event === 'token') {
+                    if (!bubble) {
+                        this.hideTypingIndicator();
+                        bubble = this.addMessage('', 'bot');
+                    }
+                    bubble.textContent += payload.text;
+                    this.scrollToBottom();
+                } else if (event === 'done') {
+                    data = payload;
+                }
+            }
+        }
+
+        if (data && bubble) {
+            bubble.textContent = data.question;  // Final text wins if the stream fell back mid-way
+            data.questionShown = true;
+        }
+        return data;
+    }
+
     async sendTextAnswer() {
         const input = document.getElementById('text-input');
         const answer = input.value.trim();
@@ -244,8 +288,8 @@ class EpicDealsApp {
             return;
         }
 
-        // Show question
-        if (data.question) {
+        // Show question (unless it was already streamed into the chat)
+        if (data.question && !data.questionShown) {
             this.addMessage(data.question, 'bot');
         }
 
@@ -650,11 +694,17 @@ class EpicDealsApp {
 
     async calculateOffer() {
         try {
+            // Ask for a background job; older/sync servers just return the offer directly
             const response = await fetch('/api/calculate-offer', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' }
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ async: true })
             });
-            const data = await response.json();
+            let data = await response.json();
+
+            if (data.job_id) {
+                data = await this.waitForOfferJob(data);
+            }
 
             // Stop animation intervals
             if (this._calcIntervals) {
@@ -693,6 +743,75 @@ class EpicDealsApp {
         }
     }
 
+    async waitForOfferJob(job) {
+        // Live stage updates over SSE when the server offers it; polling otherwise (or if the stream drops)
+        if (window.EventSource && job.events_url) {
+            const finished = await this.streamOfferJob(job);
+            if (finished) {
+                const response = await fetch(job.status_url);
+                return await response.json();
+            }
+        }
+        return await this.pollOfferJob(job);
+    }
+
+    streamOfferJob(job) {
+        return new Promise((resolve) => {
+            const source = new EventSource(job.events_url);
+            const finish = (finished) => {
+                source.close();
+                resolve(finished);
+            };
+
+            source.addEventListener('progress', (e) => this.showOfferJobProgress(JSON.parse(e.data)));
+            source.addEventListener('done', () => finish(true));
+            source.addEventListener('failed', () => finish(true));
+            source.addEventListener('timeout', () => finish(false));
+            source.onerror = () => finish(false);
+        });
+    }
+
+    async pollOfferJob(job) {
+        const deadline = Date.now() + 5 * 60 * 1000;
+
+        while (Date.now() < deadline) {
+            const response = await fetch(job.status_url);
+            const data = await response.json();
+
+            if (data.status === 'done' || data.status === 'failed' || !data.job_id) {
+                return data;
+            }
+            this.showOfferJobProgress(data);
+            await new Promise(r => setTimeout(r, 1500));
+        }
+
+        return { success: false, error: 'Your offer is taking longer than expected. Please try again.' };
+    }
+
+    showOfferJobProgress(job) {
+        const stageLabels = {
+            price_research: 'Searching SA marketplaces for recent sales...',
+            repair_research: 'Researching repair costs from local shops...',
+            ber_check: 'Checking whether repairs are worth it...',
+            final_offer: 'Calculating fair offer...'
+        };
+        if (!job.stage || !stageLabels[job.stage]) return;
+
+        // Real progress from here on - stop the simulated step cycling
+        if (this._calcIntervals && this._calcIntervals.stepInterval) {
+            clearInterval(this._calcIntervals.stepInterval);
+            this._calcIntervals.stepInterval = null;
+        }
+
+        const stepEl = document.getElementById('calc-current-step');
+        const progressEl = document.getElementById('calc-progress-fill');
+        if (stepEl) stepEl.textContent = stageLabels[job.stage];
+        if (progressEl && job.stages) {
+            const done = (job.completed_stages || []).length;
+            progressEl.style.width = Math.min(90, ((done + 0.5) / job.stages.length) * 90) + '%';
+        }
+    }
+
     // ============================================
     // OFFER DISPLAY (Screen 3)
     // ============================================
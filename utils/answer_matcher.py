@@ -0,0 +1,115 @@
+"""
+Answer Matcher
+Rule-based fast path for v3 Phase 2 answers
+
+Most answers are a tap on one of the question's quick_options (or a
+checklist submission, which the frontend sends as "Option A, Option B"),
+or a well-structured value like "85 000 km", "2019" or "256gb". Those are
+matched here and recorded directly; only genuine free text goes through
+AIServiceV3.extract_answer.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+
+# Option text similarity needed to count as a (slightly mistyped) selection
+OPTION_MATCH_RATIO = 0.9
+
+NO_DAMAGE_OPTION_PHRASES = ('none', 'no issue', 'no damage', 'excellent condition', 'like new')
+UNSURE_OPTION_PHRASES = ('not sure', "don't know", 'unsure')
+CONDITION_FIELDS = ('condition', 'damage', 'damage_details')
+
+MILEAGE_PATTERN = re.compile(r'^(\d{1,3}(?:[ ,]\d{3})+|\d+(?:\.\d+)?)\s*(k)?\s*(?:km|kms|kilometers|kilometres)?$')
+YEAR_PATTERN = re.compile(r'^(?:19|20)\d{2}$')
+STORAGE_PATTERN = re.compile(r'^(\d+)\s*(gb|tb)?$')
+
+
+def _normalize(text):
+    """Lowercase, drop emojis/punctuation, collapse whitespace"""
+    text = re.sub(r'[^\w\s%<>/+.-]', ' ', str(text).lower())
+    return ' '.join(text.split())
+
+
+def _match_option(answer, options):
+    """Canonical option for an (almost) exact selection, or None"""
+    normalized = _normalize(answer)
+    if not normalized:
+        return None
+
+    by_text = {_normalize(option): option for option in options}
+    if normalized in by_text:
+        return by_text[normalized]
+
+    # Typos only - numbers must match exactly ("S23" is not "S24", "85-94%" is not "75-84%")
+    digits = re.findall(r'\d+', normalized)
+    close = [option for text, option in by_text.items()
+             if re.findall(r'\d+', text) == digits
+             and SequenceMatcher(None, normalized, text).ratio() >= OPTION_MATCH_RATIO]
+    return close[0] if len(close) == 1 else None
+
+
+def _option_value(option, field_name):
+    """What record_answer should get for a selected option"""
+    lower = option.lower()
+    if any(phrase in lower for phrase in UNSURE_OPTION_PHRASES):
+        return 'unknown'
+    if field_name in CONDITION_FIELDS and any(phrase in lower for phrase in NO_DAMAGE_OPTION_PHRASES):
+        return 'no_damage'
+    return option
+
+
+def _match_structured(answer, field_name):
+    """Mileage, year and storage answers that need no interpretation"""
+    text = _normalize(answer)
+    field = field_name.lower()
+
+    if 'mileage' in field or 'km' in field or 'odometer' in field:
+        match = MILEAGE_PATTERN.match(text)
+        if match:
+            value = float(re.sub(r'[ ,]', '', match.group(1)))
+            return int(value * 1000 if match.group(2) else value)
+
+    if 'year' in field and YEAR_PATTERN.match(text):
+        return int(text)
+
+    if 'storage' in field or 'capacity' in field:
+        match = STORAGE_PATTERN.match(text)
+        if match:
+            return f"{match.group(1)}{(match.group(2) or 'gb').upper()}"
+
+    return None
+
+
+def match_answer(user_answer, field_name, quick_options=None):
+    """
+    Resolve a Phase 2 answer without any model call
+
+    Args:
+        user_answer: What the user sent
+        field_name: Field the question was about
+        quick_options: Options shown with the question (engine.ui_options)
+
+    Returns:
+        Value for GuardrailEngine.record_answer, or None for free text
+        (which goes to extract_answer)
+    """
+    options = [option for option in quick_options or [] if isinstance(option, str)]
+
+    if options:
+        option = _match_option(user_answer, options)
+        if option:
+            return _option_value(option, field_name)
+
+        # Checklist submission: every comma-separated part must be an option
+        parts = [part for part in user_answer.split(',') if part.strip()]
+        if len(parts) > 1:
+            selected = [_match_option(part, options) for part in parts]
+            if all(selected):
+                values = [_option_value(option, field_name) for option in selected]
+                issues = [value for value in values if value not in ('no_damage', 'unknown')]
+                if not issues:
+                    return values[0]
+                return ', '.join(issues)
+
+    return _match_structured(user_answer, field_name)
@@ -2,10 +2,126 @@
 Courier Eligibility Checker - AI-Powered
 Determines if an item can be couriered using AI intelligence
 Generates witty, adaptive responses for all scenarios
+
+Common electronics (and obviously huge/absurd items) are decided by local
+rules with no network call. Only genuinely unknown items go to Claude, and
+those verdicts are cached by normalized item text.
 """
 
-import anthropic
+import re
 from config import Config
+from utils.llm_gateway import get_llm_gateway
+from utils.ttl_cache import PersistentTTLCache
+
+
+# Courier-friendly electronics we buy every day. Families match with any
+# suffix so "iphone14" and "galaxys23" are caught too.
+ELECTRONICS_FAMILIES = [
+    'iphone', 'ipad', 'ipod', 'macbook', 'imac', 'airpod', 'galaxy', 'pixel', 'xperia',
+    'playstation', 'xbox', 'gopro', 'kindle', 'surface', 'thinkpad', 'chromebook'
+]
+ELECTRONICS_KEYWORDS = [
+    'phone', 'smartphone', 'cellphone', 'tablet', 'laptop', 'notebook', 'ultrabook',
+    'watch', 'smartwatch', 'earbuds', 'earphones', 'headphones', 'headset', 'camera', 'lens',
+    'dslr', 'mirrorless', 'drone', 'console', 'nintendo', 'steam deck', 'ereader',
+    'speaker', 'soundbar', 'keyboard', 'mouse', 'router', 'ssd', 'hard drive', 'graphics card',
+    'gpu', 'powerbank', 'power bank', 'charger', 'fitbit', 'garmin', 'apple watch', 'beats',
+    'bose', 'jbl', 'sonos', 'dji', 'canon', 'nikon', 'fujifilm', 'huawei', 'xiaomi', 'oppo',
+    'oneplus', 'nokia', 'motorola'
+]
+
+# Items that clearly can't go in a courier bag, with a canned (friendly) rejection
+NON_COURIER_GROUPS = {
+    'furniture': {
+        'keywords': ['couch', 'sofa', 'bed', 'mattress', 'wardrobe', 'cupboard', 'table', 'desk',
+                     'chair', 'bookshelf', 'piano'],
+        'reason': "We'd love to help, but a {item} won't squeeze into a courier bag! 🛋️ "
+                  "We specialise in used electronics that ship in a small parcel - phones, "
+                  "laptops, tablets, cameras and the like."
+    },
+    'large_appliance': {
+        'keywords': ['fridge', 'refrigerator', 'freezer', 'washing machine', 'tumble dryer',
+                     'dishwasher', 'stove', 'oven', 'geyser', 'treadmill'],
+        'reason': "Our couriers are strong, but a {item} is a bit much for a parcel bag! 🧊 "
+                  "We buy used electronics that fit in a small box - phones, laptops, tablets, "
+                  "cameras and similar."
+    },
+    'vehicle': {
+        'keywords': ['car', 'bakkie', 'truck', 'motorbike', 'motorcycle', 'scooter', 'boat',
+                     'tractor', 'caravan', 'trailer'],
+        'reason': "Unfortunately our couriers draw the line at driving a {item} to us! 🚗 "
+                  "We buy used electronics that fit in a courier bag - phones, laptops, "
+                  "tablets, cameras and similar."
+    },
+    'living_thing': {
+        'keywords': ['dog', 'puppy', 'kitten', 'horse', 'cow', 'goat', 'sheep', 'chicken',
+                     'parrot', 'hamster', 'rabbit'],
+        'reason': "We're sure your {item} is lovely, but we only buy used electronics - and our "
+                  "couriers aren't trained in animal handling! 🐾"
+    }
+}
+
+_ELECTRONICS_RE = re.compile(
+    r'\b(?:' + '|'.join(ELECTRONICS_FAMILIES) + r')\w*'
+    r'|\bps[1-5]\b'  # PlayStation shorthand
+    r'|\b(?:' + '|'.join(re.escape(k) for k in ELECTRONICS_KEYWORDS) + r')s?\b'
+)
+_NON_COURIER_RES = {
+    group: re.compile(r'\b(' + '|'.join(re.escape(k) for k in spec['keywords']) + r')s?\b')  # group 1: the keyword
+    for group, spec in NON_COURIER_GROUPS.items()
+}
+
+_verdict_cache = None
+
+
+def _get_verdict_cache():
+    """Shared persistent cache for AI verdicts on unknown items (created lazily)"""
+    global _verdict_cache
+    if _verdict_cache is None:
+        _verdict_cache = PersistentTTLCache('courier_verdicts')
+    return _verdict_cache
+
+
+def _normalize_item_text(text: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace for cache keys"""
+    return ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+
+def _local_courier_verdict(full_text: str):
+    """
+    Decide eligibility from local rules
+
+    Returns:
+        Verdict dict, or None if the rules can't tell (ambiguous or unknown item)
+    """
+    text = _normalize_item_text(full_text)
+    is_electronics = bool(_ELECTRONICS_RE.search(text))
+    rejected_group, match = None, None
+    for group, pattern in _NON_COURIER_RES.items():
+        match = pattern.search(text)
+        if match:
+            rejected_group = group
+            break
+
+    # Both or neither (e.g. "car charger", "garden gnome") -> let the AI decide
+    if is_electronics == bool(rejected_group):
+        return None
+
+    if is_electronics:
+        return {
+            'eligible': True,
+            'reason': 'Great news! We can collect this item with our free courier service.',
+            'category_matched': 'electronics',
+            'is_silly': False
+        }
+
+    # Name the matched keyword ("couch"), not the whole category/brand/model text
+    return {
+        'eligible': False,
+        'reason': NON_COURIER_GROUPS[rejected_group]['reason'].format(item=match.group(1)),
+        'category_matched': rejected_group,
+        'is_silly': rejected_group in ('furniture', 'large_appliance', 'vehicle', 'living_thing')
+    }
 
 
 def is_courier_eligible(product_info: dict) -> dict:
@@ -40,7 +156,6 @@ def is_courier_eligible(product_info: dict) -> dict:
         }
 
     # Check for explicit multiple item indicators
-    import re
     multiple_indicators = [
         r'\b\d+\s*x\b',  # "2x", "5 x"
         r'\bx\s*\d+\b',  # "x2", "x 5"
@@ -60,12 +175,23 @@ def is_courier_eligible(product_info: dict) -> dict:
                 'is_silly': False
             }
 
+    # Fast path: common electronics / obviously huge items need no AI call
+    local_verdict = _local_courier_verdict(full_text)
+    if local_verdict:
+        print(f"⚡ COURIER CHECK (local rules) for '{full_text}': eligible={local_verdict['eligible']}")
+        return local_verdict
+
+    cache_key = _normalize_item_text(full_text)
+    if Config.COURIER_VERDICT_CACHE_ENABLED:
+        cached_verdict = _get_verdict_cache().get(cache_key)
+        if cached_verdict:
+            print(f"💾 COURIER CHECK (cached) for '{full_text}': eligible={cached_verdict['eligible']}")
+            return cached_verdict
+
     # Use AI to determine courier eligibility
     try:
         print(f"\n🤖 AI COURIER CHECK: Analyzing '{full_text}'...")
 
-        client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
-
         prompt = f"""The user wants to sell ONE (1) single item: "{full_text}"
 
 Can this SINGLE ITEM be shipped in a courier bag or small parcel box?
@@ -102,10 +228,10 @@ Example thinking:
 Analyze ONE (1) item: "{full_text}":"""
 
         print(f"   Calling Claude API...")
-        response = client.messages.create(
+        response = get_llm_gateway().create_message(
+            'courier.eligibility',
             model=Config.ANTHROPIC_MODEL,
             max_tokens=512,
-            timeout=10.0,  # 10 second timeout
             messages=[{
                 "role": "user",
                 "content": prompt
@@ -114,7 +240,6 @@ Analyze ONE (1) item: "{full_text}":"""
         print(f"   ✅ API call successful!")
 
         import json
-        import re
 
         response_text = response.content[0].text.strip()
 
@@ -143,6 +268,9 @@ Analyze ONE (1) item: "{full_text}":"""
         if 'reason' not in result:
             result['reason'] = 'Item appears to be courier-eligible'
 
+        if Config.COURIER_VERDICT_CACHE_ENABLED:
+            _get_verdict_cache().set(cache_key, result, Config.COURIER_VERDICT_CACHE_TTL)
+
         return result
 
     except Exception as e:
@@ -207,10 +335,16 @@ def get_business_model_options(product_info: dict) -> dict:
             'reason': 'Unknown item - consignment only'
         }
 
+    # Fast path: known electronics never need the AI classifier
+    if _ELECTRONICS_RE.search(_normalize_item_text(full_text)):
+        return {
+            'sell_now_available': True,
+            'consignment_available': True,
+            'reason': 'Electronics item - both models available'
+        }
+
     # Use AI to determine if it's electronics
     try:
-        client = anthropic.Anthropic(api_key=Config.ANTHROPIC_API_KEY)
-
         prompt = f"""Is this item consumer electronics?
 
 ITEM: "{full_text}"
@@ -224,7 +358,8 @@ Respond with ONLY valid JSON:
     "is_electronics": true/false
 }}"""
 
-        response = client.messages.create(
+        response = get_llm_gateway().create_message(
+            'courier.business_model',
             model=Config.ANTHROPIC_MODEL,
             max_tokens=128,
             messages=[{
@@ -234,7 +369,6 @@ Respond with ONLY valid JSON:
         )
 
         import json
-        import re
 
         response_text = response.content[0].text.strip()
         json_match = re.search(r'\{[\s\S]*\}', response_text)
@@ -1,4 +1,4 @@
-import requests
+from utils.http_client import http_get
 from config import Config
 
 
@@ -39,10 +39,8 @@ class CurrencyConverter:
 
     def _get_rate_from_api(self):
         """Try to get rate from exchangerate-api.com (free tier available)"""
-        import requests
-
         try:
-            response = requests.get(
+            response = http_get(
                 'https://api.exchangerate-api.com/v4/latest/USD',
                 timeout=5
             )
@@ -54,9 +52,8 @@ class CurrencyConverter:
     def _get_rate_from_backup(self):
         """Try alternative sources for exchange rate"""
         try:
-            import requests
             # Try exchangerate-api.com (free tier available)
-            response = requests.get('https://open.er-api.com/v6/latest/USD', timeout=5)
+            response = http_get('https://open.er-api.com/v6/latest/USD', timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return data['rates']['ZAR']
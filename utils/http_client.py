@@ -0,0 +1,86 @@
+"""
+Shared HTTP Client
+One pooled, keep-alive requests.Session for every outbound call
+
+Scrapers and the Perplexity services used to call bare requests.get/post,
+paying a fresh TCP+TLS handshake per query. Going through this module
+reuses connections per host, applies a default (connect, read) timeout and
+retries transient failures with exponential backoff.
+"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import Config
+
+
+# Transient statuses worth retrying (rate limits and upstream hiccups)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    """Create a session with pooled, retrying adapters for http and https"""
+    retry = Retry(
+        total=Config.HTTP_MAX_RETRIES,
+        connect=Config.HTTP_MAX_RETRIES,
+        read=0,  # A read timeout means the server is slow - retrying just doubles the wait
+        status=Config.HTTP_MAX_RETRIES,
+        backoff_factor=Config.HTTP_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'POST']),  # Our POSTs are read-only API queries
+        respect_retry_after_header=True,
+        raise_on_status=False  # Hand the last response back; callers check status_code
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session():
+    """
+    Get the process-wide pooled session (created lazily, re-created after fork)
+
+    Returns:
+        requests.Session shared by all threads in this process
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def _timeout(timeout):
+    """Expand a single read timeout into a (connect, read) tuple"""
+    if timeout is None:
+        timeout = Config.HTTP_READ_TIMEOUT
+    if isinstance(timeout, (int, float)):
+        return (min(Config.HTTP_CONNECT_TIMEOUT, timeout), timeout)
+    return timeout
+
+
+def http_get(url, timeout=None, **kwargs):
+    """GET through the shared pool (same arguments as requests.get)"""
+    return get_session().get(url, timeout=_timeout(timeout), **kwargs)
+
+
+def http_post(url, timeout=None, **kwargs):
+    """POST through the shared pool (same arguments as requests.post)"""
+    return get_session().post(url, timeout=_timeout(timeout), **kwargs)
@@ -0,0 +1,275 @@
+"""
+LLM Gateway
+Single entry point for every Claude call in the app
+
+Owns one pooled anthropic.Anthropic client per process (instead of one per
+service, plus a fresh one per courier check), caps how many requests are in
+flight at once, applies a per-call-site timeout, and records latency, token
+usage and errors per call site - so when we hit rate limits under burst load
+we can see who is responsible (GET /api/llm-stats).
+
+stream_message is the streaming counterpart (same slots, timeouts and
+metrics) for text that is shown to the user as it is generated.
+
+Large static prompts are sent as a cached system prefix (cached_system) so
+Anthropic only bills and processes them in full once every few minutes;
+cache reads/writes and the input tokens they saved are tracked per call site.
+"""
+
+import os
+import threading
+import time
+import anthropic
+from config import Config
+
+
+class LLMGatewayBusy(Exception):
+    """Raised when no in-flight slot frees up within LLM_QUEUE_TIMEOUT"""
+
+
+# Cache reads are billed at 10% of the base input price, cache writes at 125%
+CACHE_READ_COST = 0.1
+CACHE_WRITE_COST = 1.25
+
+
+def cached_system(static_prefix, dynamic_suffix=''):
+    """
+    Build a system prompt whose static prefix is cached by Anthropic
+
+    The prefix must be byte-for-byte identical between calls (no product data,
+    history or timestamps in it) - anything that varies goes in dynamic_suffix.
+    Prefixes below the model's minimum cacheable length (1024 tokens for
+    Sonnet, 2048 for Haiku) are simply not cached.
+
+    Args:
+        static_prefix: Instructions that never change between calls
+        dynamic_suffix: Per-call context appended after the cached block
+
+    Returns:
+        List of system content blocks (or a plain string if LLM_PROMPT_CACHING is off)
+    """
+    if not Config.LLM_PROMPT_CACHING:
+        return static_prefix + dynamic_suffix
+
+    blocks = [{'type': 'text', 'text': static_prefix, 'cache_control': {'type': 'ephemeral'}}]
+    if dynamic_suffix:
+        blocks.append({'type': 'text', 'text': dynamic_suffix})
+    return blocks
+
+
+class LLMGateway:
+    """
+    Shared Anthropic client with a global in-flight limit and per-call-site metrics
+
+    Usage:
+        response = get_llm_gateway().create_message('v3.identify_product', model=..., messages=[...])
+    """
+
+    def __init__(self):
+        self.client = anthropic.Anthropic(
+            api_key=Config.ANTHROPIC_API_KEY,
+            max_retries=Config.LLM_MAX_RETRIES
+        )
+        self.max_in_flight = Config.LLM_MAX_IN_FLIGHT
+        self.slots = threading.BoundedSemaphore(self.max_in_flight)
+        self.stats = {}  # call_site -> counters
+        self.stats_lock = threading.Lock()
+        self.in_flight = 0
+
+    def create_message(self, call_site, **kwargs):
+        """
+        Call messages.create through the shared client
+
+        Args:
+            call_site: Stable name of the caller, e.g. 'v3.generate_question'
+            **kwargs: Passed straight to client.messages.create (timeout defaults per call site)
+
+        Returns:
+            The Anthropic Message response
+
+        Raises:
+            LLMGatewayBusy if the in-flight limit stays saturated; API errors are re-raised
+        """
+        kwargs.setdefault('timeout', self.timeout_for(call_site))
+
+        queued_at = time.time()
+        if not self.slots.acquire(timeout=Config.LLM_QUEUE_TIMEOUT):
+            self._record(call_site, error=True, busy=True, queue_wait=time.time() - queued_at)
+            print(f"   🚦 LLM {call_site}: no free slot after {Config.LLM_QUEUE_TIMEOUT}s "
+                  f"({self.max_in_flight} in flight)")
+            raise LLMGatewayBusy(f"LLM gateway busy ({self.max_in_flight} requests in flight)")
+
+        queue_wait = time.time() - queued_at
+        with self.stats_lock:
+            self.in_flight += 1
+
+        start = time.time()
+        try:
+            response = self.client.messages.create(**kwargs)
+        except Exception as e:
+            self._record(call_site, latency=time.time() - start, queue_wait=queue_wait, error=True)
+            print(f"   ❌ LLM {call_site} failed after {time.time() - start:.1f}s: {type(e).__name__}")
+            raise
+        finally:
+            with self.stats_lock:
+                self.in_flight -= 1
+            self.slots.release()
+
+        usage = getattr(response, 'usage', None)
+        self._record(
+            call_site,
+            latency=time.time() - start,
+            queue_wait=queue_wait,
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+            cache_read_tokens=getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            cache_write_tokens=getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        )
+        return response
+
+    def stream_message(self, call_site, **kwargs):
+        """
+        Streaming messages call through the shared client
+
+        Holds an in-flight slot until the stream is finished (or the caller
+        stops iterating). Metrics are recorded once the final message is in.
+
+        Args:
+            call_site: Stable name of the caller, e.g. 'v3.generate_question'
+            **kwargs: Passed straight to client.messages.stream (timeout defaults per call site)
+
+        Yields:
+            Text deltas as they arrive
+
+        Raises:
+            LLMGatewayBusy if the in-flight limit stays saturated; API errors are re-raised
+        """
+        kwargs.setdefault('timeout', self.timeout_for(call_site))
+
+        queued_at = time.time()
+        if not self.slots.acquire(timeout=Config.LLM_QUEUE_TIMEOUT):
+            self._record(call_site, error=True, busy=True, queue_wait=time.time() - queued_at)
+            print(f"   🚦 LLM {call_site}: no free slot after {Config.LLM_QUEUE_TIMEOUT}s "
+                  f"({self.max_in_flight} in flight)")
+            raise LLMGatewayBusy(f"LLM gateway busy ({self.max_in_flight} requests in flight)")
+
+        queue_wait = time.time() - queued_at
+        with self.stats_lock:
+            self.in_flight += 1
+
+        start = time.time()
+        try:
+            with self.client.messages.stream(**kwargs) as stream:
+                for text in stream.text_stream:
+                    yield text
+                response = stream.get_final_message()
+        except Exception as e:
+            self._record(call_site, latency=time.time() - start, queue_wait=queue_wait, error=True)
+            print(f"   ❌ LLM {call_site} stream failed after {time.time() - start:.1f}s: {type(e).__name__}")
+            raise
+        finally:
+            with self.stats_lock:
+                self.in_flight -= 1
+            self.slots.release()
+
+        usage = getattr(response, 'usage', None)
+        self._record(
+            call_site,
+            latency=time.time() - start,
+            queue_wait=queue_wait,
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+            cache_read_tokens=getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            cache_write_tokens=getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        )
+
+    def timeout_for(self, call_site):
+        """Per-call-site timeout in seconds (falls back to LLM_DEFAULT_TIMEOUT)"""
+        return Config.LLM_CALL_SITE_TIMEOUTS.get(call_site, Config.LLM_DEFAULT_TIMEOUT)
+
+    def get_stats(self):
+        """
+        Snapshot of per-call-site metrics
+
+        Returns:
+            Dict with in_flight, max_in_flight and a call_sites dict of counters + derived rates
+        """
+        with self.stats_lock:
+            call_sites = {}
+            for call_site, s in self.stats.items():
+                completed = s['calls'] - s['busy']
+                cache_lookups = s['cache_hits'] + s['cache_misses']
+                call_sites[call_site] = {
+                    **s,
+                    'cache_hit_rate': round(s['cache_hits'] / cache_lookups, 3) if cache_lookups else 0,
+                    # Net input tokens saved vs sending the prefix uncached every time, in base-price tokens
+                    'input_tokens_saved': round(
+                        s['cache_read_tokens'] * (1 - CACHE_READ_COST)
+                        - s['cache_write_tokens'] * (CACHE_WRITE_COST - 1)
+                    ),
+                    'error_rate': round(s['errors'] / s['calls'], 3) if s['calls'] else 0,
+                    'avg_latency': round(s['total_latency'] / completed, 3) if completed else 0,
+                    'avg_queue_wait': round(s['total_queue_wait'] / s['calls'], 3) if s['calls'] else 0,
+                    'total_latency': round(s['total_latency'], 3),
+                    'total_queue_wait': round(s['total_queue_wait'], 3),
+                    'max_latency': round(s['max_latency'], 3)
+                }
+            return {
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'call_sites': call_sites
+            }
+
+    def _record(self, call_site, latency=0.0, queue_wait=0.0, input_tokens=0, output_tokens=0,
+                cache_read_tokens=0, cache_write_tokens=0, error=False, busy=False):
+        """Update counters for one call (a cache miss is a call that had to write the prompt cache)"""
+        with self.stats_lock:
+            s = self.stats.setdefault(call_site, {
+                'calls': 0,
+                'errors': 0,
+                'busy': 0,
+                'input_tokens': 0,
+                'output_tokens': 0,
+                'cache_hits': 0,
+                'cache_misses': 0,
+                'cache_read_tokens': 0,
+                'cache_write_tokens': 0,
+                'total_latency': 0.0,
+                'max_latency': 0.0,
+                'total_queue_wait': 0.0
+            })
+            s['calls'] += 1
+            s['errors'] += 1 if error else 0
+            s['busy'] += 1 if busy else 0
+            s['input_tokens'] += input_tokens
+            s['output_tokens'] += output_tokens
+            s['cache_hits'] += 1 if cache_read_tokens else 0
+            s['cache_misses'] += 1 if cache_write_tokens and not cache_read_tokens else 0
+            s['cache_read_tokens'] += cache_read_tokens
+            s['cache_write_tokens'] += cache_write_tokens
+            s['total_latency'] += latency
+            s['max_latency'] = max(s['max_latency'], latency)
+            s['total_queue_wait'] += queue_wait
+
+
+_gateway = None
+_gateway_pid = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway():
+    """
+    Get the process-wide gateway (created lazily, re-created after fork)
+
+    Returns:
+        LLMGateway shared by every service in this process
+    """
+    global _gateway, _gateway_pid
+
+    pid = os.getpid()
+    if _gateway is None or _gateway_pid != pid:
+        with _gateway_lock:
+            if _gateway is None or _gateway_pid != pid:
+                _gateway = LLMGateway()
+                _gateway_pid = pid
+    return _gateway
@@ -0,0 +1,146 @@
+"""
+Model Router
+Sends simple calls to the fast model and escalates to the strong one only when needed
+
+Most v3 turns ("iphone 13 pro 256", the storage question for a Galaxy) get
+the same answer from Haiku as from Sonnet in a fraction of the time. Each
+routed call site decides whether its input is simple; simple inputs go to
+the fast model first, and the response is checked. A parse failure or a
+low-confidence answer is retried on the strong model, so quality is bounded
+by Sonnet while p50 latency follows Haiku.
+
+Routing decisions, escalations (with reasons) and per-tier latency are
+recorded per route (GET /api/llm-stats).
+"""
+
+import re
+import threading
+import time
+from config import Config
+
+
+class LowConfidence(Exception):
+    """Raised by a response check when the fast model's answer shouldn't be trusted"""
+
+
+# Several products / a question in the message - not a simple identification
+_COMPLEX_MESSAGE = re.compile(r'\?|\b(and|or|vs|versus|either|both)\b|[,;/&]')
+
+
+def is_simple_message(message, max_words=None):
+    """Short, single-product message ("PS5 disc", "macbook air m2 16gb")"""
+    max_words = max_words or Config.MODEL_ROUTING_SIMPLE_MAX_WORDS
+    text = (message or '').strip().lower()
+    return bool(text) and len(text.split()) <= max_words and not _COMPLEX_MESSAGE.search(text)
+
+
+class ModelRouter:
+    """
+    Fast-first routing with escalation
+
+    Usage:
+        result = router.run('v3.identify_product', simple,
+                            call=lambda model: ...,      # one LLM call + parse, raises on failure
+                            check=lambda result: ...)    # raises LowConfidence to escalate
+    """
+
+    def __init__(self, fast_model, strong_model):
+        self.fast_model = fast_model
+        self.strong_model = strong_model
+        self.enabled = Config.MODEL_ROUTING_ENABLED
+        self.stats = {}  # route -> counters
+        self.lock = threading.Lock()
+
+    def run(self, route, simple, call, check=None):
+        """
+        Run call(model) on the fast model if simple, escalating on failure
+
+        Args:
+            route: Stable route name (usually the gateway call site)
+            simple: Whether this input is simple enough for the fast model
+            call: Function(model) -> parsed result; raises on API/parse errors
+            check: Optional function(result) that raises LowConfidence to escalate
+
+        Returns:
+            The parsed result (strong-model errors are re-raised to the caller)
+        """
+        if not (self.enabled and simple):
+            self._record(route, 'strong')
+            return self._timed(route, 'strong', call, self.strong_model)
+
+        self._record(route, 'fast')
+        try:
+            result = self._timed(route, 'fast', call, self.fast_model)
+            if check:
+                check(result)
+            return result
+        except LowConfidence as e:
+            reason = 'low_confidence'
+            print(f"   ⬆️  {route}: fast model low confidence ({e}) - escalating")
+        except Exception as e:
+            reason = 'parse_error' if isinstance(e, (ValueError, KeyError, TypeError, IndexError)) else 'error'
+            print(f"   ⬆️  {route}: fast model failed ({type(e).__name__}) - escalating")
+
+        self._record(route, 'escalated', reason=reason)
+        return self._timed(route, 'strong', call, self.strong_model)
+
+    def choose(self, route, simple):
+        """
+        Pick a model without escalation (for streamed calls - sent tokens can't be taken back)
+
+        Returns:
+            Model name
+        """
+        tier = 'fast' if self.enabled and simple else 'strong'
+        self._record(route, tier)
+        return self.fast_model if tier == 'fast' else self.strong_model
+
+    def _timed(self, route, tier, call, model):
+        start = time.time()
+        try:
+            return call(model)
+        finally:
+            with self.lock:
+                s = self._route_stats(route)
+                s[f'{tier}_latency'] += time.time() - start
+                s[f'{tier}_calls'] += 1
+
+    def _route_stats(self, route):
+        return self.stats.setdefault(route, {
+            'fast': 0,
+            'strong': 0,
+            'escalated': 0,
+            'reasons': {},
+            'fast_calls': 0,
+            'strong_calls': 0,
+            'fast_latency': 0.0,
+            'strong_latency': 0.0
+        })
+
+    def _record(self, route, decision, reason=None):
+        with self.lock:
+            s = self._route_stats(route)
+            s[decision] += 1
+            if reason:
+                s['reasons'][reason] = s['reasons'].get(reason, 0) + 1
+
+    def get_stats(self):
+        """Per-route decisions, escalation rate and average latency per tier (this worker)"""
+        with self.lock:
+            routes = {}
+            for route, s in self.stats.items():
+                routes[route] = {
+                    'fast': s['fast'],
+                    'strong': s['strong'],
+                    'escalated': s['escalated'],
+                    'reasons': dict(s['reasons']),
+                    'escalation_rate': round(s['escalated'] / s['fast'], 3) if s['fast'] else 0,
+                    'avg_fast_latency': round(s['fast_latency'] / s['fast_calls'], 3) if s['fast_calls'] else 0,
+                    'avg_strong_latency': round(s['strong_latency'] / s['strong_calls'], 3) if s['strong_calls'] else 0
+                }
+            return {
+                'enabled': self.enabled,
+                'fast_model': self.fast_model,
+                'strong_model': self.strong_model,
+                'routes': routes
+            }
@@ -0,0 +1,244 @@
+"""
+Server-Side Session Store
+Keeps Flask session data on the server; the cookie only carries a signed, opaque id
+
+Flask's default session is a signed cookie with a ~4KB browser limit, which
+forced us to drop conversation_turns from the engine state and trim
+offer_data. With a server-side backend there's no size limit and request
+headers stay tiny.
+
+Backends (SESSION_BACKEND):
+    memory  - in-process LRU (dev / single worker only)
+    sqlite  - shared SQLite file (single node, all gunicorn workers)
+    redis   - any Redis-protocol server at SESSION_REDIS_URL (multi-node; needs `pip install redis`)
+    cookie  - Flask's default signed-cookie session
+
+Each session key is serialized separately and the backend stores the
+{key: serialized value} map, so on save only keys whose serialized value
+changed need writing - the redis backend does exactly that (HSET/HDEL on a
+hash); the others rewrite the whole map.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+from config import Config
+from utils.ttl_cache import PersistentTTLCache
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session dict that tracks modification and remembers its id"""
+
+    def __init__(self, initial=None, sid=None, new=False, stored_fields=None):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.stored_fields = stored_fields or {}  # key -> serialized value as loaded
+
+
+class MemorySessionBackend:
+    """In-process LRU store - sessions are lost on restart and not shared between workers"""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.SESSION_MEMORY_MAX_ENTRIES
+        self.entries = OrderedDict()  # sid -> (payload, expires_at)
+        self.lock = threading.Lock()
+
+    def get(self, sid):
+        with self.lock:
+            entry = self.entries.get(sid)
+            if not entry:
+                return None
+            payload, expires_at = entry
+            if expires_at < time.time():
+                self.entries.pop(sid, None)
+                return None
+            self.entries.move_to_end(sid)
+            return payload
+
+    def set(self, sid, payload, ttl_seconds):
+        with self.lock:
+            self.entries[sid] = (payload, time.time() + ttl_seconds)
+            self.entries.move_to_end(sid)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)  # Evict least recently used
+
+    def delete(self, sid):
+        with self.lock:
+            self.entries.pop(sid, None)
+
+
+class SQLiteSessionBackend:
+    """Sessions in the shared SQLite file (same store as the research caches)"""
+
+    def __init__(self, db_path=None):
+        self.store = PersistentTTLCache('sessions', db_path=db_path or Config.SESSION_DB_PATH)
+        self.enabled = self.store.enabled
+
+    def get(self, sid):
+        return self.store.get(sid)
+
+    def set(self, sid, payload, ttl_seconds):
+        self.store.set(sid, payload, ttl_seconds)
+
+    def delete(self, sid):
+        self.store.delete(sid)
+
+
+class RedisSessionBackend:
+    """Sessions in Redis (or any Redis-protocol server such as Valkey/KeyDB) - one hash per session"""
+
+    def __init__(self, url=None):
+        import redis  # Optional dependency - only needed for this backend
+
+        self.client = redis.Redis.from_url(url or Config.SESSION_REDIS_URL, socket_timeout=2)
+        self.client.ping()  # Fail fast at startup, not on the first request
+        self.prefix = 'epicdeals:session:'
+
+    def get(self, sid):
+        fields = self.client.hgetall(self.prefix + sid)
+        if not fields:
+            return None
+        return {key.decode('utf-8'): value.decode('utf-8') for key, value in fields.items()}
+
+    def set(self, sid, payload, ttl_seconds):
+        key = self.prefix + sid
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        if payload:
+            pipe.hset(key, mapping=payload)
+        pipe.expire(key, int(ttl_seconds))
+        pipe.execute()
+
+    def update(self, sid, changed, removed, ttl_seconds):
+        """Partial write - only the changed/removed session keys go over the wire"""
+        key = self.prefix + sid
+        pipe = self.client.pipeline()
+        if removed:
+            pipe.hdel(key, *removed)
+        if changed:
+            pipe.hset(key, mapping=changed)
+        pipe.expire(key, int(ttl_seconds))
+        pipe.execute()
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface backed by one of the stores above
+
+    The cookie value is the session id signed with SECRET_KEY, so ids can't
+    be forged or enumerated. Backend errors are logged and treated as an
+    empty session - the user starts over rather than seeing a 500.
+    """
+
+    serializer = TaggedJSONSerializer()  # Same encoding as Flask's cookie sessions
+
+    def __init__(self, backend, ttl_seconds=None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or Config.SESSION_TTL
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='epicdeals-session-id')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('utf-8')
+                payload = self.backend.get(sid)
+                if isinstance(payload, dict):
+                    data = {key: self.serializer.loads(value) for key, value in payload.items()}
+                    return ServerSideSession(data, sid=sid, stored_fields=payload)
+                if payload is not None:
+                    # Whole-session payload written before per-key storage
+                    return ServerSideSession(self.serializer.loads(payload), sid=sid)
+            except BadSignature:
+                print("⚠️  Session cookie has a bad signature - starting a new session")
+            except Exception as e:
+                print(f"⚠️  Session load failed: {e}")
+
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified:
+                # Session was cleared - drop it server-side and expire the cookie
+                try:
+                    self.backend.delete(session.sid)
+                except Exception as e:
+                    print(f"⚠️  Session delete failed: {e}")
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        try:
+            fields = {key: self.serializer.dumps(value) for key, value in session.items()}
+            if hasattr(self.backend, 'update') and not session.new:
+                changed = {key: value for key, value in fields.items() if session.stored_fields.get(key) != value}
+                removed = [key for key in session.stored_fields if key not in fields]
+                self.backend.update(session.sid, changed, removed, self.ttl_seconds)
+            else:
+                self.backend.set(session.sid, fields, self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️  Session save failed: {e}")
+            return
+
+        response.set_cookie(
+            name,
+            self._signer(app).sign(session.sid).decode('utf-8'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+
+def create_session_interface(backend_name=None):
+    """
+    Build the session interface for SESSION_BACKEND
+
+    Returns:
+        ServerSideSessionInterface, or None to keep Flask's signed-cookie session
+        (also the fallback if the chosen backend can't be opened)
+    """
+    backend_name = (backend_name or Config.SESSION_BACKEND).lower()
+
+    try:
+        if backend_name == 'cookie':
+            return None
+        if backend_name == 'memory':
+            backend = MemorySessionBackend()
+        elif backend_name == 'sqlite':
+            backend = SQLiteSessionBackend()
+            if not backend.enabled:
+                raise RuntimeError(f"could not open {Config.SESSION_DB_PATH}")
+        elif backend_name == 'redis':
+            backend = RedisSessionBackend()
+        else:
+            raise ValueError(f"unknown SESSION_BACKEND '{backend_name}'")
+    except Exception as e:
+        print(f"⚠️  Server-side sessions unavailable ({e}) - falling back to cookie sessions")
+        return None
+
+    print(f"✅ Server-side sessions enabled ({backend_name})")
+    return ServerSideSessionInterface(backend)
@@ -0,0 +1,139 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same thing share one upstream call
+
+When a popular model trends, several sellers price it at the same moment
+and each fires an identical Perplexity query. With SingleFlight the first
+caller (the leader) makes the call; everyone else with the same key waits
+for it and gets a copy of its result.
+
+Within a process this is an in-memory table of in-flight calls. With
+SINGLE_FLIGHT_SHARED enabled, a lock + result in the shared SQLite cache
+extends it across gunicorn workers on the same host.
+"""
+
+import copy
+import secrets
+import threading
+import time
+from config import Config
+from utils.ttl_cache import PersistentTTLCache
+
+
+class _InFlightCall:
+    """One upstream call that followers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight calls by key
+
+    Usage:
+        flight = SingleFlight('perplexity_repair')
+        result = flight.do(normalized_query, lambda: expensive_call(query))
+    """
+
+    def __init__(self, namespace, shared=None):
+        self.namespace = namespace
+        self.shared = Config.SINGLE_FLIGHT_SHARED if shared is None else shared
+        self.wait_timeout = Config.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self.calls = {}  # key -> _InFlightCall
+        self.lock = threading.Lock()
+        self.stats = {'leader': 0, 'coalesced': 0, 'coalesced_shared': 0}
+
+        if self.shared:
+            self.shared_locks = PersistentTTLCache(f'flight_lock:{namespace}')
+            self.shared_results = PersistentTTLCache(f'flight_result:{namespace}')
+
+    @staticmethod
+    def normalize_key(*parts):
+        """Lowercase, collapse whitespace and join key parts"""
+        return '|'.join(' '.join(str(p).lower().split()) for p in parts)
+
+    def do(self, key, fn):
+        """
+        Run fn() unless an identical call is already in flight, then share its result
+
+        Args:
+            key: Normalized request key
+            fn: Zero-argument callable making the upstream call (result must be JSON-serialisable when shared)
+
+        Returns:
+            fn()'s result (each caller gets its own copy)
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self.calls[key] = call
+                self.stats['leader'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not is_leader:
+            print(f"   🔗 [{self.namespace}] Joining in-flight request: {key[:80]}")
+            if not call.done.wait(self.wait_timeout):
+                print(f"   ⏱️  [{self.namespace}] In-flight request too slow - calling upstream directly")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = self._lead(key, fn)
+            return copy.deepcopy(call.result)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+
+    def _lead(self, key, fn):
+        """In-process leader: coordinate with other workers if sharing is enabled"""
+        if not self.shared or not self.shared_locks.enabled:
+            return fn()
+
+        token = secrets.token_hex(8)
+        if self.shared_locks.add(key, token, Config.SINGLE_FLIGHT_LOCK_TTL):
+            try:
+                result = fn()
+                # Wrapped so a None result is distinguishable from "not there yet"
+                self.shared_results.set(f"{key}|{token}", {'value': result}, Config.SINGLE_FLIGHT_RESULT_TTL)
+                return result
+            finally:
+                self.shared_locks.delete(key)
+
+        # Another worker is already making this call - wait for its result
+        leader_token = self.shared_locks.get(key)
+        deadline = time.time() + self.wait_timeout
+        while leader_token and time.time() < deadline:
+            shared = self._shared_result(key, leader_token)
+            if shared is not None:
+                return shared['value']
+
+            time.sleep(0.25)
+            if self.shared_locks.get(key) != leader_token:
+                # Leader finished (or gave up) - its result, if any, is written before the lock goes
+                shared = self._shared_result(key, leader_token)
+                if shared is not None:
+                    return shared['value']
+                break
+
+        return fn()
+
+    def _shared_result(self, key, leader_token):
+        """Result another worker published for this call, or None"""
+        shared = self.shared_results.get(f"{key}|{leader_token}")
+        if shared is not None:
+            with self.lock:
+                self.stats['coalesced_shared'] += 1
+            print(f"   🔗 [{self.namespace}] Reused result from another worker: {key[:80]}")
+        return shared
@@ -0,0 +1,272 @@
+"""
+State Codec
+Compact, versioned binary encoding for session state (see GuardrailEngine.to_bytes)
+
+Layout:
+    magic (2 bytes) | format version (1) | flags (1) | payload (zlib-compressed if FLAG_ZLIB)
+
+Payload:
+    string table  - varint count, then varint length + UTF-8 for each string
+    fields        - varint count, then (varint field id, varint length, value bytes) each
+
+Values are tagged: None/True/False, zigzag varint ints, 8-byte floats,
+strings (by index into the shared INTERNED_STRINGS table or this blob's own
+string table, so repeated field names cost one byte), lists and dicts.
+
+Schema evolution: fields are addressed by numeric id and length-prefixed,
+so readers skip ids they don't know and callers default ids that are
+missing. INTERNED_STRINGS is append-only - never reorder or remove entries.
+"""
+
+import struct
+import zlib
+
+
+MAGIC = b'\xe1G'
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+
+# Append-only! Index is part of the wire format.
+INTERNED_STRINGS = [
+    # GuardrailEngine states
+    'identifying', 'questioning', 'calculating', 'offer_ready', 'collecting_info',
+    # Product info keys
+    'name', 'brand', 'model', 'category', 'year', 'specs', 'storage', 'capacity', 'color', 'colour',
+    'ram', 'size', 'processor', 'screen_size', 'generation', 'variant', 'confidence',
+    # Common question fields
+    'condition', 'damage', 'damage_details', 'condition_details', 'damage_severity', 'unlock_status',
+    'network', 'battery_health', 'accessories', 'mileage', 'service_history', 'age', 'completeness',
+    'authenticity', 'box', 'charger', 'warranty', 'contract',
+    # Common answer values / ui option keys
+    'unknown', 'no_damage', 'label', 'value', 'role', 'content', 'user', 'assistant',
+    'electronics', 'vehicle', 'appliance', 'fashion', 'furniture', 'other',
+]
+_INTERNED_INDEX = {s: i for i, s in enumerate(INTERNED_STRINGS)}
+
+# Value tags
+_NONE, _TRUE, _FALSE, _INT, _FLOAT, _STR_INTERNED, _STR_LOCAL, _LIST, _DICT = range(9)
+
+
+class StateCodecError(ValueError):
+    """Blob is corrupt, truncated or from an unsupported format version"""
+
+
+def _write_varint(out, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise StateCodecError('truncated varint')
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Encoder:
+    """Encodes values, collecting non-interned strings into one table"""
+
+    def __init__(self):
+        self.strings = []
+        self.string_index = {}
+
+    def encode(self, value, out):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)  # zigzag
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += struct.pack('<d', value)
+        elif isinstance(value, str):
+            if value in _INTERNED_INDEX:
+                out.append(_STR_INTERNED)
+                _write_varint(out, _INTERNED_INDEX[value])
+            else:
+                index = self.string_index.get(value)
+                if index is None:
+                    index = self.string_index[value] = len(self.strings)
+                    self.strings.append(value)
+                out.append(_STR_LOCAL)
+                _write_varint(out, index)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            items = sorted(value, key=str) if isinstance(value, (set, frozenset)) else value
+            out.append(_LIST)
+            _write_varint(out, len(items))
+            for item in items:
+                self.encode(item, out)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                self.encode(key, out)
+                self.encode(item, out)
+        else:
+            # Anything exotic degrades to its string form (same as json default=str)
+            self.encode(str(value), out)
+
+
+def encode_fields(fields, compress=True, compress_min_bytes=128):
+    """
+    Encode {field_id: value} into a versioned binary blob
+
+    Args:
+        fields: Dict of small int field ids to JSON-like values
+        compress: zlib the payload when it is big enough and actually shrinks
+        compress_min_bytes: Payloads smaller than this are never compressed
+
+    Returns:
+        bytes
+    """
+    encoder = _Encoder()
+    body = bytearray()
+    _write_varint(body, len(fields))
+    for field_id, value in fields.items():
+        encoded = bytearray()
+        encoder.encode(value, encoded)
+        _write_varint(body, field_id)
+        _write_varint(body, len(encoded))
+        body += encoded
+
+    payload = bytearray()
+    _write_varint(payload, len(encoder.strings))
+    for s in encoder.strings:
+        raw = s.encode('utf-8')
+        _write_varint(payload, len(raw))
+        payload += raw
+    payload += body
+
+    flags = 0
+    payload = bytes(payload)
+    if compress and len(payload) >= compress_min_bytes:
+        compressed = zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+
+    return MAGIC + bytes([FORMAT_VERSION, flags]) + payload
+
+
+def is_encoded(blob):
+    """True if blob looks like output of encode_fields"""
+    return isinstance(blob, (bytes, bytearray)) and blob[:2] == MAGIC
+
+
+class LazyFields:
+    """
+    Parsed blob that decodes individual fields only when asked for
+
+    Construction reads the header, string table and field directory;
+    field values stay as raw bytes until get() is called.
+    """
+
+    def __init__(self, blob):
+        if not is_encoded(blob) or len(blob) < 4:
+            raise StateCodecError('not a state blob')
+        version, flags = blob[2], blob[3]
+        if version > FORMAT_VERSION:
+            raise StateCodecError(f'unsupported state format version {version}')
+
+        payload = blob[4:]
+        if flags & FLAG_ZLIB:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise StateCodecError(f'corrupt compressed state: {e}')
+
+        self.buf = payload
+        pos = 0
+        count, pos = _read_varint(payload, pos)
+        self.strings = []
+        for _ in range(count):
+            length, pos = _read_varint(payload, pos)
+            self.strings.append(payload[pos:pos + length].decode('utf-8'))
+            pos += length
+
+        self.directory = {}  # field_id -> (offset, length)
+        count, pos = _read_varint(payload, pos)
+        for _ in range(count):
+            field_id, pos = _read_varint(payload, pos)
+            length, pos = _read_varint(payload, pos)
+            if pos + length > len(payload):
+                raise StateCodecError('truncated field')
+            self.directory[field_id] = (pos, length)
+            pos += length
+
+    def has(self, field_id):
+        return field_id in self.directory
+
+    def get(self, field_id, default=None):
+        """Decode one field (default if the blob doesn't have it)"""
+        if field_id not in self.directory:
+            return default
+        offset, _ = self.directory[field_id]
+        try:
+            value, _ = self._decode(offset)
+        except (struct.error, TypeError) as e:  # Short float / unhashable dict key in a damaged blob
+            raise StateCodecError(f'corrupt field {field_id}: {e}')
+        return value
+
+    def _decode(self, pos):
+        buf = self.buf
+        if pos >= len(buf):
+            raise StateCodecError('truncated value')
+        tag = buf[pos]
+        pos += 1
+
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _INT:
+            n, pos = _read_varint(buf, pos)
+            return (n >> 1) ^ -(n & 1), pos
+        if tag == _FLOAT:
+            return struct.unpack_from('<d', buf, pos)[0], pos + 8
+        if tag == _STR_INTERNED:
+            index, pos = _read_varint(buf, pos)
+            if index >= len(INTERNED_STRINGS):
+                raise StateCodecError(f'unknown interned string {index}')
+            return INTERNED_STRINGS[index], pos
+        if tag == _STR_LOCAL:
+            index, pos = _read_varint(buf, pos)
+            if index >= len(self.strings):
+                raise StateCodecError(f'bad string reference {index}')
+            return self.strings[index], pos
+        if tag == _LIST:
+            count, pos = _read_varint(buf, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self._decode(pos)
+                items.append(item)
+            return items, pos
+        if tag == _DICT:
+            count, pos = _read_varint(buf, pos)
+            result = {}
+            for _ in range(count):
+                key, pos = self._decode(pos)
+                item, pos = self._decode(pos)
+                result[key] = item
+            return result, pos
+
+        raise StateCodecError(f'unknown value tag {tag}')
@@ -0,0 +1,173 @@
+"""
+Persistent TTL Cache
+SQLite-backed key/value store with per-entry expiry.
+
+The database is a plain file, so entries survive restarts and are shared
+by every gunicorn worker on the same host. Values are stored as JSON.
+Expired rows are deleted when read, and a sampled fraction of writes
+(CACHE_PURGE_SAMPLE_RATE) purges the whole namespace so keys that are never
+read again don't accumulate.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from config import Config
+
+
+class PersistentTTLCache:
+    """
+    Small persistent cache for expensive research results.
+
+    Each cache lives in its own namespace inside a shared SQLite file.
+    All errors are swallowed (and logged) so a broken or read-only cache
+    never takes down the pricing flow - it just behaves like a miss.
+    """
+
+    def __init__(self, namespace, db_path=None):
+        self.namespace = namespace
+        self.db_path = db_path or Config.CACHE_DB_PATH
+        self.enabled = True
+        self._ensure_db()
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection (safe across threads and forked workers)"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _ensure_db(self):
+        """Create the cache table if it doesn't exist"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS cache_entries ('
+                    ' namespace TEXT NOT NULL,'
+                    ' cache_key TEXT NOT NULL,'
+                    ' value TEXT NOT NULL,'
+                    ' expires_at REAL NOT NULL,'
+                    ' PRIMARY KEY (namespace, cache_key))'
+                )
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' disabled - could not open {self.db_path}: {e}")
+            self.enabled = False
+
+    def get(self, key):
+        """
+        Get a cached value
+
+        Returns:
+            The stored value, or None if missing/expired
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND cache_key = ?',
+                    (self.namespace, key)
+                ).fetchone()
+
+                if not row:
+                    return None
+
+                value, expires_at = row
+                if expires_at < time.time():
+                    conn.execute(
+                        'DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?',
+                        (self.namespace, key)
+                    )
+                    return None
+
+                return json.loads(value)
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' read failed: {e}")
+            return None
+
+    def set(self, key, value, ttl_seconds):
+        """Store a JSON-serialisable value for ttl_seconds"""
+        if not self.enabled or ttl_seconds <= 0:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache_entries (namespace, cache_key, value, expires_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (self.namespace, key, json.dumps(value), time.time() + ttl_seconds)
+                )
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' write failed: {e}")
+            return
+
+        if random.random() < Config.CACHE_PURGE_SAMPLE_RATE:
+            self.purge_expired()
+
+    def add(self, key, value, ttl_seconds):
+        """
+        Store a value only if the key is absent (or expired) - atomic across workers
+
+        Returns:
+            True if this call stored the value
+        """
+        if not self.enabled or ttl_seconds <= 0:
+            return False
+
+        try:
+            with self._connect() as conn:
+                now = time.time()
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ? AND expires_at < ?',
+                    (self.namespace, key, now)
+                )
+                cursor = conn.execute(
+                    'INSERT OR IGNORE INTO cache_entries (namespace, cache_key, value, expires_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (self.namespace, key, json.dumps(value), now + ttl_seconds)
+                )
+                return cursor.rowcount == 1
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' add failed: {e}")
+            return False
+
+    def delete(self, key):
+        """Remove a single entry"""
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?',
+                    (self.namespace, key)
+                )
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' delete failed: {e}")
+
+    def purge_expired(self):
+        """Delete all expired entries in this namespace"""
+        if not self.enabled:
+            return 0
+
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    'DELETE FROM cache_entries WHERE namespace = ? AND expires_at < ?',
+                    (self.namespace, time.time())
+                )
+                return cursor.rowcount
+        except Exception as e:
+            print(f"⚠️  Cache '{self.namespace}' purge failed: {e}")
+            return 0